@@ -0,0 +1,108 @@
+import hashlib
+import os
+import struct
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+import PIL
+from PIL import Image
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+_HEADER = struct.Struct("<4sII")
+_MAGIC = b"ILC1"
+_SUFFIX = ".rgba"
+
+
+class AssetDiskCache:
+  """Stores processed RGBA bitmaps on disk, keyed by content hash and evicted least recently used past ``max_bytes``."""
+
+  def __init__(self, directory: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+    self.directory = Path(directory)
+    self.max_bytes = max_bytes
+    self._digests: Dict[Path, Tuple[int, int, str]] = {}
+
+  def key_for(self, asset_path: Path, size: Tuple[int, int], theme: str, variant: Sequence = ()) -> str:
+    digest = hashlib.sha256()
+    digest.update(self._content_digest(Path(asset_path)).encode())
+    digest.update(repr((tuple(size), theme, tuple(variant), PIL.__version__)).encode())
+    return digest.hexdigest()
+
+  def get(self, key: str) -> Optional[Image.Image]:
+    path = self._entry_path(key)
+    try:
+      with open(path, "rb") as fh:
+        magic, width, height = _HEADER.unpack(fh.read(_HEADER.size))
+        pixels = fh.read()
+    except (OSError, struct.error):
+      return None
+    if magic != _MAGIC or len(pixels) != width * height * 4:
+      self._remove(path)
+      return None
+    try:
+      os.utime(path)
+    except OSError:
+      pass
+    return Image.frombuffer("RGBA", (width, height), pixels, "raw", "RGBA", 0, 1)
+
+  def put(self, key: str, img: Image.Image):
+    if img.mode != "RGBA":
+      img = img.convert("RGBA")
+    path = self._entry_path(key)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+      self.directory.mkdir(parents=True, exist_ok=True)
+      with open(tmp_path, "wb") as fh:
+        fh.write(_HEADER.pack(_MAGIC, img.width, img.height))
+        fh.write(img.tobytes())
+      os.replace(tmp_path, path)
+    except OSError:
+      self._remove(tmp_path)
+      return
+    self._evict()
+
+  def clear(self):
+    for path in self._entries():
+      self._remove(path)
+
+  def _content_digest(self, asset_path: Path) -> str:
+    stat = asset_path.stat()
+    cached = self._digests.get(asset_path)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+      return cached[2]
+    content_hash = hashlib.sha256(asset_path.read_bytes()).hexdigest()
+    self._digests[asset_path] = (stat.st_mtime_ns, stat.st_size, content_hash)
+    return content_hash
+
+  def _entry_path(self, key: str) -> Path:
+    return self.directory / f"{key}{_SUFFIX}"
+
+  def _entries(self):
+    try:
+      return list(self.directory.glob(f"*{_SUFFIX}"))
+    except OSError:
+      return []
+
+  def _evict(self):
+    entries = []
+    total = 0
+    for path in self._entries():
+      try:
+        stat = path.stat()
+      except OSError:
+        continue
+      entries.append((stat.st_mtime_ns, stat.st_size, path))
+      total += stat.st_size
+
+    entries.sort()
+    for _, entry_size, path in entries:
+      if total <= self.max_bytes:
+        break
+      self._remove(path)
+      total -= entry_size
+
+  def _remove(self, path: Path):
+    try:
+      path.unlink()
+    except OSError:
+      pass
@@ -0,0 +1,159 @@
+"""Packs the UI's pre-themed, pre-sized images into one atlas per theme and scale.
+
+Run ``python atlas.py`` before packaging to write ``assets/atlas``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+from config import ASSETS_DIR, ATLAS_DIR, ATLAS_SPRITES, THEME_CONFIG, THEME_RECOLOR_RULES
+
+if TYPE_CHECKING:
+  from PIL import Image
+
+ATLAS_INDEX = "index.json"
+ATLAS_VERSION = 1
+PADDING = 1
+
+
+def sprite_key(name: str, size: Tuple[int, int]) -> str:
+  return f"{name}@{size[0]}x{size[1]}"
+
+
+def atlas_name(theme: str, scale: int) -> str:
+  return f"{theme}@{scale}x"
+
+
+def _source_stamp(path: Path) -> List[int]:
+  stat = path.stat()
+  return [stat.st_size, stat.st_mtime_ns]
+
+
+def _rules_fingerprint() -> str:
+  return json.dumps(THEME_RECOLOR_RULES, sort_keys=True)
+
+
+class SpriteAtlas:
+  """Sprites cropped from per-theme atlas images, decoded lazily and at most once each."""
+
+  def __init__(self, directory: Path, index: dict):
+    self.directory = directory
+    self.index = index
+    self._sheets: Dict[str, Image.Image] = {}
+    self._lock = threading.Lock()
+
+  @classmethod
+  def load(cls, directory: Path, assets_dir: Path = ASSETS_DIR, check_sources: bool = True) -> Optional[SpriteAtlas]:
+    """Returns the atlas in ``directory``, or None if there is none or, with ``check_sources``, its PNGs changed."""
+    try:
+      index = json.loads((directory / ATLAS_INDEX).read_text())
+    except (OSError, ValueError):
+      return None
+    if index.get("version") != ATLAS_VERSION or index.get("rules") != _rules_fingerprint():
+      return None
+    if check_sources:
+      try:
+        if any(_source_stamp(assets_dir / name) != stamp for name, stamp in index["sources"].items()):
+          return None
+      except OSError:
+        return None
+    return cls(directory, index)
+
+  def sprite(self, name: str, size: Tuple[int, int], theme: str, scale: int = 1) -> Optional[Image.Image]:
+    entry = self.index["atlases"].get(atlas_name(theme, scale))
+    box = entry["sprites"].get(sprite_key(name, size)) if entry else None
+    if box is None:
+      return None
+    x, y, width, height = box
+    return self._sheet(entry["image"]).crop((x, y, x + width, y + height))
+
+  def _sheet(self, filename: str) -> Image.Image:
+    sheet = self._sheets.get(filename)
+    if sheet is None:
+      from PIL import Image
+
+      # Preloading runs off the Tk thread, so two threads may ask for the same sheet.
+      with self._lock:
+        sheet = self._sheets.get(filename)
+        if sheet is None:
+          sheet = Image.open(self.directory / filename)
+          sheet.load()
+          self._sheets[filename] = sheet
+    return sheet
+
+
+def _pack(sizes: Dict[str, Tuple[int, int]]) -> Tuple[Dict[str, List[int]], Tuple[int, int]]:
+  """Shelf-packs rectangles, tallest first, into rows about as wide as the sheet is tall."""
+  area = sum((width + PADDING) * (height + PADDING) for width, height in sizes.values())
+  row_limit = max(max(width for width, _ in sizes.values()) + PADDING, math.ceil(math.sqrt(area)))
+  boxes: Dict[str, List[int]] = {}
+  x = y = row_height = sheet_width = 0
+  for key, (width, height) in sorted(sizes.items(), key=lambda item: (-item[1][1], item[0])):
+    if x and x + width > row_limit:
+      x, y, row_height = 0, y + row_height + PADDING, 0
+    boxes[key] = [x, y, width, height]
+    x += width + PADDING
+    row_height = max(row_height, height)
+    sheet_width = max(sheet_width, x - PADDING)
+  return boxes, (sheet_width, y + row_height)
+
+
+def build_atlas(
+  output_dir: Path = ATLAS_DIR,
+  assets_dir: Path = ASSETS_DIR,
+  themes: Iterable[str] = tuple(THEME_CONFIG),
+  scales: Iterable[int] = (1,),
+  sprites: Iterable[Tuple[str, Tuple[int, int]]] = ATLAS_SPRITES,
+) -> Path:
+  from PIL import Image
+
+  # The atlas must match what the loose-PNG path produces, so reuse that pipeline.
+  from main import ImageManager, ThemeManager
+
+  sprites = list(dict.fromkeys((name, tuple(size)) for name, size in sprites))
+  output_dir.mkdir(parents=True, exist_ok=True)
+  index = {
+    "version": ATLAS_VERSION,
+    "rules": _rules_fingerprint(),
+    "sources": {name: _source_stamp(assets_dir / name) for name, _ in sprites},
+    "atlases": {},
+  }
+  for theme in themes:
+    manager = ImageManager(ThemeManager(theme))
+    for scale in scales:
+      images = {sprite_key(name, size): manager._load_processed_image(assets_dir / name, size, scale) for name, size in sprites}
+      boxes, sheet_size = _pack({key: image.size for key, image in images.items()})
+      sheet = Image.new("RGBA", sheet_size, (0, 0, 0, 0))
+      for key, image in images.items():
+        sheet.paste(image, tuple(boxes[key][:2]))
+      name = atlas_name(theme, scale)
+      sheet.save(output_dir / f"{name}.png")
+      index["atlases"][name] = {"image": f"{name}.png", "sprites": boxes}
+
+  # Written last and atomically, so a half-finished build is never picked up.
+  index_path = output_dir / ATLAS_INDEX
+  tmp_path = index_path.with_suffix(".tmp")
+  tmp_path.write_text(json.dumps(index, indent=2))
+  os.replace(tmp_path, index_path)
+  return index_path
+
+
+def main(argv: Optional[List[str]] = None):
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--output", type=Path, default=ATLAS_DIR)
+  parser.add_argument("--scales", type=int, nargs="+", default=[1], help="pixel scale factors to build, e.g. 1 2 for HiDPI")
+  args = parser.parse_args(argv)
+  index_path = build_atlas(args.output, scales=args.scales)
+  print(f"atlas written to {index_path.parent}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,152 @@
+"""Drives the evdev backend with pipes standing in for /dev/input devices.
+
+A keyboard and a mouse are simulated by pipes whose write ends receive input_event records
+stamped with CLOCK_MONOTONIC, as the kernel stamps them after EVIOCSCLOCKID. The run checks that
+locking grabs both devices, that the unlock chord still unlocks through the shared epoll loop,
+and that pointer events are never read while the pointer is only blocked. It then reports the
+delivery latency (event timestamp to callback) per event.
+
+With --compare-pynput and a DISPLAY, the same number of keys is injected through pynput's
+controller and timed from injection to the listener callback, for comparison.
+
+Usage: python benchmarks/bench_evdev.py [--events 5000] [--rate 2000] [--compare-pynput]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from input_backends import EV_KEY, EV_REL, EV_SYN, EVENT, REL_X, EvdevBackend, EvdevDevice
+from main import AppConfig, InputManager
+
+KEY_A, KEY_L, KEY_LEFTSHIFT, KEY_LEFTALT = 30, 38, 42, 56
+
+
+class PipeDevice(EvdevDevice):
+  """An evdev device backed by a pipe; grabs are recorded instead of issued as ioctls."""
+
+  def __init__(self, name: str, keyboard: bool, pointer: bool):
+    read_fd, self.write_fd = os.pipe()
+    os.set_blocking(read_fd, False)
+    super().__init__(read_fd, name, keyboard, pointer, monotonic=True)
+    self.grabs: List[bool] = []
+
+  def grab(self, enabled: bool):
+    self.grabs.append(enabled)
+    self.grabbed = enabled
+
+  def send(self, event_type: int, code: int, value: int):
+    now = time.monotonic_ns()
+    seconds, remainder = divmod(now, 1_000_000_000)
+    os.write(self.write_fd, EVENT.pack(seconds, remainder // 1000, event_type, code, value) + EVENT.pack(seconds, remainder // 1000, EV_SYN, 0, 0))
+
+
+def wait_for(predicate, timeout: float = 5.0):
+  deadline = time.monotonic() + timeout
+  while not predicate():
+    if time.monotonic() > deadline:
+      raise TimeoutError("events were not delivered in time")
+    time.sleep(0.001)
+
+
+def run_evdev(events: int, rate: float):
+  keyboard = PipeDevice("pipe keyboard", keyboard=True, pointer=False)
+  mouse = PipeDevice("pipe mouse", keyboard=False, pointer=True)
+  backend = EvdevBackend(devices=[keyboard, mouse])
+  unlocks = []
+  input_manager = InputManager(AppConfig(language="english", input_backend="evdev").unlock_chords(), backend)
+  input_manager.start_listening(lambda: unlocks.append(time.monotonic()))
+  input_manager.enable_input_suppression()
+
+  failures = []
+  if not (keyboard.grabbed and mouse.grabbed):
+    failures.append("locking did not grab both devices")
+
+  for _ in range(200):
+    mouse.send(EV_REL, REL_X, 1)
+  for index in range(events):
+    keyboard.send(EV_KEY, KEY_A, 1 - index % 2)
+    time.sleep(1 / rate)
+  wait_for(lambda: backend.reader.delivery.counts[0] + backend.reader.delivery.counts[1] >= events)
+
+  for code in (KEY_LEFTSHIFT, KEY_LEFTALT, KEY_L):
+    keyboard.send(EV_KEY, code, 1)
+  try:
+    wait_for(lambda: unlocks, timeout=2.0)
+  except TimeoutError:
+    failures.append("the unlock chord did not unlock")
+  input_manager.disable_input_suppression()
+
+  summary = backend.delivery_summary()["events"]  # type: ignore[index]
+  if summary["move"]["count"]:
+    failures.append("pointer events were read while the pointer was only blocked")
+  if keyboard.grabbed or mouse.grabbed:
+    failures.append("unlocking did not release the grabs")
+  input_manager.stop_listening()
+  backend.reader.close()
+  for device in (keyboard, mouse):
+    os.close(device.write_fd)
+  return summary, failures
+
+
+def run_pynput(events: int, rate: float):
+  from pynput import keyboard
+
+  latencies = []
+  sent = [0]
+  done = threading.Event()
+
+  def on_press(key):
+    latencies.append((time.perf_counter_ns() - sent[0]) / 1000)
+    if len(latencies) >= events:
+      done.set()
+
+  listener = keyboard.Listener(on_press=on_press)
+  listener.start()
+  listener.wait()
+  controller = keyboard.Controller()
+  for _ in range(events):
+    sent[0] = time.perf_counter_ns()
+    controller.press("a")
+    controller.release("a")
+    time.sleep(1 / rate)
+  done.wait(5)
+  listener.stop()
+  return latencies
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--events", type=int, default=5000)
+  parser.add_argument("--rate", type=float, default=2000, help="key events per second")
+  parser.add_argument("--compare-pynput", action="store_true", help="also time pynput's listener (needs a display)")
+  args = parser.parse_args()
+
+  summary, failures = run_evdev(args.events, args.rate)
+  for name in ("press", "release"):
+    event = summary[name]
+    print(f"evdev {name:<8} {event['count']:>6} events  mean {event['mean_us']:8.1f} us  p50 <= {event['p50_us']:g} us  p99 <= {event['p99_us']:g} us")
+
+  if args.compare_pynput:
+    if not os.environ.get("DISPLAY"):
+      print("pynput comparison skipped: no DISPLAY")
+    else:
+      latencies = run_pynput(min(args.events, 1000), min(args.rate, 500))
+      quantiles = statistics.quantiles(latencies, n=100)
+      print(f"pynput press    {len(latencies):>6} events  mean {statistics.mean(latencies):8.1f} us  p50 {quantiles[49]:.1f} us  p99 {quantiles[98]:.1f} us")
+
+  if failures:
+    print("FAILED: " + "; ".join(failures))
+    sys.exit(1)
+  print("ok")
+
+
+if __name__ == "__main__":
+  main()
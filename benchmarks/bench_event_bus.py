@@ -0,0 +1,105 @@
+"""Stress-tests EventBus with many producer threads and a single loop thread.
+
+Producers post numbered events as fast as they can (retrying when the bus is full) while the main
+thread plays the Tk loop. The run fails if any producer's events arrive out of order, if any are
+lost, or if the worst enqueue-to-handle latency exceeds the bound.
+
+Usage: python benchmarks/bench_event_bus.py [--producers 8] [--events 10000] [--max-latency-ms 100]
+"""
+
+import argparse
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from event_bus import EventBus
+
+
+class ThreadLoop:
+  """Runs after(0, ...) callbacks on the thread that calls run(), like a Tk mainloop."""
+
+  def __init__(self, work_per_tick: float):
+    self._callbacks = queue.SimpleQueue()
+    self.work_per_tick = work_per_tick
+    self.wakeups = 0
+
+  def after(self, ms: int, callback):
+    self._callbacks.put(callback)
+
+  def run(self, until: threading.Event):
+    while not until.is_set() or not self._callbacks.empty():
+      try:
+        callback = self._callbacks.get(timeout=0.01)
+      except queue.Empty:
+        continue
+      self.wakeups += 1
+      callback()
+      if self.work_per_tick:
+        # Stand-in for redraws and other handlers competing for the loop.
+        deadline = time.perf_counter() + self.work_per_tick
+        while time.perf_counter() < deadline:
+          pass
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--producers", type=int, default=8)
+  parser.add_argument("--events", type=int, default=10_000, help="events per producer")
+  parser.add_argument("--capacity", type=int, default=4096)
+  parser.add_argument("--loop-work-us", type=float, default=50.0, help="busy time per loop tick")
+  parser.add_argument("--max-latency-ms", type=float, default=100.0)
+  args = parser.parse_args()
+
+  loop = ThreadLoop(args.loop_work_us / 1e6)
+  bus = EventBus(loop.after, capacity=args.capacity)
+  last_seen = [-1] * args.producers
+  out_of_order = [0]
+  retries = [0] * args.producers
+
+  def handle(producer: int, seq: int):
+    if seq != last_seen[producer] + 1:
+      out_of_order[0] += 1
+    last_seen[producer] = seq
+
+  def produce(producer: int):
+    for seq in range(args.events):
+      while not bus.post(handle, producer, seq):
+        retries[producer] += 1
+        time.sleep(0)
+
+  done = threading.Event()
+  producers = [threading.Thread(target=produce, args=(index,)) for index in range(args.producers)]
+  start = time.perf_counter()
+  for thread in producers:
+    thread.start()
+  threading.Thread(target=lambda: ([thread.join() for thread in producers], done.set()), daemon=True).start()
+  loop.run(done)
+  elapsed = time.perf_counter() - start
+
+  metrics = bus.metrics()
+  expected = args.producers * args.events
+  received = sum(seq + 1 for seq in last_seen)
+  print(f"{expected} events from {args.producers} threads in {elapsed:.2f}s ({expected / elapsed:,.0f}/s)")
+  print(f"loop wake-ups: {loop.wakeups}, batches: {metrics['batches']}, events per batch: {expected / metrics['batches']:.1f}")
+  print(f"max depth: {metrics['max_depth']}, full-bus retries: {sum(retries)}")
+  print(f"latency mean {metrics['mean_latency_ms']:.3f} ms, max {metrics['max_latency_ms']:.3f} ms")
+
+  failures = []
+  if out_of_order[0]:
+    failures.append(f"{out_of_order[0]} events out of order")
+  if received != expected:
+    failures.append(f"received {received} of {expected} events")
+  if metrics["max_latency_ms"] > args.max_latency_ms:
+    failures.append(f"max latency above {args.max_latency_ms:g} ms")
+  if failures:
+    print("FAILED: " + "; ".join(failures))
+    sys.exit(1)
+  print("ok: per-producer order preserved, nothing lost, latency bounded")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,53 @@
+"""Measures daemon request round trips against a headless LockCore and the fake input backend.
+
+Usage: python benchmarks/bench_ipc_lock.py [--rounds 200]
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ipc import IpcServer, send_request
+from main import AppConfig, create_headless_core
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--rounds", type=int, default=200)
+  args = parser.parse_args()
+
+  core = create_headless_core(AppConfig(language="english", input_backend="fake"))
+  loop_thread = threading.Thread(target=core.loop.run_forever, daemon=True)
+  loop_thread.start()
+  with tempfile.TemporaryDirectory() as directory:
+    server = IpcServer(core, str(Path(directory) / "daemon.sock"), core.dispatch)
+    server.start()
+    timings = {"lock": [], "status": [], "unlock": []}
+    try:
+      for _ in range(args.rounds):
+        for command, samples in timings.items():
+          start = time.perf_counter()
+          reply = send_request(command, server.address, **({"duration": 60} if command == "lock" else {}))
+          samples.append(time.perf_counter() - start)
+          assert reply["ok"] and reply["locked"] == (command != "unlock"), reply
+    finally:
+      server.close()
+      core.dispatch(core.unlock)
+      core.loop.call_soon_threadsafe(core.loop.stop)
+      loop_thread.join()
+      core.input_manager.stop_listening()
+
+  for command, samples in timings.items():
+    samples.sort()
+    p99 = samples[int(len(samples) * 0.99) - 1]
+    print(f"{command:<8} median {statistics.median(samples) * 1000:6.3f} ms   p99 {p99 * 1000:6.3f} ms")
+
+
+if __name__ == "__main__":
+  main()
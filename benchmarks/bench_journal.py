@@ -0,0 +1,137 @@
+"""Measures the session journal: append cost, batched fsyncs, rotation, and aggregation speed.
+
+1. A LockCore with a journal and the fake input backend locks three times, ending by the timer,
+   the unlock chord and a request. The aggregate must show one session per reason.
+2. ``--sessions`` records are appended from this thread. The run reports the cost per append()
+   call, the writer's fsyncs and the files it rotated through.
+3. A torn record is appended by hand, as after a crash. Reopening the journal must drop it.
+4. The directory is aggregated by the mmap reader, and by a plain struct.iter_unpack loop
+   for comparison.
+
+Usage: python benchmarks/bench_journal.py [--sessions 2000000] [--max-file-mib 16]
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core import LockCore
+from input_backends import create_backend
+from journal import DURATION, FIELDS, REASON, REASONS, RECORD, SessionJournal, aggregate, journal_files
+from main import AppConfig, InputManager
+
+
+def check_core(directory: Path) -> list:
+  journal = SessionJournal(directory)
+  input_manager = InputManager(AppConfig(language="english", input_backend="fake").unlock_chords(), create_backend("fake"))
+  input_manager.start_listening(lambda: None)
+  core = LockCore(input_manager, 0.05)
+  core.journal = journal
+  core.lock()
+  core.loop.run_until_complete(asyncio.sleep(0.1))  # the countdown ends the first lock
+  core.lock()
+  core.unlock_threadsafe()  # what the listeners call for the unlock chord
+  core.loop.run_until_complete(asyncio.sleep(0.01))
+  core.lock()
+  core.unlock()
+  input_manager.stop_listening()
+  core.loop.close()
+  journal.close()
+  by_reason = aggregate(directory)["by_reason"]
+  expected = {"timer": 1, "combo": 1, "request": 1, "stall": 0, "schedule": 0, "shutdown": 0}
+  return [] if by_reason == expected else [f"core sessions by reason {by_reason}, expected {expected}"]
+
+
+def fill(directory: Path, sessions: int, max_file_bytes: int):
+  journal = SessionJournal(directory, max_file_bytes=max_file_bytes, fsync_interval=0.5)
+  rng = random.Random(1)
+  now = time.time() - sessions * 300
+  start = time.perf_counter()
+  for index in range(sessions):
+    planned = rng.choice((60.0, 120.0, 300.0))
+    reason = rng.randrange(len(REASONS))
+    duration = planned if reason == 0 else rng.uniform(1, planned)
+    journal.append(
+      {
+        "started_at": now + index * 300,
+        "ended_at": now + index * 300 + duration,
+        "duration_s": duration,
+        "planned_s": planned,
+        "reason": reason,
+        "keys_suppressed": rng.randrange(200),
+        "suppression_enabled_ms": rng.uniform(0.1, 2.0),
+        "first_suppressed_event_ms": rng.uniform(1, 50),
+      }
+    )
+  appended = time.perf_counter() - start
+  journal.close(timeout=60)
+  total = time.perf_counter() - start
+  return appended, total, journal.fsyncs, journal.written
+
+
+def naive_aggregate(directory: Path) -> dict:
+  sessions, locked = 0, 0.0
+  by_reason = dict.fromkeys(REASONS, 0)
+  for path in journal_files(directory):
+    data = path.read_bytes()[16:]  # past the file header
+    data = data[: len(data) // RECORD.size * RECORD.size]
+    for record in RECORD.iter_unpack(data):
+      sessions += 1
+      locked += record[DURATION]
+      by_reason[REASONS[record[REASON]]] += 1
+  return {"sessions": sessions, "locked_s_total": locked, "by_reason": by_reason}
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--sessions", type=int, default=2_000_000)
+  parser.add_argument("--max-file-mib", type=float, default=16)
+  args = parser.parse_args()
+  failures = []
+
+  with tempfile.TemporaryDirectory() as tmp:
+    failures += check_core(Path(tmp) / "core")
+
+    directory = Path(tmp) / "fleet"
+    appended, total, fsyncs, written = fill(directory, args.sessions, int(args.max_file_mib * 1024 * 1024))
+    files = journal_files(directory)
+    size = sum(path.stat().st_size for path in files)
+    print(f"{RECORD.size}-byte records ({len(FIELDS)} fields)")
+    print(f"append: {appended / args.sessions * 1e6:.2f} us per call; written and synced after {total:.2f} s with {fsyncs} fsyncs")
+    print(f"files: {len(files)} ({size / 1024 / 1024:.1f} MiB)")
+    if written != args.sessions:
+      failures.append(f"{written} of {args.sessions} records written")
+
+    with open(files[-1], "ab") as file:
+      file.write(b"\0" * (RECORD.size // 2))
+    reopened = SessionJournal(directory)
+    reopened.append({"reason": 2})
+    reopened.close()
+
+    start = time.perf_counter()
+    summary = aggregate(directory)
+    fast = time.perf_counter() - start
+    start = time.perf_counter()
+    naive = naive_aggregate(directory)
+    slow = time.perf_counter() - start
+    print(f"aggregate {summary['sessions']:,} sessions: mmap reader {fast * 1000:.0f} ms, struct.iter_unpack loop {slow * 1000:.0f} ms")
+    print(f"  by reason {summary['by_reason']}, mean duration {summary['duration_s_mean']:.1f} s")
+    if summary["sessions"] != args.sessions + 1:
+      failures.append(f"aggregate saw {summary['sessions']} sessions after the torn record, expected {args.sessions + 1}")
+    if summary["by_reason"] != naive["by_reason"] or abs(summary["locked_s_total"] - naive["locked_s_total"]) > 1e-6 * naive["locked_s_total"]:
+      failures.append("the column reader disagrees with the plain reader")
+
+  if failures:
+    print("FAILED: " + "; ".join(failures))
+    sys.exit(1)
+  print("ok")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,118 @@
+"""Compares the old all-languages TRANSLATIONS dict with lazily loaded compiled catalogs.
+
+Generates ``--languages`` synthetic catalogs (the shipped ones with each message tagged per
+language) in a temporary directory, compiles them, and then measures for both approaches:
+
+- load time and the memory still allocated after loading (tracemalloc),
+- get_text for a translated key, and for a key only the fallback has,
+- formatting the overlay's ``locked_detailed_message``.
+
+Usage: python benchmarks/bench_localization.py [--languages 60] [--lookups 200000]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import LOCALES_DIR
+from localization import DEFAULT_LANGUAGE, compile_catalog
+from main import LocalizationManager
+
+ACTIVE = "lang030"
+VALUES = {"minutes": 2, "combo": "Shift + Alt + L"}
+
+
+class LegacyLocalization:
+  """The previous lookup: two-level fallback through every language, then str.format."""
+
+  def __init__(self, translations: dict, language: str):
+    self.translations = translations
+    self.language = language
+
+  def get_text(self, key: str) -> str:
+    for lang_code in (self.language, DEFAULT_LANGUAGE):
+      text = self.translations.get(lang_code, {}).get(key)
+      if text is not None:
+        return text
+    return f"<KEY:'{key}'_NOT_FOUND>"
+
+
+def write_catalogs(directory: Path, count: int):
+  sources = [json.loads(path.read_text(encoding="utf-8")) for path in sorted(LOCALES_DIR.glob("*.json"))]
+  english = json.loads((LOCALES_DIR / f"{DEFAULT_LANGUAGE}.json").read_text(encoding="utf-8"))
+  (directory / f"{DEFAULT_LANGUAGE}.json").write_text(json.dumps(english, ensure_ascii=False), encoding="utf-8")
+  for index in range(count):
+    messages = {key: f"{text} [{index}]" for key, text in sources[index % len(sources)].items()}
+    messages.pop("input_backend_error", None)  # leave one key to the fallback
+    (directory / f"lang{index:03d}.json").write_text(json.dumps(messages, ensure_ascii=False), encoding="utf-8")
+  for source in directory.glob("*.json"):
+    compile_catalog(source)
+
+
+def measure(label: str, build):
+  tracemalloc.start()
+  start = time.perf_counter()
+  result = build()
+  elapsed = (time.perf_counter() - start) * 1000
+  retained = tracemalloc.get_traced_memory()[0]
+  tracemalloc.stop()
+  print(f"{label:<36} load {elapsed:8.3f} ms   retained {retained / 1024:8.1f} KiB")
+  return result
+
+
+def per_call_ns(function, lookups: int) -> float:
+  return min(timeit.repeat(function, number=lookups, repeat=5)) / lookups * 1e9
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--languages", type=int, default=60)
+  parser.add_argument("--lookups", type=int, default=200_000)
+  args = parser.parse_args()
+
+  with tempfile.TemporaryDirectory() as tmp:
+    directory = Path(tmp)
+    write_catalogs(directory, args.languages)
+    print(f"{args.languages + 1} languages, active {ACTIVE}")
+
+    def load_all():
+      return {path.stem: json.loads(path.read_text(encoding="utf-8")) for path in directory.glob("*.json")}
+
+    legacy = measure("legacy: every language in memory", lambda: LegacyLocalization(load_all(), ACTIVE))
+
+    def load_catalogs():
+      manager = LocalizationManager(ACTIVE, directory)
+      manager.get_text("title")
+      return manager
+
+    load_catalogs()  # warm up the loader's code paths before timing it
+    current = measure("catalogs: active + fallback", load_catalogs)
+    for path in directory.glob("*.cat"):
+      path.unlink()
+    measure("catalogs: active + fallback, JSON", load_catalogs)
+
+    print()
+    rows = [
+      ("get_text (translated key)", lambda: legacy.get_text("title"), lambda: current.get_text("title")),
+      ("get_text (fallback key)", lambda: legacy.get_text("input_backend_error"), lambda: current.get_text("input_backend_error")),
+      (
+        "format locked_detailed_message",
+        lambda: legacy.get_text("locked_detailed_message").format(**VALUES),
+        lambda: current.format("locked_detailed_message", **VALUES),
+      ),
+    ]
+    print(f"{'per call':<36} {'legacy':>10} {'catalogs':>10}")
+    for label, old, new in rows:
+      assert old() == new(), label
+      print(f"{label:<36} {per_call_ns(old, args.lookups):>7.0f} ns {per_call_ns(new, args.lookups):>7.0f} ns")
+
+
+if __name__ == "__main__":
+  main()
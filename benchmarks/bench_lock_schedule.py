@@ -0,0 +1,147 @@
+"""Checks that the lock scheduler only wakes for its own deadlines, and how promptly it fires.
+
+1. Simulated week: a nightly window ("02:00 for 30m") and break reminders ("every 50m for 5m")
+   run on a virtual wall clock, with a 5-hour suspend in the middle. Reports timer wakeups per
+   day against the windows started and ended, idle wakeups (must be 0), and the windows missed
+   while suspended.
+2. Idle: with the next window an hour away, the real timer thread sits for ``--idle-seconds``.
+   Its wakeups and context switches (from /proc) must be 0. A thread that polls once a second is
+   measured alongside for comparison.
+3. Accuracy: ``--windows`` short windows are fired by the real timer, and the delay from each
+   window's start to on_start is reported.
+
+Usage: python benchmarks/bench_lock_schedule.py [--idle-seconds 5] [--windows 20]
+"""
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from lock_schedule import LockScheduler, ScheduledLock
+
+DAYS = 7
+
+
+class VirtualTimer:
+  def __init__(self, on_fire):
+    self.on_fire = on_fire
+    self.deadline = None
+
+  def set(self, deadline):
+    self.deadline = deadline
+
+  def close(self):
+    self.deadline = None
+
+
+def simulate_week():
+  now = [datetime(2026, 1, 5, 12, 0).timestamp()]
+  starts, ends = [], []
+  scheduler = LockScheduler(
+    [ScheduledLock.parse("02:00 for 30m"), ScheduledLock.parse("every 50m for 5m")],
+    starts.append,
+    lambda: ends.append(now[0]),
+    post=lambda callback: callback(),
+    clock=lambda: now[0],
+    timer_factory=VirtualTimer,
+  )
+  scheduler.start()
+  timer = scheduler.timer
+  end = now[0] + DAYS * 24 * 3600
+  suspend_at, suspended = now[0] + 3.5 * 24 * 3600, False
+  while timer.deadline is not None and timer.deadline < end:
+    now[0] = timer.deadline
+    if not suspended and now[0] >= suspend_at:
+      suspended = True
+      now[0] += 5 * 3600  # the machine sleeps; the kernel timer fires on resume
+    timer.on_fire()
+  return scheduler.stats(), len(starts), len(ends)
+
+
+def context_switches(native_id: int) -> int:
+  total = 0
+  for line in Path(f"/proc/self/task/{native_id}/status").read_text().splitlines():
+    if line.startswith(("voluntary_ctxt_switches", "nonvoluntary_ctxt_switches")):
+      total += int(line.split()[1])
+  return total
+
+
+def measure_idle(seconds: float):
+  scheduler = LockScheduler([ScheduledLock(60, every_seconds=3600)], lambda remaining: None, lambda: None, post=lambda callback: callback())
+  scheduler.start()
+  stop = threading.Event()
+  polls = [0]
+
+  def poll():
+    while not stop.wait(1.0):
+      polls[0] += 1
+
+  poller = threading.Thread(target=poll, daemon=True)
+  poller.start()
+  time.sleep(0.1)
+  timer_thread = scheduler.timer.thread
+  before = context_switches(timer_thread.native_id), context_switches(poller.native_id)  # type: ignore[arg-type]
+  wakeups = scheduler.timer.wakeups
+  time.sleep(seconds)
+  after = context_switches(timer_thread.native_id), context_switches(poller.native_id)  # type: ignore[arg-type]
+  stop.set()
+  scheduler.close()
+  return scheduler.timer.wakeups - wakeups, after[0] - before[0], after[1] - before[1], scheduler.timer.uses_timerfd
+
+
+def measure_accuracy(windows: int):
+  lateness = []
+  done = threading.Event()
+  schedule = ScheduledLock(0.05, every_seconds=0.1)
+
+  def on_start(remaining: float):
+    lateness.append((schedule.duration_seconds - remaining) * 1000)
+    if len(lateness) >= windows:
+      done.set()
+
+  scheduler = LockScheduler([schedule], on_start, lambda: None, post=lambda callback: callback())
+  scheduler.start()
+  done.wait(windows * 0.1 + 5)
+  scheduler.close()
+  return lateness, scheduler.stats()
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--idle-seconds", type=float, default=5.0)
+  parser.add_argument("--windows", type=int, default=20)
+  args = parser.parse_args()
+  failures = []
+
+  stats, starts, ends = simulate_week()
+  print(f"simulated {DAYS} days with a 5h suspend: {stats['wakeups']} wakeups ({stats['wakeups'] / DAYS:.1f}/day) for {starts} starts and {ends} ends")
+  print(f"  idle wakeups {stats['idle_wakeups']}, windows missed while suspended {stats['missed']}")
+  if stats["idle_wakeups"]:
+    failures.append("the simulated scheduler woke with nothing due")
+
+  wakeups, switches, poll_switches, timerfd = measure_idle(args.idle_seconds)
+  print(f"idle {args.idle_seconds:g}s ({'timerfd' if timerfd else 'sleeping fallback'}): timer wakeups {wakeups}, context switches {switches}")
+  print(f"  a 1 s polling thread over the same time: {poll_switches} context switches")
+  if timerfd and (wakeups or switches):
+    failures.append("the timer thread woke while idle")
+
+  lateness, stats = measure_accuracy(args.windows)
+  if lateness:
+    print(f"{len(lateness)} windows: start delay p50 {statistics.median(lateness):.3f} ms, max {max(lateness):.3f} ms; idle wakeups {stats['idle_wakeups']}")
+  if len(lateness) < args.windows:
+    failures.append("not every window started")
+
+  if failures:
+    print("FAILED: " + "; ".join(failures))
+    sys.exit(1)
+  print("ok")
+
+
+if __name__ == "__main__":
+  main()
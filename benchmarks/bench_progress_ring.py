@@ -0,0 +1,142 @@
+"""Counts how often the countdown ring wakes and redraws over whole locks, on a simulated clock.
+
+A recording canvas stands in for Tk, and a virtual clock drives the ring's after() calls. For each
+lock length and frame cap, it reports:
+
+- wakeups: timer callbacks, compared to a fixed-rate animation at the same cap,
+- redraws and item updates: frames that changed something, and itemconfigure calls,
+- skipped: wakeups that found nothing to redraw,
+- missed tenths: timer values the display never showed (0 at caps of 10 fps and up).
+
+With a DISPLAY, a real ring is also animated for ``--tk-seconds`` seconds, to report frame cost
+and the process's CPU use.
+
+Usage: python benchmarks/bench_progress_ring.py [--durations 60 600 3600] [--fps 30 60] [--tk-seconds 5]
+"""
+
+import argparse
+import heapq
+import itertools
+import math
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import RING_DIAMETER
+from progress_ring import ProgressRing, format_tenths
+
+
+class RecordingCanvas:
+  def __init__(self):
+    self.ids = itertools.count(1)
+    self.updates = 0
+    self.labels = []
+
+  def _create(self, *args, **options):
+    return next(self.ids)
+
+  create_oval = create_arc = create_text = _create
+
+  def itemconfigure(self, item, **options):
+    self.updates += 1
+    if "text" in options:
+      self.labels.append(options["text"])
+
+  def update_idletasks(self):
+    pass
+
+
+class FlatStyles:
+  def style_item(self, canvas, item, **options):
+    return item
+
+
+class VirtualClock:
+  def __init__(self):
+    self.now = 0.0
+    self.timers = []
+    self.order = itertools.count()
+    self.wakeups = 0
+
+  def schedule(self, ms, callback):
+    entry = [self.now + ms / 1000, next(self.order), callback]
+    heapq.heappush(self.timers, entry)
+    return entry
+
+  def cancel(self, entry):
+    entry[2] = None
+
+  def run(self):
+    while self.timers:
+      due, _, callback = heapq.heappop(self.timers)
+      if callback is not None:
+        self.now = due
+        self.wakeups += 1
+        callback()
+
+
+def simulate(duration: float, max_fps: float):
+  clock = VirtualClock()
+  canvas = RecordingCanvas()
+  ring = ProgressRing(canvas, FlatStyles(), RING_DIAMETER, max_fps=max_fps, schedule=clock.schedule, cancel=clock.cancel, clock=lambda: clock.now)
+  ring.start(lambda: max(0.0, duration - clock.now), duration)
+  clock.run()
+  shown = set(canvas.labels)
+  missed = sum(1 for tenth in range(round(duration * 10) + 1) if format_tenths(tenth / 10) not in shown)
+  return clock.wakeups, ring.frames, canvas.updates, ring.skipped, missed
+
+
+def run_tk(seconds: float, max_fps: float):
+  import tkinter as tk
+
+  from main import StyleRegistry, ThemeManager
+
+  root = tk.Tk()
+  canvas = tk.Canvas(root, width=RING_DIAMETER, height=RING_DIAMETER, highlightthickness=0)
+  canvas.pack()
+  ring = ProgressRing(canvas, StyleRegistry(ThemeManager(), None), RING_DIAMETER, max_fps=max_fps)  # type: ignore[arg-type]
+  root.update()
+  deadline = time.monotonic() + seconds
+  cpu = time.process_time()
+  ring.start(lambda: max(0.0, deadline - time.monotonic()), seconds)
+  root.after(round(seconds * 1000) + 50, root.quit)
+  root.mainloop()
+  cpu_percent = (time.process_time() - cpu) / seconds * 100
+  root.destroy()
+  return ring.summary(), cpu_percent
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--durations", type=float, nargs="+", default=[60, 600, 3600])
+  parser.add_argument("--fps", type=float, nargs="+", default=[30, 60])
+  parser.add_argument("--tk-seconds", type=float, default=5.0)
+  args = parser.parse_args()
+
+  print(f"{'lock s':>7} {'fps':>4} {'wakeups':>9} {'fixed-rate':>11} {'redraws':>9} {'updates':>9} {'skipped':>8} {'missed':>7}")
+  failed = False
+  for duration, max_fps in itertools.product(args.durations, args.fps):
+    wakeups, frames, updates, skipped, missed = simulate(duration, max_fps)
+    failed |= missed > 0 and max_fps >= 10
+    fixed = math.ceil(duration * max_fps)
+    print(f"{duration:>7g} {max_fps:>4g} {wakeups:>9} {fixed:>11} {frames:>9} {updates:>9} {skipped:>8} {missed:>7}")
+
+  if os.environ.get("DISPLAY") or sys.platform in ("win32", "darwin"):
+    summary, cpu_percent = run_tk(args.tk_seconds, args.fps[0])
+    print(
+      f"\ntk, {args.tk_seconds:g}s at {args.fps[0]:g} fps: {summary['frames']} frames, p50 {summary['frame_p50_ms']:.3f} ms, "
+      f"p99 {summary['frame_p99_ms']:.3f} ms, max {summary['frame_max_ms']:.3f} ms, CPU {cpu_percent:.1f}%"
+    )
+  else:
+    print("\ntk frame cost skipped: no DISPLAY")
+  if failed:
+    print("FAILED: some tenths were never shown")
+    sys.exit(1)
+  print("ok")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,66 @@
+"""Compares imaging.recolor against the original per-pixel theme loop.
+
+Usage: python benchmarks/bench_recolor.py [--repeat N] [--sizes 64 256 1024]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PIL import Image
+
+from config import ASSETS_DIR, THEME_RECOLOR_RULES
+from imaging import compile_rules, recolor
+
+
+def legacy_recolor(img: Image.Image) -> Image.Image:
+  img = img.copy()
+  new_data = []
+  for item in img.getdata():
+    if item[0] < 10 and item[1] < 10 and item[2] < 10:
+      new_data.append((255, 255, 255, item[3]))
+    else:
+      new_data.append(item)
+  img.putdata(new_data)
+  return img
+
+
+def synthetic_image(size: int, seed: int = 0) -> Image.Image:
+  # Tile a real asset and sprinkle near-black noise so both branches of the rule are exercised.
+  rng = random.Random(seed)
+  base = Image.open(ASSETS_DIR / "step-clean.png").convert("RGBA").resize((size, size))
+  noise = bytes(rng.choice((0, 5, 9, 10, 128, 255)) for _ in range(size * size * 4))
+  return Image.blend(base, Image.frombytes("RGBA", (size, size), noise), 0.5)
+
+
+def best_of(func, img, repeat: int) -> float:
+  best = float("inf")
+  for _ in range(repeat):
+    start = time.perf_counter()
+    func(img)
+    best = min(best, time.perf_counter() - start)
+  return best
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--repeat", type=int, default=3)
+  parser.add_argument("--sizes", type=int, nargs="+", default=[64, 128, 256, 512, 1024, 2048])
+  args = parser.parse_args()
+
+  rules = compile_rules(THEME_RECOLOR_RULES["dark"])
+  print(f"{'size':>10} {'legacy ms':>12} {'bulk ms':>12} {'speedup':>9}  identical")
+  for size in args.sizes:
+    img = synthetic_image(size)
+    identical = legacy_recolor(img).tobytes() == recolor(img, rules).tobytes()
+    legacy = best_of(legacy_recolor, img, args.repeat)
+    bulk = best_of(lambda i: recolor(i, rules), img, args.repeat)
+    print(f"{size:>5}x{size:<4} {legacy * 1000:>12.2f} {bulk * 1000:>12.2f} {legacy / bulk:>8.1f}x  {identical}")
+
+
+if __name__ == "__main__":
+  main()
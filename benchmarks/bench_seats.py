@@ -0,0 +1,135 @@
+"""Memory and startup for N seats in one process versus one process per seat.
+
+Starts ``--seats`` Xvfb servers. For each n from 1 to that count, it runs:
+
+- shared: one process with a SeatController over the first n displays,
+- separate: n processes, each running a single CleanLockApp on its own display.
+
+Each process runs until every seat has its input ready, then reports its resident set size
+(VmRSS). The table shows total RSS, the increase per additional seat, and the wall time from
+spawning the processes until the last seat is ready. Needs Linux with Xvfb installed; seats use
+the fake input backend, so no real input device is involved.
+
+Usage: python benchmarks/bench_seats.py [--seats 4] [--repeat 3]
+"""
+
+import argparse
+import json
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+def rss_kib() -> int:
+  for line in Path("/proc/self/status").read_text().splitlines():
+    if line.startswith("VmRSS:"):
+      return int(line.split()[1])
+  return 0
+
+
+def worker(displays: List[str]):
+  """Child process: bring up the seats, wait until all are ready, print RSS as JSON and exit."""
+  import tkinter as tk
+
+  from main import AppConfig, CleanLockApp, SeatController, import_ui_dependencies
+
+  import_ui_dependencies()
+  config = AppConfig(input_backend="fake")
+  root = tk.Tk(screenName=displays[0])
+  if len(displays) == 1:
+    apps = [CleanLockApp(root, config=config)]
+  else:
+    apps = SeatController(root, displays, config).seats
+  deadline = time.monotonic() + 60
+  while not all(app.input_ready for app in apps):
+    if time.monotonic() > deadline:
+      sys.exit("seats did not become ready")
+    root.update()
+    time.sleep(0.002)
+  print(json.dumps({"rss_kib": rss_kib()}), flush=True)
+
+
+def start_servers(count: int) -> Tuple[List[subprocess.Popen], List[str]]:
+  xvfb = shutil.which("Xvfb")
+  if xvfb is None or not sys.platform.startswith("linux"):
+    return [], []
+  processes, displays = [], []
+  number = 120
+  while len(displays) < count:
+    while Path(f"/tmp/.X11-unix/X{number}").exists():
+      number += 1
+    processes.append(subprocess.Popen([xvfb, f":{number}", "-screen", "0", "1280x800x24", "-nolisten", "tcp"], stderr=subprocess.DEVNULL))
+    displays.append(f":{number}")
+    number += 1
+  deadline = time.monotonic() + 10
+  for process, display in zip(processes, displays):
+    while not Path(f"/tmp/.X11-unix/X{display[1:]}").exists():
+      if process.poll() is not None or time.monotonic() > deadline:
+        stop_servers(processes)
+        return [], []
+      time.sleep(0.05)
+  return processes, displays
+
+
+def stop_servers(processes: List[subprocess.Popen]):
+  for process in processes:
+    process.terminate()
+  for process in processes:
+    process.wait()
+
+
+def run_processes(groups: List[List[str]]) -> Tuple[float, int]:
+  """Starts one worker per display group; returns (ms until all are ready, total RSS in KiB)."""
+  start = time.perf_counter()
+  children = [subprocess.Popen([sys.executable, __file__, "--worker", *group], cwd=ROOT, stdout=subprocess.PIPE, text=True) for group in groups]
+  reports = []
+  for child in children:
+    line = child.stdout.readline()  # type: ignore[union-attr]
+    if not line:
+      raise RuntimeError(f"worker for {child.args[3:]} exited with {child.wait()}")
+    reports.append(json.loads(line))
+  elapsed = (time.perf_counter() - start) * 1000
+  for child in children:
+    child.terminate()
+    child.wait()
+  return elapsed, sum(report["rss_kib"] for report in reports)
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--seats", type=int, default=4)
+  parser.add_argument("--repeat", type=int, default=3)
+  parser.add_argument("--worker", nargs="+", metavar="DISPLAY", help=argparse.SUPPRESS)
+  args = parser.parse_args()
+  if args.worker:
+    worker(args.worker)
+    return
+
+  servers, displays = start_servers(args.seats)
+  if not displays:
+    print("skipped: Xvfb is not available")
+    return
+  try:
+    print(f"{'seats':>5}  {'mode':<8} {'RSS MiB':>9} {'per seat':>9} {'+ per extra':>11} {'ready ms':>9}")
+    baseline = {}
+    for count in range(1, len(displays) + 1):
+      for mode, groups in (("shared", [displays[:count]]), ("separate", [[display] for display in displays[:count]])):
+        samples = [run_processes(groups) for _ in range(args.repeat)]
+        ready = statistics.median(elapsed for elapsed, _ in samples)
+        rss = statistics.median(total for _, total in samples) / 1024
+        baseline.setdefault(mode, rss)
+        extra = (rss - baseline[mode]) / (count - 1) if count > 1 else 0.0
+        print(f"{count:>5}  {mode:<8} {rss:>9.1f} {rss / count:>9.1f} {extra:>11.1f} {ready:>9.0f}")
+  finally:
+    stop_servers(servers)
+
+
+if __name__ == "__main__":
+  main()
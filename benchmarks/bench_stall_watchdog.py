@@ -0,0 +1,73 @@
+"""Stalls the core's event loop mid-lock and checks that the watchdog releases input in time.
+
+A headless LockCore runs on the fake input backend. Shortly after locking, a callback blocks the
+loop thread (as a hung redraw or modal dialog would). The run fails unless input is released
+within the stall timeout plus one watchdog poll, and the lock state converges once the loop
+recovers.
+
+Usage: python benchmarks/bench_stall_watchdog.py [--stall-timeout 0.5] [--stall 2.0]
+"""
+
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from main import AppConfig, create_headless_core
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--stall-timeout", type=float, default=0.5, help="watchdog bound in seconds")
+  parser.add_argument("--stall", type=float, default=2.0, help="how long the loop is blocked")
+  parser.add_argument("--lock", type=float, default=60.0, help="lock length in seconds")
+  args = parser.parse_args()
+
+  config = AppConfig(language="english", input_backend="fake", stall_timeout_seconds=args.stall_timeout)
+  core = create_headless_core(config)
+  listener = core.input_manager.backend.keyboard_listeners[0]
+  loop = core.loop
+  stalled_at = []
+  released_at = []
+
+  def stall():
+    stalled_at.append(time.monotonic())
+    time.sleep(args.stall)  # blocks the loop thread, so no timer or heartbeat can run
+
+  def watch_release():
+    while not stalled_at or listener.suppressed:
+      time.sleep(0.001)
+    released_at.append(time.monotonic())
+
+  core.lock(args.lock)
+  threading.Thread(target=watch_release, daemon=True).start()
+  loop.call_later(0.3, stall)
+  loop.call_later(0.3 + args.stall + 0.5, loop.stop)
+  loop.run_forever()
+
+  release_delay = released_at[0] - stalled_at[0] if released_at else None
+  status = core.status()
+  core.input_manager.stop_listening()
+  loop.close()
+
+  bound = args.stall_timeout * 1.25 + 0.05
+  print(f"loop stalled for {args.stall:g}s with a {args.stall_timeout:g}s watchdog bound")
+  print(f"input released {release_delay:.3f}s into the stall" if release_delay is not None else "input never released")
+  print(f"after recovery: locked={status['locked']}, stall releases={status['stall_releases']}, loop lag {status['loop_lag']}")
+
+  failures = []
+  if release_delay is None or release_delay > bound:
+    failures.append(f"input not released within {bound:.3f}s")
+  if status["locked"]:
+    failures.append("core still locked after the loop recovered")
+  if failures:
+    print("FAILED: " + "; ".join(failures))
+    sys.exit(1)
+  print("ok")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,142 @@
+"""Replays synthetic key streams through the unlock matcher and the original list/set check.
+
+Usage: python benchmarks/bench_unlock_matcher.py [--events 2000000] [--seed 1]
+"""
+
+import argparse
+import enum
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from unlock_matcher import OTHER_KEY, UnlockChord, UnlockMatcher
+
+
+class FakeKey(enum.Enum):
+  # Stands in for pynput.keyboard.Key: special keys are enum members with a name.
+  shift = 1
+  alt_l = 2
+  ctrl_l = 3
+  space = 4
+
+
+class FakeKeyCode:
+  # Stands in for pynput.keyboard.KeyCode: printable keys carry a char.
+  __slots__ = ("char",)
+
+  def __init__(self, char):
+    self.char = char
+
+  def __eq__(self, other):
+    return isinstance(other, FakeKeyCode) and self.char == other.char
+
+  def __hash__(self):
+    return hash(self.char)
+
+
+CHORDS = [UnlockChord.parse(["shift", "alt_l", "l"]), UnlockChord.parse(["ctrl_l", "alt_l", "u"], window_seconds=2.0)]
+
+
+def make_stream(count: int, seed: int):
+  # Mostly typing noise with autorepeat storms, plus a completed chord every few thousand events.
+  rng = random.Random(seed)
+  letters = [FakeKeyCode(c) for c in "abcdefghijklmnopqrstuvwxyzL"]
+  specials = list(FakeKey)
+  chords = [[FakeKey.shift, FakeKey.alt_l, FakeKeyCode("L")], [FakeKey.ctrl_l, FakeKey.alt_l, FakeKeyCode("u")]]
+  events = []
+  while len(events) < count:
+    roll = rng.random()
+    if roll < 0.002:
+      chord = rng.choice(chords)
+      events.extend((True, key) for key in chord)
+      events.extend((False, key) for key in reversed(chord))
+    elif roll < 0.05:
+      key = rng.choice(letters)
+      events.extend([(True, key)] * rng.randint(20, 60))  # held key autorepeat
+      events.append((False, key))
+    else:
+      key = rng.choice(letters + specials)
+      events.append((True, key))
+      events.append((False, key))
+  return events[:count]
+
+
+def run_legacy(events) -> int:
+  unlock_sequence = [FakeKey.shift, FakeKey.alt_l, FakeKeyCode("l")]
+  pressed_keys = set()
+  key_sequence = []
+  unlocks = 0
+  for is_press, key in events:
+    normalized = FakeKeyCode(key.char.lower()) if isinstance(key, FakeKeyCode) and key.char else key
+    if is_press:
+      pressed_keys.add(normalized)
+      if normalized not in key_sequence:
+        key_sequence.append(normalized)
+      if len(pressed_keys) >= len(unlock_sequence):
+        recent = key_sequence[-len(unlock_sequence) :]
+        if set(recent) == set(unlock_sequence) and recent == unlock_sequence:
+          unlocks += 1
+    else:
+      pressed_keys.discard(normalized)
+      key_sequence.clear()
+  return unlocks
+
+
+def run_matcher(events, chords) -> int:
+  matcher = UnlockMatcher(chords)
+  char_ids = {}
+  name_ids = {}
+  for token, key_id in matcher.key_ids.items():
+    if len(token) == 1:
+      char_ids[token] = char_ids[token.upper()] = key_id
+    else:
+      name_ids[token] = key_id
+
+  unlocks = 0
+  press = matcher.press
+  release = matcher.release
+  for is_press, key in events:
+    if is_press:
+      char = getattr(key, "char", None)
+      key_id = char_ids.get(char, OTHER_KEY) if char is not None else name_ids.get(getattr(key, "name", None), OTHER_KEY)
+      if press(key_id):
+        unlocks += 1
+    else:
+      release()
+  return unlocks
+
+
+def timed(func, *args):
+  start = time.perf_counter()
+  result = func(*args)
+  return result, time.perf_counter() - start
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--events", type=int, default=2_000_000)
+  parser.add_argument("--seed", type=int, default=1)
+  args = parser.parse_args()
+
+  events = make_stream(args.events, args.seed)
+  legacy_unlocks, legacy_time = timed(run_legacy, events)
+  single_unlocks, single_time = timed(run_matcher, events, CHORDS[:1])
+  multi_unlocks, multi_time = timed(run_matcher, events, CHORDS)
+
+  print(f"events: {len(events):,}")
+  print(f"{'implementation':<24} {'unlocks':>8} {'total s':>9} {'ns/event':>9}")
+  for name, unlocks, elapsed in (
+    ("legacy list/set", legacy_unlocks, legacy_time),
+    ("matcher, 1 chord", single_unlocks, single_time),
+    ("matcher, 2 chords", multi_unlocks, multi_time),
+  ):
+    print(f"{name:<24} {unlocks:>8} {elapsed:>9.3f} {elapsed / len(events) * 1e9:>9.0f}")
+  if legacy_unlocks != single_unlocks:
+    print("WARNING: matcher and legacy check disagree on the primary chord")
+
+
+if __name__ == "__main__":
+  main()
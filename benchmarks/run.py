@@ -0,0 +1,275 @@
+"""Startup and lock-cycle benchmark suite with JSON results and a regression check.
+
+  python benchmarks/run.py run [--output results.json] [--repeat 5] [--input-backend fake]
+  python benchmarks/run.py compare baseline.json results.json [--threshold 15] [--metric lock_engage_ms=30]
+
+Every metric is a median over the repeats, and lower is better. The Tk scenarios need a display:
+on Linux without DISPLAY the suite starts a private Xvfb server, and if Xvfb is not installed
+those scenarios are reported as skipped rather than failing the run.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import ASSETS_DIR, ATLAS_SPRITES
+
+ROOT = Path(__file__).resolve().parent.parent
+
+ASSETS = [("step-lock.png", (120, 100)), ("step-clean.png", (120, 100)), ("separator-right.png", (40, 40))]
+
+Metrics = Dict[str, Dict[str, Any]]
+
+
+def add_metric(metrics: Metrics, name: str, samples: List[float], unit: str = "ms"):
+  metrics[name] = {"value": statistics.median(samples), "unit": unit, "samples": samples}
+
+
+def measure_import(metrics: Metrics, repeat: int):
+  # -X importtime reports the cumulative time of each import, which leaves out interpreter start-up.
+  samples = []
+  for _ in range(repeat):
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"], cwd=ROOT, capture_output=True, text=True, check=True)
+    for line in result.stderr.splitlines():
+      fields = [field.strip() for field in line.split("|")]
+      if len(fields) == 3 and fields[2] == "main":
+        samples.append(int(fields[1]) / 1000)
+  add_metric(metrics, "import_main_ms", samples)
+
+
+def measure_assets(metrics: Metrics, repeat: int):
+  from main import ImageManager, ThemeManager
+
+  theme_manager = ThemeManager()
+  with tempfile.TemporaryDirectory() as cache_dir:
+    # Pay for Pillow's lazy plugin and codec imports before timing anything.
+    ImageManager(theme_manager, Path(cache_dir))._load_processed_image(ASSETS_DIR / ASSETS[0][0], ASSETS[0][1])
+  for asset, size in ASSETS:
+    cold, cached = [], []
+    for _ in range(repeat):
+      with tempfile.TemporaryDirectory() as cache_dir:
+        start = time.perf_counter()
+        ImageManager(theme_manager, Path(cache_dir))._load_processed_image(ASSETS_DIR / asset, size)
+        cold.append((time.perf_counter() - start) * 1000)
+        # A fresh manager has an empty memory cache, like the next launch of the app.
+        start = time.perf_counter()
+        ImageManager(theme_manager, Path(cache_dir))._load_processed_image(ASSETS_DIR / asset, size)
+        cached.append((time.perf_counter() - start) * 1000)
+    stem = Path(asset).stem.replace("-", "_")
+    add_metric(metrics, f"asset_{stem}_cold_ms", cold)
+    add_metric(metrics, f"asset_{stem}_disk_cached_ms", cached)
+
+  from atlas import build_atlas
+
+  with tempfile.TemporaryDirectory() as atlas_dir:
+    build_atlas(Path(atlas_dir))
+    samples = []
+    for _ in range(repeat):
+      manager = ImageManager(theme_manager, atlas_dir=Path(atlas_dir))
+      start = time.perf_counter()
+      for asset, size in ATLAS_SPRITES:
+        manager._load_processed_image(ASSETS_DIR / asset, size)
+      samples.append((time.perf_counter() - start) * 1000)
+    add_metric(metrics, "atlas_all_sprites_ms", samples)
+
+
+def start_xvfb() -> Optional[subprocess.Popen]:
+  """Starts Xvfb on a free display and points DISPLAY at it; returns None if there is no need or no way."""
+  if os.environ.get("DISPLAY") or not sys.platform.startswith("linux"):
+    return None
+  xvfb = shutil.which("Xvfb")
+  if xvfb is None:
+    return None
+  display = next(number for number in range(99, 200) if not Path(f"/tmp/.X11-unix/X{number}").exists())
+  process = subprocess.Popen([xvfb, f":{display}", "-screen", "0", "1280x800x24", "-nolisten", "tcp"], stderr=subprocess.DEVNULL)
+  deadline = time.monotonic() + 10
+  while not Path(f"/tmp/.X11-unix/X{display}").exists():
+    if process.poll() is not None or time.monotonic() > deadline:
+      process.kill()
+      return None
+    time.sleep(0.05)
+  os.environ["DISPLAY"] = f":{display}"
+  return process
+
+
+def run_tk_for(root, seconds: float):
+  root.after(round(seconds * 1000), root.quit)
+  root.mainloop()
+
+
+def wait_until(root, predicate: Callable[[], bool], timeout: float):
+  deadline = time.monotonic() + timeout
+  while not predicate():
+    if time.monotonic() > deadline:
+      raise TimeoutError("the app did not become ready")
+    root.update()
+    time.sleep(0.002)
+
+
+def measure_tk(metrics: Metrics, repeat: int, input_backend: str, cpu_seconds: float):
+  import tkinter as tk
+
+  from diagnostics import StartupTrace
+  from main import AppConfig, CleanLockApp, import_ui_dependencies
+
+  import_ui_dependencies()
+  construct, first_paint, ready, image_first, image_cached = [], [], [], [], []
+  app = None
+  for index in range(repeat):
+    if app is not None:
+      app.input_manager.stop_listening()
+      app.services.close()
+      app.root.destroy()
+    start = time.perf_counter()
+    root = tk.Tk()
+    app = CleanLockApp(root, trace=StartupTrace(origin=start), config=AppConfig(input_backend=input_backend))
+    construct.append((time.perf_counter() - start) * 1000)
+    wait_until(root, lambda app=app: app.input_ready, timeout=30)
+    phases = {name: offset + duration for name, offset, duration in app.trace.phases}
+    first_paint.append(phases["first paint"] * 1000)
+    ready.append(phases["ready"] * 1000)
+
+    # The app has loaded these already, so use a size it has not seen to time a first load.
+    size = (64 + index, 64 + index)
+    start = time.perf_counter()
+    app.image_manager.load_png_image(ASSETS_DIR / "step-done.png", size)
+    image_first.append((time.perf_counter() - start) * 1000)
+    start = time.perf_counter()
+    app.image_manager.load_png_image(ASSETS_DIR / "step-done.png", size)
+    image_cached.append((time.perf_counter() - start) * 1000)
+
+  add_metric(metrics, "app_construct_ms", construct)
+  add_metric(metrics, "first_paint_ms", first_paint)
+  add_metric(metrics, "input_ready_ms", ready)
+  add_metric(metrics, "load_png_image_first_ms", image_first)
+  add_metric(metrics, "load_png_image_cached_ms", image_cached)
+
+  engage, overlay, unlock = [], [], []
+  run_tk_for(app.root, 0.2)  # let the overlay pool prewarm
+  for _ in range(repeat):
+    app._start_locking_process()
+    engage.append(app.core.status()["suppression_enabled_ms"])
+    overlay.append(app.overlay_metrics["overlay_visible_ms"])
+    run_tk_for(app.root, 0.1)
+    start = time.perf_counter()
+    app.core.unlock()
+    app.root.update_idletasks()
+    unlock.append((time.perf_counter() - start) * 1000)
+    run_tk_for(app.root, 0.1)
+  add_metric(metrics, "lock_engage_ms", engage)
+  add_metric(metrics, "overlay_visible_ms", overlay)
+  add_metric(metrics, "unlock_ms", unlock)
+
+  app._start_locking_process()
+  start = time.process_time()
+  run_tk_for(app.root, cpu_seconds)
+  add_metric(metrics, "locked_cpu_percent", [(time.process_time() - start) / cpu_seconds * 100], unit="%")
+  app.core.unlock()
+
+  app.input_manager.stop_listening()
+  app.services.close()
+  app.root.destroy()
+
+
+def git_revision() -> Optional[str]:
+  try:
+    return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+  except (OSError, subprocess.CalledProcessError):
+    return None
+
+
+def run(args: argparse.Namespace) -> int:
+  metrics: Metrics = {}
+  skipped: List[str] = []
+  measure_import(metrics, args.repeat)
+  measure_assets(metrics, args.repeat)
+
+  xvfb = start_xvfb()
+  try:
+    if os.environ.get("DISPLAY") or sys.platform in ("win32", "darwin"):
+      measure_tk(metrics, args.repeat, args.input_backend, args.cpu_seconds)
+    else:
+      skipped.append("tk: no DISPLAY and Xvfb is not installed")
+  finally:
+    if xvfb is not None:
+      xvfb.terminate()
+      xvfb.wait()
+
+  results = {
+    "meta": {
+      "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+      "git": git_revision(),
+      "python": platform.python_version(),
+      "platform": platform.platform(),
+      "input_backend": args.input_backend,
+      "repeat": args.repeat,
+      "skipped": skipped,
+    },
+    "metrics": metrics,
+  }
+  for name, metric in metrics.items():
+    print(f"{name:<38} {metric['value']:>10.3f} {metric['unit']}")
+  for reason in skipped:
+    print(f"skipped {reason}")
+  if args.output:
+    args.output.write_text(json.dumps(results, indent=2))
+    print(f"results written to {args.output}")
+  return 0
+
+
+def compare(args: argparse.Namespace) -> int:
+  baseline = json.loads(args.baseline.read_text())["metrics"]
+  current = json.loads(args.current.read_text())["metrics"]
+  thresholds = {}
+  for entry in args.metric:
+    name, _, value = entry.partition("=")
+    thresholds[name] = float(value)
+
+  regressions = 0
+  print(f"{'metric':<38} {'baseline':>10} {'current':>10} {'change':>8}")
+  for name in sorted(baseline.keys() & current.keys()):
+    before, after = baseline[name]["value"], current[name]["value"]
+    change = (after - before) / before * 100 if before else 0.0
+    limit = thresholds.get(name, args.threshold)
+    # Tiny absolute differences are noise even when they are large relative changes.
+    regressed = change > limit and after - before > args.min_delta
+    regressions += regressed
+    flag = f"  REGRESSION (> {limit:g}%)" if regressed else ""
+    print(f"{name:<38} {before:>10.3f} {after:>10.3f} {change:>+7.1f}%{flag}")
+  for name in sorted(baseline.keys() - current.keys()):
+    print(f"{name:<38} missing from {args.current}")
+  print(f"{regressions} regression(s)")
+  return 1 if regressions else 0
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  commands = parser.add_subparsers(dest="command", required=True)
+  run_parser = commands.add_parser("run", help="run the suite")
+  run_parser.add_argument("--output", type=Path, help="write results as JSON")
+  run_parser.add_argument("--repeat", type=int, default=5)
+  run_parser.add_argument("--input-backend", default="fake", help="fake keeps runs deterministic; pynput measures the real hooks")
+  run_parser.add_argument("--cpu-seconds", type=float, default=3.0, help="how long to sample CPU while locked")
+  compare_parser = commands.add_parser("compare", help="flag regressions between two result files")
+  compare_parser.add_argument("baseline", type=Path)
+  compare_parser.add_argument("current", type=Path)
+  compare_parser.add_argument("--threshold", type=float, default=15.0, help="allowed slowdown in percent")
+  compare_parser.add_argument("--metric", action="append", default=[], metavar="NAME=PERCENT", help="per-metric threshold")
+  compare_parser.add_argument("--min-delta", type=float, default=0.5, help="ignore absolute changes up to this size")
+  args = parser.parse_args()
+  sys.exit(run(args) if args.command == "run" else compare(args))
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,45 @@
+"""Command-line client for a running daemon, e.g. ``python client.py lock --duration 120``; it loads only the IPC module."""
+
+import argparse
+import sys
+from typing import List, Optional
+
+from ipc import DaemonNotRunning, send_request
+
+COMMANDS = ("lock", "unlock", "status")
+
+
+def add_commands(commands: "argparse._SubParsersAction"):
+  """Adds the client subcommands to a parser's subparsers."""
+  lock = commands.add_parser("lock", help="ask the daemon to lock; returns once input is suppressed")
+  lock.add_argument("--duration", type=float, help="lock length in seconds (default: the app's)")
+  commands.add_parser("unlock", help="ask the daemon to unlock")
+  commands.add_parser("status", help="show whether the daemon is locked")
+
+
+def run_client(args: argparse.Namespace) -> int:
+  params = {"duration": args.duration} if args.command == "lock" and args.duration is not None else {}
+  try:
+    reply = send_request(args.command, args.socket, **params)
+  except DaemonNotRunning as e:
+    print(f"{e}; start one with: main.py daemon", file=sys.stderr)
+    return 1
+  if not reply.get("ok"):
+    print(f"error: {reply.get('error')}", file=sys.stderr)
+    return 1
+  if reply["locked"]:
+    print(f"locked, {reply['remaining']:.0f}s remaining")
+  else:
+    print("unlocked")
+  return 0
+
+
+def main(argv: Optional[List[str]] = None):
+  parser = argparse.ArgumentParser(description="Sends a request to a running input lock daemon.")
+  parser.add_argument("--socket", metavar="ADDRESS", help="daemon socket path or pipe name (default: per-user)")
+  add_commands(parser.add_subparsers(dest="command", metavar="COMMAND", required=True))
+  sys.exit(run_client(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+  main()
@@ -1,3 +1,4 @@
+import os
 import sys
 from pathlib import Path
 
@@ -13,8 +14,43 @@ def get_resource_path(relative_path):
   return Path(base_path) / relative_path
 
 
+APP_CACHE_NAME = "InputLock"
+
+
+def user_cache_dir() -> Path:
+  """Get the per-user cache directory, honouring INPUT_LOCK_CACHE_DIR"""
+  override = os.environ.get("INPUT_LOCK_CACHE_DIR")
+  if override:
+    return Path(override)
+  if sys.platform == "win32":
+    base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+    return Path(base) / APP_CACHE_NAME / "Cache"
+  if sys.platform == "darwin":
+    return Path.home() / "Library" / "Caches" / APP_CACHE_NAME
+  base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+  return Path(base) / APP_CACHE_NAME.lower()
+
+
 ASSETS_DIR = get_resource_path("assets")
+# <language>.json message catalogs, plus <language>.cat files built by `python localization.py`.
+LOCALES_DIR = get_resource_path("locales")
+# Built by `python atlas.py`; the app falls back to the loose PNGs when it is missing or stale.
+ATLAS_DIR = ASSETS_DIR / "atlas"
+# Every image the UI shows, by where it appears: (asset, logical size). HiDPI displays load
+# them at a whole multiple of that size.
+UI_IMAGES = {
+  "step_lock": ("step-lock.png", (120, 100)),
+  "step_clean": ("step-clean.png", (120, 100)),
+  "step_done": ("step-done.png", (120, 100)),
+  "arrow_right": ("separator-right.png", (40, 40)),
+  "arrow_left": ("separator-left.png", (40, 40)),
+  "overlay": ("step-clean.png", (120, 120)),
+}
+# Every (asset, size) the UI loads, i.e. what goes into the atlas.
+ATLAS_SPRITES = list(UI_IMAGES.values())
 FONT_FAMILY = "Segoe UI"
+# Size in pixels of the lock overlay's countdown ring.
+RING_DIAMETER = 220
 
 
 THEME_CONFIG = {
@@ -29,6 +65,8 @@ THEME_CONFIG = {
     "button_secondary_fg": "white",
     "button_secondary_hover": "#6A6A6A",
     "overlay_bg": "#202020",
+    "ring_track": "#3A3A3A",
+    "ring_fill": "#0078D4",
   },
   "light": {
     "background": "#FFFFFF",
@@ -41,5 +79,15 @@ THEME_CONFIG = {
     "button_secondary_fg": "white",
     "button_secondary_hover": "#6A6A6A",
     "overlay_bg": "#F0F0F0",
+    "ring_track": "#D6D6D6",
+    "ring_fill": "#0078D4",
   },
 }
+
+# Each rule is (lower RGB, upper RGB, replacement RGB); see imaging.ColorRule.
+THEME_RECOLOR_RULES = {
+  "dark": [
+    ((0, 0, 0), (9, 9, 9), (255, 255, 255)),  # convert black pixels to white
+  ],
+  "light": [],
+}
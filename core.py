@@ -0,0 +1,249 @@
+import asyncio
+import heapq
+import math
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+from countdown import Countdown
+from ipc import LockService
+from journal import MISSING, REASONS, SessionJournal
+from loop_monitor import LagMonitor, StallWatchdog
+from profiling import PhaseProfiler
+
+# Why a lock ended; the journal stores these as codes (journal.REASONS).
+UNLOCK_TIMER, UNLOCK_COMBO, UNLOCK_REQUEST, UNLOCK_STALL, UNLOCK_SCHEDULE, UNLOCK_SHUTDOWN = REASONS
+
+
+class LockCore(LockService):
+  """Owns the lock on one asyncio loop: lock state, the deadline and input suppression.
+
+  Views subscribe through ``on_lock``, ``on_tick`` and ``on_unlock``; ``wake(when)`` tells a pumped loop about new timers and queued calls.
+  """
+
+  def __init__(
+    self,
+    input_manager,
+    default_duration: float,
+    loop: Optional[asyncio.AbstractEventLoop] = None,
+    wake: Optional[Callable[[Optional[float]], None]] = None,
+    stall_timeout: float = 5.0,
+  ):
+    self.loop = loop or asyncio.new_event_loop()
+    self.input_manager = input_manager
+    self.default_duration = default_duration
+    self.wake = wake
+    self.on_lock: Optional[Callable[[float, float], None]] = None
+    self.on_tick: Optional[Callable[[float], None]] = None
+    self.on_unlock: Optional[Callable[[], None]] = None
+    self.locked = False
+    self.countdown = Countdown(self._call_later, self._cancel_timer, on_tick=self._on_countdown_tick, on_finish=self._on_deadline, clock=self.loop.time)
+    self.lag_monitor = LagMonitor(self._call_later, self._cancel_timer, clock=self.loop.time)
+    self.watchdog = StallWatchdog(self.lag_monitor, self._on_stall, stall_timeout, clock=self.loop.time)
+    self.profiler: Optional[PhaseProfiler] = None
+    self.journal: Optional[SessionJournal] = None
+    self.unlock_reason: Optional[str] = None
+    # How long the loop had been stuck when the watchdog released input during the last lock.
+    self.stalled_for: Optional[float] = None
+    # Wall-clock start, monotonic start and planned length of the current lock, for the journal.
+    self._session = (0.0, 0.0, 0.0)
+
+  def lock(self, duration: Optional[float] = None) -> Dict[str, Any]:
+    profiler = self.profiler
+    # A repeated lock (e.g. a second IPC request) must not cut the "locked" phase short.
+    if profiler is None or self.locked:
+      return self._lock(duration)
+    profiler.start("lock")
+    try:
+      return self._lock(duration)
+    finally:
+      if self.locked:
+        profiler.start("locked")
+      else:
+        profiler.stop()
+
+  def unlock(self, reason: str = UNLOCK_REQUEST) -> Dict[str, Any]:
+    profiler = self.profiler
+    if profiler is None or not self.locked:
+      return self._unlock(reason)
+    profiler.start("unlock")
+    try:
+      return self._unlock(reason)
+    finally:
+      profiler.stop()
+
+  def _lock(self, duration: Optional[float]) -> Dict[str, Any]:
+    duration = self.default_duration if duration is None else duration
+    # NaN and inf come straight through from the CLI and JSON; either would leave input blocked.
+    if not (math.isfinite(duration) and duration > 0):
+      raise ValueError("duration must be a positive number of seconds")
+    if not self.locked:
+      requested_at = time.perf_counter()
+      self.locked = True
+      self.stalled_for = None
+      self.input_manager.reset_stats()
+      # Block input before any view work so the lock engages as early as possible.
+      self.input_manager.enable_input_suppression(requested_at)
+      try:
+        self.lag_monitor.reset()
+        self.lag_monitor.start()
+        self.watchdog.arm(self.loop.time() + duration)
+        self._session = (time.time(), self.loop.time(), duration)
+        # Start the deadline before the views, which read countdown.remaining() as they show.
+        self.countdown.start(duration)
+        if self.on_lock:
+          self.on_lock(duration, requested_at)
+      except BaseException:
+        # Never leave input blocked without a deadline to release it.
+        self._unlock(UNLOCK_REQUEST)
+        raise
+    return self.status()
+
+  def _unlock(self, reason: str) -> Dict[str, Any]:
+    if self.locked:
+      self.locked = False
+      self.unlock_reason = reason
+      self.watchdog.disarm()
+      self.lag_monitor.stop()
+      self.countdown.cancel()
+      self.input_manager.disable_input_suppression()
+      if self.journal is not None:
+        self._journal_session(reason)
+      if self.on_unlock:
+        self.on_unlock()
+    return self.status()
+
+  def _journal_session(self, reason: str):
+    started_at, started, planned = self._session
+    keys, pointer = self.input_manager.suppressed_counts()
+    latency = self.input_manager.latency_probe.summary()
+    self.journal.append(  # type: ignore[union-attr]
+      {
+        "started_at": started_at,
+        "ended_at": time.time(),
+        "duration_s": self.loop.time() - started,
+        "planned_s": planned,
+        "reason": REASONS.index(reason),
+        "keys_suppressed": keys,
+        "pointer_suppressed": MISSING if pointer is None else pointer,
+        "suppression_enabled_ms": _or_missing(latency["suppression_enabled_ms"]),
+        "first_suppressed_event_ms": _or_missing(latency["first_suppressed_event_ms"]),
+      }
+    )
+
+  def status(self) -> Dict[str, Any]:
+    return {
+      "locked": self.locked,
+      "remaining": self.countdown.remaining(),
+      **self.input_manager.latency_probe.summary(),
+      "loop_lag": self.lag_monitor.summary(),
+      "stall_releases": self.watchdog.stalls,
+      "stalled_for_s": self.stalled_for,
+    }
+
+  def call_threadsafe(self, callback: Callable[..., Any], *args):
+    self.loop.call_soon_threadsafe(callback, *args)
+    if self.wake:
+      self.wake(None)
+
+  def unlock_threadsafe(self, reason: str = UNLOCK_COMBO):
+    """Unlocks from another thread; the input listeners call it when the unlock chord completes."""
+    self.call_threadsafe(self.unlock, reason)
+
+  def dispatch(self, function: Callable[[], Any], timeout: float = 5.0) -> Any:
+    """Runs ``function`` on the loop thread and waits for its result; for IPC threads."""
+    future: Future = Future()
+
+    def run():
+      try:
+        future.set_result(function())
+      except Exception as e:
+        future.set_exception(e)
+
+    self.call_threadsafe(run)
+    return future.result(timeout)
+
+  def _on_stall(self, stalled_for: float):
+    # Runs on the watchdog thread while the loop, and with it maybe the Tk thread, is stuck, so it
+    # must not call wake (which may go through Tk). Input is released now; the unlock (overlay,
+    # metrics, journal) runs once the loop catches up, on the slice its overdue timer already armed.
+    self.stalled_for = stalled_for
+    self.input_manager.disable_input_suppression()
+    self.loop.call_soon_threadsafe(self.unlock, UNLOCK_STALL)
+
+  def _on_deadline(self):
+    self.unlock(UNLOCK_TIMER)
+
+  def _on_countdown_tick(self, remaining: float):
+    if self.on_tick:
+      self.on_tick(remaining)
+
+  def _call_later(self, ms: int, callback: Callable[[], None]) -> asyncio.TimerHandle:
+    handle = self.loop.call_later(ms / 1000, callback)
+    if self.wake:
+      self.wake(handle.when())
+    return handle
+
+  @staticmethod
+  def _cancel_timer(handle: asyncio.TimerHandle):
+    handle.cancel()
+
+
+def _or_missing(value: Optional[float]) -> float:
+  return MISSING if value is None else value
+
+
+class TkLoopPump:
+  """Runs an asyncio loop in slices on the Tk thread, sleeping in Tk until the next timer it was told about via request()."""
+
+  def __init__(self, loop: asyncio.AbstractEventLoop, schedule: Callable[[int, Callable[[], None]], Any], cancel: Callable[[Any], None]):
+    self.loop = loop
+    self._schedule = schedule
+    self._cancel = cancel
+    self._handle = None
+    # Loop time the armed Tk timer runs the next slice at.
+    self._due: Optional[float] = None
+    self._timers: List[float] = []
+    self._ready = False
+    self.slices = 0
+
+  def request(self, when: Optional[float] = None):
+    """Runs a slice at loop time ``when``, or as soon as Tk is idle; must be called on the Tk thread."""
+    if self.loop.is_closed():
+      return
+    if when is not None:
+      heapq.heappush(self._timers, when)
+    elif self.loop.is_running():
+      self._ready = True
+    if not self.loop.is_running():  # otherwise the running slice re-arms the pump when it finishes
+      self._arm_at(self.loop.time() if when is None else when)
+
+  def close(self):
+    if self._handle is not None:
+      self._cancel(self._handle)
+      self._handle = self._due = None
+    if not self.loop.is_closed():
+      self.loop.close()
+
+  def _run_slice(self):
+    self._handle = self._due = None
+    self._ready = False
+    self.slices += 1
+    self.loop.call_soon(self.loop.stop)
+    self.loop.run_forever()
+    now = self.loop.time()
+    timers = self._timers
+    while timers and timers[0] <= now:
+      heapq.heappop(timers)
+    if self._ready:
+      self._arm_at(now)
+    elif timers:
+      self._arm_at(timers[0])
+
+  def _arm_at(self, due: float):
+    if self._handle is not None:
+      if self._due <= due:  # type: ignore[operator]
+        return
+      self._cancel(self._handle)
+    self._due = due
+    self._handle = self._schedule(max(0, math.ceil((due - self.loop.time()) * 1000)), self._run_slice)
@@ -0,0 +1,112 @@
+import math
+import time
+from typing import Any, Callable, Optional
+
+Scheduler = Callable[[int, Callable[[], None]], Any]
+
+
+class Countdown:
+  """A countdown against a fixed monotonic deadline, so late wake-ups never add up to drift."""
+
+  def __init__(
+    self,
+    schedule: Scheduler,
+    cancel: Callable[[Any], None],
+    on_tick: Optional[Callable[[float], None]] = None,
+    on_finish: Optional[Callable[[], None]] = None,
+    tick_interval: float = 1.0,
+    clock: Callable[[], float] = time.monotonic,
+  ):
+    if tick_interval <= 0:
+      raise ValueError("tick_interval must be positive")
+    self._schedule = schedule
+    self._cancel = cancel
+    self.on_tick = on_tick
+    self.on_finish = on_finish
+    self.tick_interval = tick_interval
+    self.clock = clock
+    self._deadline: Optional[float] = None
+    self._paused_remaining: Optional[float] = None
+    self._handle = None
+
+  @property
+  def running(self) -> bool:
+    return self._deadline is not None
+
+  @property
+  def paused(self) -> bool:
+    return self._paused_remaining is not None
+
+  def remaining(self) -> float:
+    if self._paused_remaining is not None:
+      return self._paused_remaining
+    if self._deadline is None:
+      return 0.0
+    return max(0.0, self._deadline - self.clock())
+
+  def start(self, duration: float):
+    self.cancel()
+    self._deadline = self.clock() + duration
+    self._tick(self.remaining())
+
+  def pause(self):
+    if self._deadline is None or self._paused_remaining is not None:
+      return
+    self._paused_remaining = self.remaining()
+    self._disarm()
+
+  def resume(self):
+    if self._paused_remaining is None:
+      return
+    self._deadline = self.clock() + self._paused_remaining
+    self._paused_remaining = None
+    self._tick(self.remaining())
+
+  def extend(self, seconds: float):
+    if self._deadline is None:
+      return
+    if self._paused_remaining is not None:
+      self._paused_remaining = max(0.0, self._paused_remaining + seconds)
+      return
+    self._deadline += seconds
+    self._disarm()
+    self._tick(self.remaining())
+
+  def cancel(self):
+    self._disarm()
+    self._deadline = None
+    self._paused_remaining = None
+
+  def _disarm(self):
+    if self._handle is not None:
+      self._cancel(self._handle)
+      self._handle = None
+
+  def _tick(self, remaining: float):
+    if remaining <= 0:
+      self._deadline = None
+      if self.on_tick:
+        self.on_tick(0.0)
+      if self.on_finish:
+        self.on_finish()
+      return
+
+    if self.on_tick:
+      self.on_tick(remaining)
+    if self._deadline is None or self._paused_remaining is not None:
+      return  # the tick handler cancelled or paused us
+
+    # Wake when the remaining time crosses the next tick boundary (or hits the deadline).
+    boundary = (math.ceil(remaining / self.tick_interval) - 1) * self.tick_interval
+    delay_ms = max(1, math.ceil((remaining - boundary) * 1000))
+    self._handle = self._schedule(delay_ms, self._on_timer)
+
+  def _on_timer(self):
+    self._handle = None
+    if self._deadline is not None:
+      self._tick(self.remaining())
+
+  @staticmethod
+  def display_seconds(remaining: float) -> int:
+    """Whole seconds to show for a remaining time, counting 0.2s left as 1."""
+    return math.ceil(remaining - 1e-9) if remaining > 0 else 0
@@ -0,0 +1,156 @@
+import json
+import sys
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Collection, Dict, List, Optional, TextIO, Tuple
+
+
+class StartupTrace:
+  """Collects wall-clock timings for the startup phases and prints them when enabled."""
+
+  def __init__(self, enabled: bool = False, origin: Optional[float] = None, clock: Callable[[], float] = time.perf_counter):
+    self.enabled = enabled
+    self.clock = clock
+    self.origin = clock() if origin is None else origin
+    self.phases: List[Tuple[str, float, float]] = []
+
+  @contextmanager
+  def phase(self, name: str):
+    start = self.clock()
+    try:
+      yield
+    finally:
+      self.record(name, start)
+
+  def record(self, name: str, start: float, end: Optional[float] = None):
+    end = self.clock() if end is None else end
+    self.phases.append((name, start - self.origin, end - start))
+
+  def mark(self, name: str):
+    self.record(name, self.clock())
+
+  def report(self, stream: Optional[TextIO] = None):
+    if not self.enabled:
+      return
+    stream = stream or sys.stderr
+    stream.write("startup trace (ms):\n")
+    for name, offset, duration in self.phases:
+      stream.write(f"  {name:<24} at {offset * 1000:8.1f}  took {duration * 1000:8.1f}\n")
+    stream.flush()
+
+
+class LockLatencyProbe:
+  """Measures how long a lock takes to engage, from the lock request to the first blocked event."""
+
+  def __init__(self, clock: Callable[[], float] = time.perf_counter):
+    self.clock = clock
+    self.requested_at: Optional[float] = None
+    self.suppression_latency: Optional[float] = None
+    self.engaged_latency: Optional[float] = None
+    self.pending = False
+
+  def arm(self, requested_at: Optional[float] = None):
+    self.requested_at = self.clock() if requested_at is None else requested_at
+    self.suppression_latency = None
+    self.engaged_latency = None
+    self.pending = True
+
+  def suppression_enabled(self):
+    if self.requested_at is not None:
+      self.suppression_latency = self.clock() - self.requested_at
+
+  def event_suppressed(self):
+    # Called from listener threads; losing a race here only means a slightly later sample.
+    if self.pending and self.requested_at is not None:
+      self.engaged_latency = self.clock() - self.requested_at
+      self.pending = False
+
+  def summary(self) -> Dict[str, Optional[float]]:
+    return {
+      "suppression_enabled_ms": None if self.suppression_latency is None else self.suppression_latency * 1000,
+      "first_suppressed_event_ms": None if self.engaged_latency is None else self.engaged_latency * 1000,
+    }
+
+
+EVENT_TYPES = ("press", "release", "move", "click", "scroll")
+PRESS, RELEASE, MOVE, CLICK, SCROLL = range(len(EVENT_TYPES))
+# Upper bounds of the callback latency buckets in nanoseconds; a final bucket catches the rest.
+LATENCY_BUCKETS_NS = (1_000, 2_000, 5_000, 10_000, 20_000, 50_000, 100_000, 200_000, 500_000, 1_000_000, 5_000_000)
+
+
+class InputStats:
+  """Per-event-type counters and preallocated callback latency histograms for the input listeners."""
+
+  def __init__(self, clock_ns: Callable[[], int] = time.perf_counter_ns):
+    self.clock_ns = clock_ns
+    self.started_at = time.time()
+    self.counts = [0] * len(EVENT_TYPES)
+    self.suppressed = [0] * len(EVENT_TYPES)
+    self.total_ns = [0] * len(EVENT_TYPES)
+    self.max_ns = [0] * len(EVENT_TYPES)
+    self.histograms = [[0] * (len(LATENCY_BUCKETS_NS) + 1) for _ in EVENT_TYPES]
+
+  def record(self, event_type: int, start_ns: int, suppressed: bool):
+    elapsed = self.clock_ns() - start_ns
+    self.counts[event_type] += 1
+    if suppressed:
+      self.suppressed[event_type] += 1
+    self.total_ns[event_type] += elapsed
+    if elapsed > self.max_ns[event_type]:
+      self.max_ns[event_type] = elapsed
+    self.histograms[event_type][bisect_left(LATENCY_BUCKETS_NS, elapsed)] += 1
+
+  def reset(self):
+    self.started_at = time.time()
+    for index in range(len(EVENT_TYPES)):
+      self.counts[index] = self.suppressed[index] = self.total_ns[index] = self.max_ns[index] = 0
+      histogram = self.histograms[index]
+      for bucket in range(len(histogram)):
+        histogram[bucket] = 0
+
+  def summary(self, unmeasured: Collection[int] = ()) -> Dict[str, Any]:
+    """Per event type statistics; types in ``unmeasured`` (never seen by a callback) are None."""
+    events: Dict[str, Any] = {}
+    for index, name in enumerate(EVENT_TYPES):
+      if index in unmeasured:
+        events[name] = None
+        continue
+      count = self.counts[index]
+      histogram = self.histograms[index]
+      events[name] = {
+        "count": count,
+        "suppressed": self.suppressed[index],
+        "suppression_rate": self.suppressed[index] / count if count else None,
+        "mean_us": self.total_ns[index] / count / 1000 if count else None,
+        "max_us": self.max_ns[index] / 1000,
+        "p50_us": _bucket_percentile(histogram, count, 0.50, self.max_ns[index]),
+        "p99_us": _bucket_percentile(histogram, count, 0.99, self.max_ns[index]),
+        "histogram": {label: value for label, value in zip(_BUCKET_LABELS, histogram)},
+      }
+    return {"started_at": self.started_at, "duration_s": time.time() - self.started_at, "events": events}
+
+  def write_json(self, path: Path, extra: Optional[Dict[str, Any]] = None, unmeasured: Collection[int] = ()):
+    """Writes the summary to a new file; raises FileExistsError rather than replace an earlier report."""
+    data = {**(extra or {}), "input": self.summary(unmeasured)}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "x") as file:
+      file.write(json.dumps(data, indent=2))
+
+
+_BUCKET_LABELS = [f"<={bound / 1000:g}us" for bound in LATENCY_BUCKETS_NS] + [f">{LATENCY_BUCKETS_NS[-1] / 1000:g}us"]
+
+
+def _bucket_percentile(histogram: List[int], count: int, fraction: float, max_ns: int) -> Optional[float]:
+  """Returns the upper bound (in microseconds) of the bucket containing the given percentile."""
+  if not count:
+    return None
+  threshold = fraction * count
+  seen = 0
+  for index, value in enumerate(histogram):
+    seen += value
+    if seen >= threshold:
+      bound = LATENCY_BUCKETS_NS[index] if index < len(LATENCY_BUCKETS_NS) else max_ns
+      return min(bound, max_ns) / 1000
+  return None
@@ -0,0 +1,87 @@
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Tuple
+
+Scheduler = Callable[[int, Callable[[], None]], Any]
+
+
+class EventBus:
+  """Carries calls from other threads onto the Tk loop through a bounded deque, with one wake-up per batch."""
+
+  def __init__(self, schedule: Scheduler, capacity: int = 4096, batch_size: int = 256, clock: Callable[[], float] = time.perf_counter):
+    if capacity <= 0 or batch_size <= 0:
+      raise ValueError("capacity and batch_size must be positive")
+    self._schedule = schedule
+    self.capacity = capacity
+    self.batch_size = batch_size
+    self.clock = clock
+    self._queue: Deque[Tuple[float, Callable[..., Any], tuple]] = deque()
+    self._wake_pending = False
+    self._wake_lock = threading.Lock()
+    # Producer-side counters are updated without a lock and may undercount under contention.
+    self.posted = 0
+    self.handled = 0
+    self.dropped = 0
+    self.batches = 0
+    self.max_depth = 0
+    self.total_latency = 0.0
+    self.max_latency = 0.0
+
+  @property
+  def depth(self) -> int:
+    return len(self._queue)
+
+  def post(self, handler: Callable[..., Any], *args) -> bool:
+    """Queues ``handler(*args)`` to run on the loop thread; safe to call from any thread."""
+    depth = len(self._queue)
+    if depth >= self.capacity:
+      self.dropped += 1
+      return False
+    self._queue.append((self.clock(), handler, args))
+    self.posted += 1
+    if depth >= self.max_depth:
+      self.max_depth = depth + 1
+    if not self._wake_pending:
+      # Only producers that find the loop asleep contend here, at most once per batch.
+      with self._wake_lock:
+        if self._wake_pending:
+          return True
+        self._wake_pending = True
+      self._schedule(0, self._drain)
+    return True
+
+  def _drain(self):
+    # Clear the flag before draining: an event posted from here on either gets drained by this
+    # pass or schedules its own wake-up, so none is left stranded.
+    self._wake_pending = False
+    self.batches += 1
+    queue = self._queue
+    for _ in range(min(len(queue), self.batch_size)):
+      enqueued_at, handler, args = queue.popleft()
+      latency = self.clock() - enqueued_at
+      self.total_latency += latency
+      if latency > self.max_latency:
+        self.max_latency = latency
+      self.handled += 1
+      try:
+        handler(*args)
+      except Exception:
+        traceback.print_exc()
+    if queue and not self._wake_pending:
+      # Yield to the loop between batches so redraws and input are not starved.
+      self._wake_pending = True
+      self._schedule(0, self._drain)
+
+  def metrics(self) -> Dict[str, Any]:
+    return {
+      "depth": self.depth,
+      "max_depth": self.max_depth,
+      "posted": self.posted,
+      "handled": self.handled,
+      "dropped": self.dropped,
+      "batches": self.batches,
+      "mean_latency_ms": self.total_latency / self.handled * 1000 if self.handled else None,
+      "max_latency_ms": self.max_latency * 1000,
+    }
@@ -0,0 +1,78 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+
+
+class ImageMemoryCache:
+  """An LRU cache of decoded images bounded by pixel memory; entries still on screen (``in_use``) are never evicted."""
+
+  def __init__(self, size_of: Callable[[Any], int], in_use: Callable[[Any], bool] = lambda value: False, max_bytes: int = DEFAULT_MAX_BYTES):
+    self.size_of = size_of
+    self.in_use = in_use
+    self.max_bytes = max_bytes
+    self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+    self.resident_bytes = 0
+    self.hits = 0
+    self.misses = 0
+    self.evictions = 0
+
+  def __contains__(self, key: Hashable) -> bool:
+    return key in self._entries
+
+  def __len__(self) -> int:
+    return len(self._entries)
+
+  def get(self, key: Hashable) -> Optional[Any]:
+    entry = self._entries.get(key)
+    if entry is None:
+      self.misses += 1
+      return None
+    self._entries.move_to_end(key)
+    self.hits += 1
+    return entry[0]
+
+  def put(self, key: Hashable, value: Any):
+    self._discard(key)
+    size = self.size_of(value)
+    self._entries[key] = (value, size)
+    self.resident_bytes += size
+    self._evict_to_budget()
+
+  def evict_where(self, predicate: Callable[[Hashable], bool]) -> int:
+    """Evicts every entry whose key matches ``predicate`` and is not in use; returns the count."""
+    victims = [key for key, (value, _) in self._entries.items() if predicate(key) and not self.in_use(value)]
+    for key in victims:
+      self._discard(key)
+    self.evictions += len(victims)
+    return len(victims)
+
+  def clear(self):
+    self.evict_where(lambda key: True)
+
+  def stats(self) -> Dict[str, int]:
+    return {
+      "entries": len(self._entries),
+      "pinned": sum(1 for value, _ in self._entries.values() if self.in_use(value)),
+      "resident_bytes": self.resident_bytes,
+      "max_bytes": self.max_bytes,
+      "hits": self.hits,
+      "misses": self.misses,
+      "evictions": self.evictions,
+    }
+
+  def _evict_to_budget(self):
+    if self.resident_bytes <= self.max_bytes:
+      return
+    # Oldest first; the entry just added is last and in use by the caller, so it is kept.
+    for key in list(self._entries)[:-1]:
+      if self.resident_bytes <= self.max_bytes:
+        break
+      if not self.in_use(self._entries[key][0]):
+        self._discard(key)
+        self.evictions += 1
+
+  def _discard(self, key: Hashable):
+    entry = self._entries.pop(key, None)
+    if entry is not None:
+      self.resident_bytes -= entry[1]
@@ -0,0 +1,61 @@
+from dataclasses import dataclass
+from typing import Iterable, List, Sequence, Tuple
+
+from PIL import Image, ImageChops
+
+RGB = Tuple[int, int, int]
+
+
+@dataclass(frozen=True)
+class ColorRule:
+  """Replaces the RGB of every pixel whose channels all fall within [lower, upper]; alpha is kept."""
+
+  lower: RGB
+  upper: RGB
+  replacement: RGB
+
+  @classmethod
+  def from_config(cls, entry: Sequence[RGB]) -> "ColorRule":
+    lower, upper, replacement = entry
+    return cls(tuple(lower), tuple(upper), tuple(replacement))  # type: ignore[arg-type]
+
+
+def compile_rules(entries: Iterable[Sequence[RGB]]) -> List[ColorRule]:
+  return [entry if isinstance(entry, ColorRule) else ColorRule.from_config(entry) for entry in entries]
+
+
+def _range_lut(lower: int, upper: int) -> List[int]:
+  return [255 if lower <= value <= upper else 0 for value in range(256)]
+
+
+def _rule_mask(bands: Sequence[Image.Image], rule: ColorRule) -> Image.Image:
+  mask = bands[0].point(_range_lut(rule.lower[0], rule.upper[0]))
+  for channel in (1, 2):
+    # Masks only ever hold 0 or 255, so multiply acts as a logical AND.
+    mask = ImageChops.multiply(mask, bands[channel].point(_range_lut(rule.lower[channel], rule.upper[channel])))
+  return mask
+
+
+def recolor(img: Image.Image, rules: Sequence[ColorRule]) -> Image.Image:
+  """Applies the color rules to an RGBA image with band operations; the first matching rule wins, as per pixel."""
+  if not rules:
+    return img
+  if img.mode != "RGBA":
+    img = img.convert("RGBA")
+
+  bands = list(img.split())
+  masks = []
+  claimed = None
+  for rule in rules:
+    mask = _rule_mask(bands, rule)
+    if claimed is not None:
+      mask = ImageChops.subtract(mask, claimed)
+    claimed = mask if claimed is None else ImageChops.lighter(claimed, mask)
+    masks.append(mask)
+
+  for rule, mask in zip(rules, masks):
+    if mask.getbbox() is None:
+      continue
+    for channel in range(3):
+      bands[channel].paste(rule.replacement[channel], mask=mask)
+  return Image.merge("RGBA", bands)
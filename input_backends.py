@@ -0,0 +1,757 @@
+import importlib
+import os
+import struct
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from diagnostics import CLICK, MOVE, PRESS, RELEASE, SCROLL, InputStats
+
+
+class InputBackend(ABC):
+  """Creates the suppressible keyboard and mouse listeners that InputManager uses."""
+
+  name = "base"
+
+  @classmethod
+  def for_display(cls, display: str) -> "InputBackend":
+    """Returns a backend for one X display (seat); backends without a display notion ignore it."""
+    return cls()
+
+  def prepare(self):
+    """Loads whatever the backend needs; may run off the Tk thread."""
+
+  def special_key_names(self) -> Optional[FrozenSet[str]]:
+    """Names accepted for non-character keys in unlock chords, or None to accept any name."""
+    return None
+
+  def key_aliases(self) -> Dict[str, str]:
+    """Chord names that this backend reports under another name, mapped to that name."""
+    return {}
+
+  def delivery_summary(self) -> Optional[Dict[str, Any]]:
+    """Per-event latency from the OS event timestamp to the callback, where the backend has it."""
+    return None
+
+  @abstractmethod
+  def create_keyboard_listener(self, on_press: Callable[[Any], None], on_release: Callable[[Any], None]):
+    """Returns a stopped listener that calls ``on_press(key)`` and ``on_release(key)``."""
+
+  @abstractmethod
+  def create_mouse_listener(self, on_move: Callable, on_click: Callable, on_scroll: Callable):
+    """Returns a stopped listener with pynput's mouse callback signatures."""
+
+  def create_pointer_blocker(self) -> Optional[Any]:
+    """Returns a listener that blocks the pointer without a Python callback per event, or None if unsupported."""
+
+
+class PointerGrabError(RuntimeError):
+  pass
+
+
+class SuppressibleListener:
+  """Keeps one pynput listener running and flips its suppression in place instead of restarting it per lock."""
+
+  def __init__(self, listener_factory: Callable[..., Any], display: Optional[str] = None, **callbacks):
+    if sys.platform == "darwin":
+      callbacks["darwin_intercept"] = self._darwin_intercept
+    self.listener = listener_factory(suppress=False, **callbacks)
+    self.display = display
+    self.suppressed = False
+
+  def start(self):
+    if self.display is None:
+      self.listener.start()
+      self.listener.wait()
+      return
+    # pynput's X11 listener opens its connections from DISPLAY before it reports ready, and
+    # takes no display argument, so point DISPLAY at this seat until then.
+    with _display_env_lock:
+      previous = os.environ.get("DISPLAY")
+      os.environ["DISPLAY"] = self.display
+      try:
+        self.listener.start()
+        self.listener.wait()
+      finally:
+        if previous is None:
+          del os.environ["DISPLAY"]
+        else:
+          os.environ["DISPLAY"] = previous
+
+  def stop(self):
+    self.set_suppressed(False)
+    self.listener.stop()
+
+  @property
+  def running(self) -> bool:
+    return self.listener.running
+
+  def set_suppressed(self, enabled: bool):
+    if enabled == self.suppressed:
+      return
+
+    grab = getattr(self.listener, "_suppress_start" if enabled else "_suppress_stop", None)
+    display = getattr(self.listener, "_display_stop", None)
+    if grab is not None and display is not None:
+      from pynput._util.xorg import display_manager
+
+      with display_manager(display) as dm:
+        grab(dm)
+
+    # The X11 listener also reads this flag on shutdown to decide whether to release its grab.
+    self.listener._suppress = enabled
+    self.suppressed = enabled
+
+  def _darwin_intercept(self, event_type, event):
+    return None if self.suppressed else event
+
+
+_display_env_lock = threading.Lock()
+
+
+class XPointerGrab:
+  """Blocks the pointer with an X server grab, so blocked events never reach any client."""
+
+  def __init__(self, display_name: Optional[str] = None):
+    self.display_name = display_name
+    self._display = None
+    self.suppressed = False
+
+  def start(self):
+    from Xlib import display
+
+    self._display = display.Display(self.display_name)
+
+  def stop(self):
+    if self._display is not None:
+      self.set_suppressed(False)
+      self._display.close()
+      self._display = None
+
+  @property
+  def running(self) -> bool:
+    return self._display is not None
+
+  def set_suppressed(self, enabled: bool):
+    if enabled == self.suppressed or self._display is None:
+      return
+
+    from Xlib import X
+
+    if enabled:
+      status = self._display.screen().root.grab_pointer(False, 0, X.GrabModeAsync, X.GrabModeAsync, X.NONE, X.NONE, X.CurrentTime)
+      if status != X.GrabSuccess:
+        raise PointerGrabError(f"X pointer grab failed with status {status}")
+    else:
+      self._display.ungrab_pointer(X.CurrentTime)
+      self._display.flush()
+    self.suppressed = enabled
+
+
+class PynputBackend(InputBackend):
+  name = "pynput"
+
+  def __init__(self, display: Optional[str] = None):
+    # None uses DISPLAY; set for a seat on another X display.
+    self.display = display
+
+  @classmethod
+  def for_display(cls, display: str) -> "PynputBackend":
+    return cls(display)
+
+  def prepare(self):
+    importlib.import_module("pynput.keyboard")
+    importlib.import_module("pynput.mouse")
+
+  def special_key_names(self) -> Optional[FrozenSet[str]]:
+    from pynput import keyboard
+
+    return frozenset(key.name for key in keyboard.Key)
+
+  def create_keyboard_listener(self, on_press, on_release) -> SuppressibleListener:
+    from pynput import keyboard
+
+    return SuppressibleListener(keyboard.Listener, self.display, on_press=on_press, on_release=on_release)
+
+  def create_mouse_listener(self, on_move, on_click, on_scroll) -> SuppressibleListener:
+    from pynput import mouse
+
+    return SuppressibleListener(mouse.Listener, self.display, on_move=on_move, on_click=on_click, on_scroll=on_scroll)
+
+  def create_pointer_blocker(self) -> Optional[XPointerGrab]:
+    # pynput picks its backend the same way: Xorg on anything that is not Windows or macOS.
+    if sys.platform in ("win32", "darwin") or not (self.display or os.environ.get("DISPLAY")):
+      return None
+    return XPointerGrab(self.display)
+
+
+class KeyToken:
+  """A key event payload shaped like pynput's: special keys have a name, others a char."""
+
+  __slots__ = ("char", "name")
+
+  def __init__(self, name: Optional[str] = None, char: Optional[str] = None):
+    self.name = name
+    self.char = char
+
+  def __repr__(self):
+    return f"KeyToken({self.char!r})" if self.char is not None else f"KeyToken.{self.name}"
+
+
+class FakeListener:
+  """An in-process listener; events are injected by FakeInputBackend on the caller's thread."""
+
+  def __init__(self, callbacks: Dict[str, Callable]):
+    self.callbacks = callbacks
+    self.running = False
+    self.suppressed = False
+    self.delivered = 0
+    self.blocked = 0
+
+  def start(self):
+    self.running = True
+
+  def stop(self):
+    self.running = False
+    self.suppressed = False
+
+  def set_suppressed(self, enabled: bool):
+    self.suppressed = enabled
+
+  def emit(self, kind: str, *args) -> bool:
+    """Runs the callback for an event and returns True when the event was suppressed."""
+    if not self.running:
+      return False
+    callback = self.callbacks.get(kind)
+    if callback is not None:
+      callback(*args)
+    if self.suppressed:
+      self.blocked += 1
+      return True
+    self.delivered += 1
+    return False
+
+
+class FakeInputBackend(InputBackend):
+  """A headless backend whose events come from inject_* calls or a generated stream, for tests and benchmarks."""
+
+  name = "fake"
+
+  def __init__(self):
+    self.keyboard_listeners: List[FakeListener] = []
+    self.mouse_listeners: List[FakeListener] = []
+    self._keys: Dict[str, KeyToken] = {}
+    self._stream_thread: Optional[threading.Thread] = None
+    self._stream_stop = threading.Event()
+
+  def create_keyboard_listener(self, on_press, on_release) -> FakeListener:
+    listener = FakeListener({"press": on_press, "release": on_release})
+    self.keyboard_listeners.append(listener)
+    return listener
+
+  def create_mouse_listener(self, on_move, on_click, on_scroll) -> FakeListener:
+    listener = FakeListener({"move": on_move, "click": on_click, "scroll": on_scroll})
+    self.mouse_listeners.append(listener)
+    return listener
+
+  def create_pointer_blocker(self) -> FakeListener:
+    # No callbacks: suppressed events are dropped here, the way a server-side grab drops them.
+    listener = FakeListener({})
+    self.mouse_listeners.append(listener)
+    return listener
+
+  def key(self, token: str) -> KeyToken:
+    key = self._keys.get(token)
+    if key is None:
+      key = KeyToken(char=token) if len(token) == 1 else KeyToken(name=token)
+      self._keys[token] = key
+    return key
+
+  def inject_key(self, token: str, pressed: bool = True) -> bool:
+    return self._emit(self.keyboard_listeners, "press" if pressed else "release", self.key(token))
+
+  def inject_chord(self, tokens: List[str]):
+    for token in tokens:
+      self.inject_key(token, True)
+    for token in reversed(tokens):
+      self.inject_key(token, False)
+
+  def inject_move(self, x: int, y: int) -> bool:
+    return self._emit(self.mouse_listeners, "move", x, y)
+
+  def inject_click(self, x: int, y: int, button: str = "left", pressed: bool = True) -> bool:
+    return self._emit(self.mouse_listeners, "click", x, y, button, pressed)
+
+  def inject_scroll(self, x: int, y: int, dx: int = 0, dy: int = -1) -> bool:
+    return self._emit(self.mouse_listeners, "scroll", x, y, dx, dy)
+
+  def _emit(self, listeners: List[FakeListener], kind: str, *args) -> bool:
+    suppressed = False
+    for listener in listeners:
+      suppressed = listener.emit(kind, *args) or suppressed
+    return suppressed
+
+  def start_stream(self, rates: Dict[str, float], duration: Optional[float] = None, keys: str = "abcdefghijklmnopqrstuvwxyz"):
+    """Injects ``key``, ``move``, ``click`` and ``scroll`` events from a background thread at the given rates per second."""
+    self.stop_stream()
+    self._stream_stop.clear()
+    self._stream_thread = threading.Thread(target=self._run_stream, args=(dict(rates), duration, keys), daemon=True)
+    self._stream_thread.start()
+
+  def stop_stream(self):
+    if self._stream_thread is not None:
+      self._stream_stop.set()
+      self._stream_thread.join()
+      self._stream_thread = None
+
+  def _run_stream(self, rates: Dict[str, float], duration: Optional[float], keys: str):
+    start = time.perf_counter()
+    sent = {kind: 0 for kind in rates}
+    while not self._stream_stop.is_set():
+      elapsed = time.perf_counter() - start
+      if duration is not None and elapsed >= duration:
+        break
+      for kind, rate in rates.items():
+        due = int(elapsed * rate)
+        while sent[kind] < due:
+          index = sent[kind]
+          sent[kind] += 1
+          if kind == "key":
+            token = keys[index % len(keys)]
+            self.inject_key(token, True)
+            self.inject_key(token, False)
+          elif kind == "move":
+            self.inject_move(index % 1920, index % 1080)
+          elif kind == "click":
+            self.inject_click(0, 0, pressed=index % 2 == 0)
+          elif kind == "scroll":
+            self.inject_scroll(0, 0)
+      self._stream_stop.wait(0.001)
+
+
+# Linux input subsystem ABI, from linux/input.h and linux/input-event-codes.h.
+EV_SYN, EV_KEY, EV_REL, EV_ABS = 0, 1, 2, 3
+REL_X, REL_Y, REL_HWHEEL, REL_WHEEL = 0, 1, 6, 8
+ABS_X = 0
+KEY_A, KEY_Z, BTN_MISC, BTN_LEFT, BTN_RIGHT, BTN_MIDDLE, BTN_TOUCH = 30, 44, 0x100, 0x110, 0x111, 0x112, 0x14A
+KEY_MAX, REL_MAX, ABS_MAX = 0x2FF, 0x0F, 0x3F
+# struct input_event: a struct timeval, then type, code and value.
+EVENT = struct.Struct("llHHi")
+CLOCK_MONOTONIC = 1
+
+
+def _ioc(direction: int, number: int, size: int) -> int:
+  return direction << 30 | size << 16 | ord("E") << 8 | number
+
+
+def EVIOCGBIT(event_type: int, size: int) -> int:
+  return _ioc(2, 0x20 + event_type, size)
+
+
+def EVIOCGNAME(size: int) -> int:
+  return _ioc(2, 0x06, size)
+
+
+EVIOCGRAB = _ioc(1, 0x90, 4)
+EVIOCSCLOCKID = _ioc(1, 0xA0, 4)
+
+# Key codes name physical positions; characters assume a US layout, like the unlock chord docs.
+EVDEV_KEY_NAMES = {
+  1: "esc",
+  14: "backspace",
+  15: "tab",
+  28: "enter",
+  29: "ctrl_l",
+  42: "shift",
+  54: "shift_r",
+  56: "alt_l",
+  57: "space",
+  58: "caps_lock",
+  69: "num_lock",
+  70: "scroll_lock",
+  87: "f11",
+  88: "f12",
+  97: "ctrl_r",
+  99: "print_screen",
+  100: "alt_r",
+  102: "home",
+  103: "up",
+  104: "page_up",
+  105: "left",
+  106: "right",
+  107: "end",
+  108: "down",
+  109: "page_down",
+  110: "insert",
+  111: "delete",
+  119: "pause",
+  125: "cmd",
+  126: "cmd_r",
+  127: "menu",
+  **{59 + index: f"f{index + 1}" for index in range(10)},
+}
+EVDEV_KEY_CHARS = {
+  code: char for first, row in ((2, "1234567890-="), (16, "qwertyuiop[]"), (30, "asdfghjkl;'`"), (43, "\\zxcvbnm,./")) for code, char in enumerate(row, first)
+}
+# Chord names pynput uses for the same keys, mapped to the single name this backend reports.
+EVDEV_KEY_ALIASES = {"shift_l": "shift", "ctrl": "ctrl_l", "alt": "alt_l", "alt_gr": "alt_r", "cmd_l": "cmd"}
+_BUTTONS = {BTN_LEFT: "left", BTN_RIGHT: "right", BTN_MIDDLE: "middle"}
+
+
+class EvdevDevice:
+  """One ``/dev/input/event*`` node, or any file descriptor that yields input_event records."""
+
+  def __init__(self, fd: int, name: str, keyboard: bool, pointer: bool, path: Optional[str] = None, monotonic: bool = False):
+    self.fd = fd
+    self.name = name
+    self.keyboard = keyboard
+    self.pointer = pointer
+    self.path = path
+    self.monotonic = monotonic
+    self.grabbed = False
+
+  @classmethod
+  def open(cls, path: str) -> Optional["EvdevDevice"]:
+    """Opens ``path`` and returns it if it is a keyboard or a pointer; None for anything else."""
+    import fcntl
+
+    fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK | os.O_CLOEXEC)
+    try:
+      event_types = _query_bits(fcntl, fd, 0, EV_ABS)
+      keys = _query_bits(fcntl, fd, EV_KEY, KEY_MAX) if event_types >> EV_KEY & 1 else 0
+      relative = _query_bits(fcntl, fd, EV_REL, REL_MAX) if event_types >> EV_REL & 1 else 0
+      absolute = _query_bits(fcntl, fd, EV_ABS, ABS_MAX) if event_types >> EV_ABS & 1 else 0
+      keyboard = bool(keys >> KEY_A & 1 and keys >> KEY_Z & 1)
+      pointer = bool(relative >> REL_X & 1 and relative >> REL_Y & 1) or bool(absolute >> ABS_X & 1 and keys >> BTN_TOUCH & 1 | keys >> BTN_LEFT & 1)
+      if not (keyboard or pointer):
+        os.close(fd)
+        return None
+      name = bytearray(256)
+      fcntl.ioctl(fd, EVIOCGNAME(len(name)), name, True)
+      try:
+        fcntl.ioctl(fd, EVIOCSCLOCKID, struct.pack("i", CLOCK_MONOTONIC))
+        monotonic = True
+      except OSError:
+        monotonic = False
+    except OSError:
+      os.close(fd)
+      raise
+    return cls(fd, name.split(b"\0", 1)[0].decode(errors="replace"), keyboard, pointer, path, monotonic)
+
+  def grab(self, enabled: bool):
+    """Takes or releases the device exclusively: while grabbed, no one else sees its events."""
+    import fcntl
+
+    fcntl.ioctl(self.fd, EVIOCGRAB, 1 if enabled else 0)
+    self.grabbed = enabled
+
+  def drain(self):
+    """Discards events queued while nobody was reading, so they are not replayed later."""
+    try:
+      while os.read(self.fd, EVENT.size * 64):
+        pass
+    except OSError:
+      pass
+
+  def close(self):
+    os.close(self.fd)
+
+
+def _query_bits(fcntl, fd: int, event_type: int, max_code: int) -> int:
+  buffer = bytearray(max_code // 8 + 1)
+  fcntl.ioctl(fd, EVIOCGBIT(event_type, len(buffer)), buffer, True)
+  return int.from_bytes(buffer, "little")
+
+
+def discover_evdev_devices(directory: str = "/dev/input", known: FrozenSet[str] = frozenset()) -> List[EvdevDevice]:
+  """Opens every keyboard and pointer in ``directory`` whose path is not in ``known``."""
+  devices = []
+  denied = 0
+  try:
+    names = sorted(name for name in os.listdir(directory) if name.startswith("event"))
+  except OSError:
+    names = []
+  for name in names:
+    path = os.path.join(directory, name)
+    if path in known:
+      continue
+    try:
+      device = EvdevDevice.open(path)
+    except PermissionError:
+      denied += 1
+      continue
+    except OSError:
+      continue
+    if device is not None:
+      devices.append(device)
+  if denied and not devices and not known:
+    raise PermissionError(f"no permission to read {directory}; add the user to the 'input' group")
+  return devices
+
+
+class EvdevReader:
+  """Reads every evdev device in one epoll loop on one thread, for both evdev listeners."""
+
+  def __init__(self, devices: Optional[List[EvdevDevice]] = None, directory: str = "/dev/input"):
+    self.directory = directory
+    self.discover = devices is None
+    self.devices: List[EvdevDevice] = devices or []
+    self.delivery = InputStats(clock_ns=time.monotonic_ns)
+    self.key_callbacks: Optional[Tuple[Callable, Callable]] = None
+    self.pointer_callbacks: Optional[Tuple[Callable, Callable, Callable]] = None
+    self._by_fd: Dict[int, EvdevDevice] = {}
+    self._epoll = None
+    self._wake_r = self._wake_w = -1
+    self._thread: Optional[threading.Thread] = None
+    self._lock = threading.Lock()
+    self._x = self._y = 0
+
+  def refresh(self):
+    """Picks up devices plugged in since the last scan; a no-op for explicitly given devices."""
+    if self.discover:
+      found = discover_evdev_devices(self.directory, frozenset(device.path for device in self.devices if device.path))
+      with self._lock:
+        self.devices.extend(found)
+      self._sync()
+
+  def grab(self, keyboard: bool, enabled: bool):
+    for device in list(self.devices):
+      if (device.keyboard if keyboard else device.pointer and not device.keyboard) and device.grabbed != enabled:
+        try:
+          device.grab(enabled)
+        except OSError:
+          self._remove(device)
+          continue
+        if not enabled and device.fd not in self._by_fd:
+          device.drain()
+
+  def subscribe(self, keys: Optional[Tuple[Callable, Callable]] = None, pointer: Optional[Tuple[Callable, Callable, Callable]] = None):
+    if keys is not None:
+      self.key_callbacks = keys
+    if pointer is not None:
+      self.pointer_callbacks = pointer
+    self._sync()
+
+  def unsubscribe(self, keys: bool = False, pointer: bool = False):
+    if keys:
+      self.key_callbacks = None
+    if pointer:
+      self.pointer_callbacks = None
+    self._sync()
+
+  def close(self):
+    self.key_callbacks = self.pointer_callbacks = None
+    self._sync()
+    for device in self.devices:
+      if device.grabbed:
+        try:
+          device.grab(False)
+        except OSError:
+          pass
+      device.close()
+    self.devices = []
+
+  def _wanted(self, device: EvdevDevice) -> bool:
+    return (device.keyboard and self.key_callbacks is not None) or (device.pointer and self.pointer_callbacks is not None)
+
+  def _sync(self):
+    """Registers the devices that have a reader and starts or stops the loop to match."""
+    import select
+
+    with self._lock:
+      wanted = {device.fd: device for device in self.devices if self._wanted(device)}
+      if wanted and self._epoll is None:
+        self._epoll = select.epoll()
+        self._wake_r, self._wake_w = os.pipe()
+        self._epoll.register(self._wake_r, select.EPOLLIN)
+        self._thread = threading.Thread(target=self._run, args=(self._epoll, self._wake_r), name="evdev-reader", daemon=True)
+        self._thread.start()
+      if self._epoll is not None:
+        for fd in self._by_fd.keys() - wanted.keys():
+          self._epoll.unregister(fd)
+        for fd in wanted.keys() - self._by_fd.keys():
+          self._epoll.register(fd, select.EPOLLIN)
+      self._by_fd = wanted
+      thread = None
+      if not wanted and self._epoll is not None:
+        os.write(self._wake_w, b"x")
+        os.close(self._wake_w)
+        thread, self._epoll = self._thread, None
+    if thread is not None and thread is not threading.current_thread():
+      thread.join()
+
+  def _remove(self, device: EvdevDevice):
+    # The device was unplugged: its fd now fails every call.
+    with self._lock:
+      if device in self.devices:
+        self.devices.remove(device)
+    self._sync()
+    try:
+      device.close()
+    except OSError:
+      pass
+
+  def _run(self, epoll, wake_r: int):
+    size = EVENT.size * 64
+    try:
+      while True:
+        for fd, _ in epoll.poll():
+          if fd == wake_r:
+            return
+          device = self._by_fd.get(fd)
+          if device is None:
+            continue
+          try:
+            data = os.read(fd, size)
+          except BlockingIOError:
+            continue
+          except OSError:
+            data = b""
+          if not data:
+            self._remove(device)
+            continue
+          self._dispatch(device, data)
+    finally:
+      epoll.close()
+      os.close(wake_r)
+
+  def _dispatch(self, device: EvdevDevice, data: bytes):
+    keys = self.key_callbacks if device.keyboard else None
+    pointer = self.pointer_callbacks if device.pointer else None
+    delivery = self.delivery if device.monotonic else None
+    for seconds, microseconds, event_type, code, value in EVENT.iter_unpack(data):
+      if event_type == EV_SYN:
+        continue
+      event_kind = None
+      if event_type == EV_KEY and code < BTN_MISC:
+        if keys is None:
+          continue
+        key = _EVDEV_KEYS.get(code, _UNNAMED_KEY)
+        # Autorepeat (value 2) is reported as another press, as pynput does.
+        if value:
+          keys[0](key)
+          event_kind = PRESS
+        else:
+          keys[1](key)
+          event_kind = RELEASE
+      elif pointer is not None:
+        event_kind = self._dispatch_pointer(pointer, event_type, code, value)
+      if event_kind is not None and delivery is not None:
+        delivery.record(event_kind, seconds * 1_000_000_000 + microseconds * 1000, device.grabbed)
+
+  def _dispatch_pointer(self, pointer: Tuple[Callable, Callable, Callable], event_type: int, code: int, value: int) -> Optional[int]:
+    on_move, on_click, on_scroll = pointer
+    if event_type == EV_REL:
+      if code == REL_X or code == REL_Y:
+        if code == REL_X:
+          self._x += value
+        else:
+          self._y += value
+        on_move(self._x, self._y)
+        return MOVE
+      if code == REL_WHEEL or code == REL_HWHEEL:
+        on_scroll(self._x, self._y, value if code == REL_HWHEEL else 0, value if code == REL_WHEEL else 0)
+        return SCROLL
+    elif event_type == EV_KEY and code in _BUTTONS:
+      on_click(self._x, self._y, _BUTTONS[code], bool(value))
+      return CLICK
+    return None
+
+
+_EVDEV_KEYS = {
+  **{code: KeyToken(name=name) for code, name in EVDEV_KEY_NAMES.items()},
+  **{code: KeyToken(char=char) for code, char in EVDEV_KEY_CHARS.items()},
+}
+# Keys without a name or char here still reach the unlock matcher, as OTHER_KEY, so they reset chords like under pynput.
+_UNNAMED_KEY = KeyToken()
+
+
+class EvdevListener:
+  """A keyboard listener, mouse listener or pointer blocker on the shared EvdevReader."""
+
+  def __init__(self, reader: EvdevReader, keyboard: bool, callbacks: Optional[tuple]):
+    self.reader = reader
+    self.keyboard = keyboard
+    self.callbacks = callbacks
+    self.running = False
+    self.suppressed = False
+
+  def start(self):
+    if self.callbacks is not None:
+      self.reader.subscribe(**{"keys" if self.keyboard else "pointer": self.callbacks})
+    self.running = True
+
+  def stop(self):
+    self.set_suppressed(False)
+    if self.callbacks is not None:
+      self.reader.unsubscribe(**{"keys" if self.keyboard else "pointer": True})
+    self.running = False
+
+  def set_suppressed(self, enabled: bool):
+    if enabled == self.suppressed:
+      return
+    if enabled:
+      # Grab keyboards plugged in since startup too; the scan only opens unseen nodes.
+      self.reader.refresh()
+    self.reader.grab(self.keyboard, enabled)
+    self.suppressed = enabled
+
+
+class EvdevBackend(InputBackend):
+  """Reads Linux input devices directly and grabs them with EVIOCGRAB while locked."""
+
+  name = "evdev"
+
+  def __init__(self, devices: Optional[List[EvdevDevice]] = None, directory: str = "/dev/input"):
+    self.reader = EvdevReader(devices, directory)
+
+  @classmethod
+  def for_display(cls, display: str) -> "EvdevBackend":
+    # Devices are not tied to X displays, so every seat would grab every keyboard.
+    raise ValueError("the evdev backend cannot be split per display; use pynput for multiple seats")
+
+  def prepare(self):
+    if not sys.platform.startswith("linux"):
+      raise RuntimeError("the evdev input backend is only available on Linux")
+    self.reader.refresh()
+    if not any(device.keyboard for device in self.reader.devices):
+      raise RuntimeError(f"no keyboard found under {self.reader.directory}")
+
+  def special_key_names(self) -> Optional[FrozenSet[str]]:
+    return frozenset(EVDEV_KEY_NAMES.values()) | frozenset(EVDEV_KEY_ALIASES)
+
+  def key_aliases(self) -> Dict[str, str]:
+    return EVDEV_KEY_ALIASES
+
+  def create_keyboard_listener(self, on_press, on_release) -> EvdevListener:
+    return EvdevListener(self.reader, True, (on_press, on_release))
+
+  def create_mouse_listener(self, on_move, on_click, on_scroll) -> EvdevListener:
+    return EvdevListener(self.reader, False, (on_move, on_click, on_scroll))
+
+  def create_pointer_blocker(self) -> EvdevListener:
+    return EvdevListener(self.reader, False, None)
+
+  def delivery_summary(self) -> Optional[Dict[str, Any]]:
+    return self.reader.delivery.summary()
+
+
+# How MouseManager blocks the pointer: "grab" uses create_pointer_blocker() when available,
+# "listener" always suppresses through per-event callbacks.
+MOUSE_SUPPRESSION_MODES = ("grab", "listener")
+
+BACKENDS = {
+  PynputBackend.name: PynputBackend,
+  EvdevBackend.name: EvdevBackend,
+  FakeInputBackend.name: FakeInputBackend,
+}
+
+
+def create_backend(name: str, display: Optional[str] = None) -> InputBackend:
+  try:
+    backend = BACKENDS[name]
+  except KeyError:
+    raise ValueError(f"Unknown input backend: '{name}'") from None
+  return backend() if display is None else backend.for_display(display)
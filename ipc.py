@@ -0,0 +1,159 @@
+import json
+import os
+import sys
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+from config import APP_CACHE_NAME, user_cache_dir
+
+# multiprocessing.connection pulls in socket and ssl, so it is imported where a connection is
+# made: the app imports this module for LockService alone.
+if TYPE_CHECKING:
+  from multiprocessing.connection import Listener
+
+# Requests and replies are single JSON objects; anything larger than this is not ours.
+MAX_MESSAGE_BYTES = 64 * 1024
+# A client gets this long, in seconds, to send its request before it is disconnected.
+REQUEST_TIMEOUT = 5.0
+FAMILY = "AF_PIPE" if sys.platform == "win32" else "AF_UNIX"
+
+
+class DaemonNotRunning(ConnectionError):
+  pass
+
+
+class LockService(ABC):
+  """What the daemon exposes over IPC. Every method returns the status dictionary."""
+
+  @abstractmethod
+  def lock(self, duration: Optional[float] = None) -> Dict[str, Any]: ...
+
+  @abstractmethod
+  def unlock(self) -> Dict[str, Any]: ...
+
+  @abstractmethod
+  def status(self) -> Dict[str, Any]: ...
+
+
+def default_address() -> str:
+  """Per-user socket path (a named pipe on Windows), honouring INPUT_LOCK_SOCKET."""
+  override = os.environ.get("INPUT_LOCK_SOCKET")
+  if override:
+    return override
+  if sys.platform == "win32":
+    return rf"\\.\pipe\{APP_CACHE_NAME}-{os.environ.get('USERNAME', 'user')}"
+  runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+  return str((Path(runtime_dir) if runtime_dir else user_cache_dir()) / "daemon.sock")
+
+
+class IpcServer:
+  """Serves LockService requests, one JSON object each way, on a local socket; ``dispatch`` picks the thread that runs them."""
+
+  def __init__(self, service: LockService, address: Optional[str] = None, dispatch: Optional[Callable[[Callable[[], Any]], Any]] = None):
+    self.service = service
+    self.address = address or default_address()
+    self.dispatch = dispatch or (lambda function: function())
+    self._listener: Optional[Listener] = None
+    self._thread: Optional[threading.Thread] = None
+    self._closing = False
+
+  def start(self):
+    from multiprocessing.connection import Listener
+
+    if FAMILY == "AF_UNIX":
+      self._remove_stale_socket()
+      Path(self.address).parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    self._listener = Listener(self.address, family=FAMILY)
+    if FAMILY == "AF_UNIX":
+      os.chmod(self.address, 0o600)
+    self._thread = threading.Thread(target=self._serve, daemon=True)
+    self._thread.start()
+
+  def close(self):
+    if self._listener is None:
+      return
+    from multiprocessing.connection import Client
+
+    self._closing = True
+    # accept() does not return when the socket is closed from another thread, so wake it first.
+    try:
+      Client(self.address, family=FAMILY).close()
+    except OSError:
+      pass
+    if self._thread is not None:
+      self._thread.join(timeout=1.0)
+    self._listener.close()
+    self._listener = None
+
+  def handle_request(self, request: Any) -> Dict[str, Any]:
+    if not isinstance(request, dict):
+      return {"ok": False, "error": "request must be a JSON object"}
+    command = request.get("command")
+    try:
+      if command == "lock":
+        duration = request.get("duration")
+        result = self.dispatch(lambda: self.service.lock(None if duration is None else float(duration)))
+      elif command == "unlock":
+        result = self.dispatch(self.service.unlock)
+      elif command == "status":
+        result = self.dispatch(self.service.status)
+      else:
+        return {"ok": False, "error": f"unknown command: {command!r}"}
+    except Exception as e:
+      return {"ok": False, "error": str(e)}
+    return {"ok": True, **result}
+
+  def _serve(self):
+    while not self._closing:
+      try:
+        conn = self._listener.accept()  # type: ignore[union-attr]
+      except OSError:
+        if self._closing:
+          break
+        continue
+      if self._closing:
+        conn.close()
+        break
+      # One thread per connection, so a client that stalls cannot hold up the next request.
+      threading.Thread(target=self._handle_connection, args=(conn,), daemon=True).start()
+
+  def _handle_connection(self, conn):
+    with conn:
+      try:
+        if not conn.poll(REQUEST_TIMEOUT):
+          return
+        request = json.loads(conn.recv_bytes(MAX_MESSAGE_BYTES))
+      except (EOFError, OSError, ValueError):
+        return
+      try:
+        conn.send_bytes(json.dumps(self.handle_request(request)).encode())
+      except OSError:
+        pass
+
+  def _remove_stale_socket(self):
+    if not os.path.exists(self.address):
+      return
+    from multiprocessing.connection import Client
+
+    try:
+      Client(self.address, family=FAMILY).close()
+    except OSError:
+      os.unlink(self.address)  # left behind by a daemon that did not shut down cleanly
+    else:
+      raise RuntimeError(f"a daemon is already listening on {self.address}")
+
+
+def send_request(command: str, address: Optional[str] = None, **params) -> Dict[str, Any]:
+  """Sends one request to the daemon and returns its reply."""
+  from multiprocessing.connection import Client
+
+  address = address or default_address()
+  try:
+    conn = Client(address, family=FAMILY)
+  except (FileNotFoundError, ConnectionRefusedError) as e:
+    raise DaemonNotRunning(f"no daemon is listening on {address}") from e
+  with conn:
+    conn.send_bytes(json.dumps({"command": command, **params}).encode())
+    return json.loads(conn.recv_bytes(MAX_MESSAGE_BYTES))
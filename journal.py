@@ -0,0 +1,269 @@
+"""Append-only journal of lock sessions in fixed-size records, rotated by size.
+
+Run ``python journal.py DIR`` to print the aggregate for a journal directory.
+"""
+
+import argparse
+import json
+import mmap
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+# In record order. The four times are float64, the latencies float32, the counts int32 and the
+# reason one byte, padded to a multiple of 8 so every field stays aligned for memoryview.cast().
+FIELDS = (
+  "started_at",  # wall clock, seconds since the epoch
+  "ended_at",
+  "duration_s",  # on the monotonic clock, so clock changes do not distort it
+  "planned_s",
+  "suppression_enabled_ms",
+  "first_suppressed_event_ms",
+  "keys_suppressed",
+  "pointer_suppressed",
+  "reason",  # index into REASONS
+)
+STARTED_AT, ENDED_AT, DURATION, PLANNED, SUPPRESSION_MS, FIRST_EVENT_MS, KEYS, POINTER, REASON = range(len(FIELDS))
+_FORMATS = "ddddffiiB"
+_CONVERTERS = [round if code in "iB" else float for code in _FORMATS]
+# Unlock reasons, by their code in the "reason" field; new reasons go at the end so old files keep their meaning.
+REASONS = ("timer", "combo", "request", "stall", "schedule", "shutdown")
+# Stored for values that were not measured, e.g. pointer events blocked by a grab.
+MISSING = -1
+
+RECORD = struct.Struct(f"<{_FORMATS}7x")
+# Byte offset of each field within a record.
+_OFFSETS = [struct.calcsize(f"<{_FORMATS[:index]}") for index in range(len(FIELDS))]
+# magic, version, fields per record, then padding so that records start 8-byte aligned.
+_HEADER = struct.Struct("<4sHH8x")
+_MAGIC = b"ILJ1"
+_VERSION = 1
+FILE_PREFIX, FILE_SUFFIX = "sessions-", ".ilj"
+
+DEFAULT_MAX_FILE_BYTES = 4 * 1024 * 1024
+DEFAULT_FSYNC_INTERVAL = 5.0
+
+
+def journal_files(directory: Path) -> List[Path]:
+  return sorted(directory.glob(f"{FILE_PREFIX}[0-9]*{FILE_SUFFIX}"))
+
+
+class SessionJournal:
+  """Appends session records from a writer thread, fsyncing in batches and rotating files at ``max_file_bytes``."""
+
+  def __init__(
+    self,
+    directory: Path,
+    max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+    fsync_interval: float = DEFAULT_FSYNC_INTERVAL,
+    max_files: Optional[int] = None,
+  ):
+    self.directory = Path(directory)
+    self.max_file_bytes = max(max_file_bytes, _HEADER.size + RECORD.size)
+    self.fsync_interval = fsync_interval
+    self.max_files = max_files
+    self.written = 0
+    self.fsyncs = 0
+    self._queue: "queue.SimpleQueue[Optional[bytes]]" = queue.SimpleQueue()
+    self._fd = -1
+    self._size = 0
+    self._index = 0
+    self._thread = threading.Thread(target=self._run, name="session-journal", daemon=True)
+    self._thread.start()
+
+  def append(self, values: Dict[str, float]):
+    """Queues one session; ``values`` maps FIELDS to numbers, with missing ones stored as MISSING."""
+    self._queue.put(RECORD.pack(*(convert(values.get(name, MISSING)) for name, convert in zip(FIELDS, _CONVERTERS))))
+
+  def close(self, timeout: float = 5.0):
+    """Writes and fsyncs everything queued so far, then stops the writer."""
+    self._queue.put(None)
+    self._thread.join(timeout)
+
+  def _run(self):
+    dirty_since: Optional[float] = None
+    while True:
+      timeout = None if dirty_since is None else max(0.0, dirty_since + self.fsync_interval - time.monotonic())
+      try:
+        record = self._queue.get(timeout=timeout)
+      except queue.Empty:
+        self._fsync()
+        dirty_since = None
+        continue
+      batch = []
+      while record is not None:
+        batch.append(record)
+        try:
+          record = self._queue.get_nowait()
+        except queue.Empty:
+          break
+      try:
+        if batch:
+          self._write(b"".join(batch))
+          dirty_since = dirty_since or time.monotonic()
+        if record is None:
+          self._fsync()
+      except OSError as e:
+        print(f"could not write the session journal: {e}", file=sys.stderr)
+        dirty_since = None
+      if record is None:
+        if self._fd >= 0:
+          os.close(self._fd)
+        return
+
+  def _write(self, data: bytes):
+    if self._fd < 0:
+      self._open_latest()
+    while data:
+      room = (self.max_file_bytes - self._size) // RECORD.size * RECORD.size
+      if room <= 0:
+        self._rotate()
+        continue
+      chunk, data = data[:room], data[room:]
+      os.write(self._fd, chunk)
+      self._size += len(chunk)
+      self.written += len(chunk) // RECORD.size
+
+  def _fsync(self):
+    if self._fd >= 0:
+      os.fsync(self._fd)
+      self.fsyncs += 1
+
+  def _open_latest(self):
+    self.directory.mkdir(parents=True, exist_ok=True)
+    files = journal_files(self.directory)
+    if files:
+      self._index = int(files[-1].stem[len(FILE_PREFIX) :])
+      path = files[-1]
+      fd = os.open(path, os.O_RDWR | os.O_APPEND)
+      size = os.fstat(fd).st_size
+      header = os.pread(fd, _HEADER.size, 0)
+      if len(header) == _HEADER.size and _HEADER.unpack(header) == (_MAGIC, _VERSION, len(FIELDS)):
+        # Drop a record torn by a crash so that the file stays a whole number of records.
+        aligned = size - (size - _HEADER.size) % RECORD.size
+        if aligned != size:
+          os.ftruncate(fd, aligned)
+        self._fd, self._size = fd, aligned
+        return
+      os.close(fd)
+    self._index += 1
+    self._create()
+
+  def _rotate(self):
+    self._fsync()
+    os.close(self._fd)
+    self._index += 1
+    self._create()
+    if self.max_files is not None:
+      for path in journal_files(self.directory)[: -self.max_files]:
+        path.unlink(missing_ok=True)
+
+  def _create(self):
+    path = self.directory / f"{FILE_PREFIX}{self._index:06d}{FILE_SUFFIX}"
+    self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | os.O_EXCL, 0o644)
+    os.write(self._fd, _HEADER.pack(_MAGIC, _VERSION, len(FIELDS)))
+    self._size = _HEADER.size
+
+
+# Maps a byte to 1 if its sign bit is set: applied to the top byte of each value, it finds MISSING.
+_SIGN_BITS = bytes(byte >> 7 for byte in range(256))
+
+
+def summarize(path: Path) -> Dict[str, Any]:
+  """Partial totals for one journal file; aggregate() merges them across files."""
+  with open(path, "rb") as file:
+    size = os.fstat(file.fileno()).st_size
+    count = (size - _HEADER.size) // RECORD.size if size > _HEADER.size else 0
+    if not count:
+      return {"sessions": 0}
+    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+      view = memoryview(mapped)
+      try:
+        if _HEADER.unpack_from(view) != (_MAGIC, _VERSION, len(FIELDS)):
+          raise ValueError(f"{path} is not a version {_VERSION} session journal")
+        return _summarize(view[_HEADER.size : _HEADER.size + count * RECORD.size], count)
+      finally:
+        view.release()
+
+
+def _summarize(region: memoryview, count: int) -> Dict[str, Any]:
+  first, last = RECORD.unpack_from(region), RECORD.unpack_from(region, (count - 1) * RECORD.size)
+  reasons = region[_OFFSETS[REASON] :: RECORD.size].tobytes()
+  summary: Dict[str, Any] = {
+    "sessions": count,
+    "first_started_at": first[STARTED_AT],
+    "last_ended_at": last[ENDED_AT],
+    "by_reason": {reason: reasons.count(code) for code, reason in enumerate(REASONS)},
+  }
+  summary["locked_s_total"] = sum(_values(region, DURATION))
+  summary["planned_s_total"] = sum(_values(region, PLANNED))
+  for field in (KEYS, POINTER, SUPPRESSION_MS, FIRST_EVENT_MS):
+    values = _values(region, field)
+    missing = _count_missing(region, field)
+    summary[FIELDS[field]] = {
+      "sessions": count - missing,
+      "total": sum(values) - MISSING * missing,
+    }
+    if field in (SUPPRESSION_MS, FIRST_EVENT_MS):
+      summary[FIELDS[field]]["max"] = max(values) if missing < count else None
+  return summary
+
+
+def _values(region: memoryview, field: int) -> Sequence[float]:
+  """One field of every record: a strided view, so sum() and max() read the mapped file in place."""
+  if sys.byteorder != "little":
+    return [record[field] for record in RECORD.iter_unpack(region)]
+  code = _FORMATS[field]
+  width = struct.calcsize(code)
+  return region.cast(code)[_OFFSETS[field] // width :: RECORD.size // width]
+
+
+def _count_missing(region: memoryview, field: int) -> int:
+  # Measured values are never negative, so MISSING is the only value with its sign bit set.
+  top = _OFFSETS[field] + struct.calcsize(_FORMATS[field]) - 1
+  return region[top :: RECORD.size].tobytes().translate(_SIGN_BITS).count(1)
+
+
+def aggregate(directory: Path) -> Dict[str, Any]:
+  """Totals over every session in the journal: counts by reason, durations, suppression and latency."""
+  parts = [part for part in map(summarize, journal_files(directory)) if part["sessions"]]
+  sessions = sum(part["sessions"] for part in parts)
+  if not sessions:
+    return {"sessions": 0}
+  locked = sum(part["locked_s_total"] for part in parts)
+  summary: Dict[str, Any] = {
+    "sessions": sessions,
+    "first_started_at": parts[0]["first_started_at"],
+    "last_ended_at": parts[-1]["last_ended_at"],
+    "by_reason": {reason: sum(part["by_reason"][reason] for part in parts) for reason in REASONS},
+    "locked_s_total": locked,
+    "duration_s_mean": locked / sessions,
+    "planned_s_total": sum(part["planned_s_total"] for part in parts),
+  }
+  for field in (KEYS, POINTER, SUPPRESSION_MS, FIRST_EVENT_MS):
+    name = FIELDS[field]
+    measured = sum(part[name]["sessions"] for part in parts)
+    total = sum(part[name]["total"] for part in parts)
+    summary[name] = {"sessions": measured, "total": total, "mean": total / measured if measured else None}
+    if field in (SUPPRESSION_MS, FIRST_EVENT_MS):
+      summary[name]["max"] = max((part[name]["max"] for part in parts if part[name]["max"] is not None), default=None)
+  return summary
+
+
+def main(argv: Optional[List[str]] = None):
+  parser = argparse.ArgumentParser(description="Summarizes a session journal directory.")
+  parser.add_argument("directory", type=Path)
+  args = parser.parse_args(argv)
+  start = time.perf_counter()
+  summary = aggregate(args.directory)
+  print(json.dumps(summary, indent=2))
+  print(f"read in {(time.perf_counter() - start) * 1000:.1f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+  main()
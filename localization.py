@@ -1,40 +1,117 @@
+"""Message catalogs: one ``locales/<language>.json`` per language, compiled to ``<language>.cat``.
+
+Run ``python localization.py`` before packaging to compile every catalog.
+"""
+
+import argparse
+import json
 import locale
+import string
+import struct
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from config import LOCALES_DIR
 
 DEFAULT_LANGUAGE = "english"
 
+CATALOG_SUFFIX = ".cat"
+SOURCE_SUFFIX = ".json"
+
+# magic, version, entry count, then the source's size and mtime so stale catalogs are ignored.
+_HEADER = struct.Struct("<4sHIQq")
+# Per entry: key length, text length, pattern length (all UTF-8 bytes) and the pattern kind.
+_ENTRY = struct.Struct("<HIIB")
+_MAGIC = b"ILM1"
+_VERSION = 1
+
+# How a message is filled in: PLAIN messages have no fields, PERCENT ones carry a %-mapping
+# pattern compiled from the ``{name}`` template, and FORMAT ones fall back to str.format.
+PLAIN, PERCENT, FORMAT = 0, 1, 2
+
+Messages = Dict[str, str]
+Patterns = Dict[str, Tuple[int, str]]
 
-TRANSLATIONS = {
-  "english": {
-    "app_title": "Clean Lock",
-    "title": "Clean Lock",
-    "description": "Temporarily disable input devices like the keyboard, mouse, and touchpad, allowing you to\nsafely clean your computer and accessories without accidental input.",
-    "lock_button": "Lock",
-    "exit_button": "Exit",
-    "warning_locked": "Locked",
-    "warning_locked_message": "Cannot perform this action while the system is locked.",
-    "locked_message": "Press the configured key combination to unlock.",
-    "locked_detailed_message": "Your computer and all connected devices are locked for {minutes} minutes.\nYou can begin to clean your computer.\nDo not disconnect any connected devices.\nTo exit at any time, press {combo}",
-    "step_lock": "Lock",
-    "step_clean": "Clean",
-    "step_done": "Done",
-    "unlock_info_format": "Unlocks after {minutes} mins or with\n{combo}",
-  },
-  "turkish": {
-    "app_title": "Clean Lock",
-    "title": "Clean Lock",
-    "description": "Bilgisayarınızı ve aksesuarlarınızı yanlışlıkla girdi olmadan güvenli bir şekilde temizlemenize\nolanak tanımak için klavye, fare ve dokunmatik yüzey gibi giriş aygıtlarını geçici olarak devre dışı bırakın.",
-    "lock_button": "Kilitle",
-    "exit_button": "Çıkış",
-    "warning_locked": "Kilitli",
-    "warning_locked_message": "Sistem kilitliyken bu işlem yapılamaz.",
-    "locked_message": "Kilidi açmak için ayarlanmış tuş kombinasyonuna basın.",
-    "locked_detailed_message": "Bilgisayarınız ve tüm bağlı cihazlar {minutes} dakika boyunca kilitlendi.\nBilgisayarınızı temizlemeye başlayabilirsiniz.\nBağlı cihazların bağlantısını kesmeyin.\nİstediğiniz zaman çıkmak için {combo} tuşlarına basın",
-    "step_lock": "Kilitle",
-    "step_clean": "Temizle",
-    "step_done": "Bitti",
-    "unlock_info_format": "{minutes} dakika sonra veya\n{combo} ile açılır",
-  },
-}
+
+def compile_template(text: str) -> Tuple[int, str]:
+  """Parses a ``str.format`` template once into a ``%`` pattern; templates with positional fields, conversions or specs keep FORMAT."""
+  if "{" not in text and "}" not in text:
+    return PLAIN, ""
+  parts = []
+  for literal, field, spec, conversion in string.Formatter().parse(text):
+    parts.append(literal.replace("%", "%%"))
+    if field is None:
+      continue
+    if not field.isidentifier() or spec or conversion:
+      return FORMAT, text
+    parts.append(f"%({field})s")
+  return PERCENT, "".join(parts)
+
+
+def _source_stamp(path: Path) -> Tuple[int, int]:
+  stat = path.stat()
+  return stat.st_size, stat.st_mtime_ns
+
+
+def compile_catalog(source: Path, output: Optional[Path] = None) -> Path:
+  messages: Messages = json.loads(source.read_text(encoding="utf-8"))
+  output = output or source.with_suffix(CATALOG_SUFFIX)
+  entries, blob = [], []
+  for key, text in messages.items():
+    kind, pattern = compile_template(text)
+    encoded = [key.encode(), text.encode(), pattern.encode() if kind == PERCENT else b""]
+    entries.append(_ENTRY.pack(*map(len, encoded), kind))
+    blob.extend(encoded)
+  size, mtime_ns = _source_stamp(source)
+  tmp_path = output.with_suffix(".tmp")
+  tmp_path.write_bytes(_HEADER.pack(_MAGIC, _VERSION, len(entries), size, mtime_ns) + b"".join(entries) + b"".join(blob))
+  tmp_path.replace(output)
+  return output
+
+
+def _read_compiled(path: Path, source: Optional[Path]) -> Optional[Tuple[Messages, Patterns]]:
+  try:
+    data = memoryview(path.read_bytes())
+    magic, version, count, size, mtime_ns = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != _VERSION:
+      return None
+    if source is not None and _source_stamp(source) != (size, mtime_ns):
+      return None
+    messages: Messages = {}
+    patterns: Patterns = {}
+    offset = _HEADER.size + count * _ENTRY.size
+    for key_len, text_len, pattern_len, kind in _ENTRY.iter_unpack(data[_HEADER.size : offset]):
+      key = str(data[offset : offset + key_len], "utf-8")
+      offset += key_len
+      text = messages[key] = str(data[offset : offset + text_len], "utf-8")
+      offset += text_len
+      if kind == PERCENT:
+        patterns[key] = (kind, str(data[offset : offset + pattern_len], "utf-8"))
+      elif kind == FORMAT:
+        patterns[key] = (kind, text)
+      offset += pattern_len
+    return messages, patterns
+  except (OSError, struct.error, UnicodeDecodeError):
+    return None
+
+
+def load_catalog(language: str, directory: Path = LOCALES_DIR, check_source: bool = True) -> Optional[Tuple[Messages, Patterns]]:
+  """Returns ``(messages, patterns)`` for ``language``, or None if there is no such catalog."""
+  source = directory / f"{language}{SOURCE_SUFFIX}"
+  compiled = _read_compiled(directory / f"{language}{CATALOG_SUFFIX}", source if check_source and source.exists() else None)
+  if compiled is not None:
+    return compiled
+  try:
+    messages: Messages = json.loads(source.read_text(encoding="utf-8"))
+  except (OSError, ValueError):
+    return None
+  patterns = {key: (kind, pattern) for key, (kind, pattern) in ((key, compile_template(text)) for key, text in messages.items()) if kind != PLAIN}
+  return messages, patterns
+
+
+def available_languages(directory: Path = LOCALES_DIR) -> List[str]:
+  return sorted({path.stem for pattern in (f"*{SOURCE_SUFFIX}", f"*{CATALOG_SUFFIX}") for path in directory.glob(pattern)})
 
 
 def detect_system_language() -> str:
@@ -43,7 +120,21 @@ def detect_system_language() -> str:
     system_locale = locale.getlocale()[0]
     if system_locale:
       lang_code = system_locale.split("_")[0].lower()
-      return lang_code if lang_code in TRANSLATIONS else DEFAULT_LANGUAGE
+      has_catalog = any((LOCALES_DIR / f"{lang_code}{suffix}").exists() for suffix in (SOURCE_SUFFIX, CATALOG_SUFFIX))
+      return lang_code if has_catalog else DEFAULT_LANGUAGE
   except Exception:
     pass
   return DEFAULT_LANGUAGE
+
+
+def main(argv: Optional[List[str]] = None):
+  parser = argparse.ArgumentParser(description="Compiles the message catalogs in locales/.")
+  parser.add_argument("--directory", type=Path, default=LOCALES_DIR)
+  args = parser.parse_args(argv)
+  for source in sorted(args.directory.glob(f"*{SOURCE_SUFFIX}")):
+    compile_catalog(source)
+  print(f"catalogs compiled in {args.directory}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,298 @@
+"""Lock windows that start on a wall-clock schedule, e.g. nightly cleaning or recurring breaks."""
+
+import ctypes
+import errno
+import heapq
+import math
+import os
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+DAY_SECONDS = 24 * 60 * 60
+# Where no timerfd is available, the fallback timer wakes at least this often to notice a
+# suspend/resume or a clock change; with timerfd the kernel reports both.
+RESUME_CHECK_SECONDS = 300.0
+
+_DURATION = re.compile(r"^(\d+(?:\.\d+)?)([smh]?)$")
+_UNITS = {"": 1, "s": 1, "m": 60, "h": 60 * 60}
+
+
+def parse_duration(text: str) -> float:
+  """Seconds in ``"90"``, ``"90s"``, ``"5m"`` or ``"1.5h"``."""
+  match = _DURATION.match(text.strip().lower())
+  if match is None:
+    raise ValueError(f"invalid duration {text!r}")
+  return float(match.group(1)) * _UNITS[match.group(2)]
+
+
+@dataclass(frozen=True)
+class ScheduledLock:
+  """Lock windows of ``duration_seconds``, starting daily at ``at`` (local "HH:MM") and/or every ``every_seconds``."""
+
+  duration_seconds: float
+  at: Optional[str] = None
+  every_seconds: Optional[float] = None
+
+  def __post_init__(self):
+    if self.duration_seconds <= 0:
+      raise ValueError("duration must be positive")
+    if self.at is None and self.every_seconds is None:
+      raise ValueError("a scheduled lock needs a start time, an interval, or both")
+    if self.every_seconds is not None and self.every_seconds <= 0:
+      raise ValueError("interval must be positive")
+    if self.at is not None:
+      self._time_of_day()
+
+  @classmethod
+  def parse(cls, spec: str) -> "ScheduledLock":
+    """Parses ``"02:00 for 30m"``, ``"every 50m for 5m"`` or ``"09:00 every 2h for 10m"``."""
+    words = spec.split()
+    at = every = duration = None
+    try:
+      while words:
+        word = words.pop(0)
+        if word == "every":
+          every = parse_duration(words.pop(0))
+        elif word == "for":
+          duration = parse_duration(words.pop(0))
+        elif at is None and ":" in word:
+          at = word
+        else:
+          raise ValueError(f"unexpected {word!r} in schedule {spec!r}")
+    except IndexError:
+      raise ValueError(f"incomplete schedule {spec!r}") from None
+    if duration is None:
+      raise ValueError(f"schedule {spec!r} has no 'for DURATION'")
+    return cls(duration, at, every)
+
+  def next_start(self, after: float, origin: float) -> float:
+    """The first window start strictly after the wall time ``after``."""
+    if self.at is None:
+      every = self.every_seconds  # type: ignore[assignment]
+      start = origin + math.floor((after - origin) / every) * every
+      # Rounding can leave the estimate a step short, or land exactly on ``after``.
+      while start <= after:
+        start += every
+      return start
+    hour, minute = self._time_of_day()
+    every = timedelta(seconds=self.every_seconds or DAY_SECONDS)
+    day = datetime.fromtimestamp(after).replace(hour=hour, minute=minute, second=0, microsecond=0) - timedelta(days=1)
+    while True:
+      next_day = day + timedelta(days=1)
+      start = day
+      if start.timestamp() <= after:
+        start += every * math.floor((after - start.timestamp()) / every.total_seconds())
+        # Steps are in local wall time, so across a DST change the estimate can be one short.
+        while start.timestamp() <= after:
+          start += every
+      if start < next_day:
+        return start.timestamp()
+      day = next_day
+
+  def _time_of_day(self) -> Tuple[int, int]:
+    try:
+      hour, minute = (int(part) for part in self.at.split(":"))  # type: ignore[union-attr]
+    except ValueError:
+      raise ValueError(f"invalid time of day {self.at!r}; expected HH:MM") from None
+    if not (0 <= hour < 24 and 0 <= minute < 60):
+      raise ValueError(f"invalid time of day {self.at!r}; expected HH:MM")
+    return hour, minute
+
+
+class _Timespec(ctypes.Structure):
+  _fields_ = [("tv_sec", ctypes.c_long), ("tv_nsec", ctypes.c_long)]
+
+
+class _Itimerspec(ctypes.Structure):
+  _fields_ = [("it_interval", _Timespec), ("it_value", _Timespec)]
+
+
+CLOCK_REALTIME = 0
+TFD_CLOEXEC = 0o2000000
+TFD_TIMER_ABSTIME = 1
+TFD_TIMER_CANCEL_ON_SET = 2
+
+
+def _load_timerfd():
+  if not sys.platform.startswith("linux"):
+    return None
+  try:
+    libc = ctypes.CDLL(None, use_errno=True)
+  except OSError:
+    return None
+  # Older or non-glibc C libraries may lack the timerfd calls; fall back to polling then.
+  if not (hasattr(libc, "timerfd_create") and hasattr(libc, "timerfd_settime")):
+    return None
+  return libc
+
+
+class WallClockTimer:
+  """Calls ``on_fire`` on its own thread once the wall clock reaches the armed deadline, also across suspend and clock changes."""
+
+  def __init__(self, on_fire: Callable[[], None], resume_check: float = RESUME_CHECK_SECONDS):
+    self.on_fire = on_fire
+    self.resume_check = resume_check
+    self.wakeups = 0
+    self._deadline: Optional[float] = None
+    self._closed = False
+    self._condition = threading.Condition()
+    self._libc = _load_timerfd()
+    self._fd = -1
+    if self._libc is not None:
+      self._fd = self._libc.timerfd_create(CLOCK_REALTIME, TFD_CLOEXEC)
+      if self._fd < 0:
+        self._libc = None
+    run = self._run_timerfd if self._libc is not None else self._run_sleeping
+    self.thread = threading.Thread(target=run, name="lock-schedule", daemon=True)
+    self.thread.start()
+
+  @property
+  def uses_timerfd(self) -> bool:
+    return self._libc is not None
+
+  def set(self, deadline: Optional[float]):
+    """Arms the timer for the wall time ``deadline``, or disarms it with None."""
+    with self._condition:
+      if self._closed:
+        return
+      self._deadline = deadline
+      if self._libc is not None:
+        self._settime(deadline)
+      self._condition.notify()
+
+  def close(self):
+    with self._condition:
+      self._closed = True
+      if self._libc is not None:
+        self._settime(1.0)  # long past, so the blocked read returns and the thread exits
+      self._condition.notify()
+
+  def _settime(self, deadline: Optional[float]):
+    # An all-zero it_value disarms the timer.
+    seconds, nanoseconds = divmod(round(deadline * 1e9), 1_000_000_000) if deadline is not None else (0, 0)
+    spec = _Itimerspec(_Timespec(0, 0), _Timespec(seconds, nanoseconds))
+    if self._libc.timerfd_settime(self._fd, TFD_TIMER_ABSTIME | TFD_TIMER_CANCEL_ON_SET, ctypes.byref(spec), None) != 0:  # type: ignore[union-attr]
+      error = ctypes.get_errno()
+      raise OSError(error, os.strerror(error))
+
+  def _run_timerfd(self):
+    while True:
+      try:
+        os.read(self._fd, 8)
+      except OSError as e:
+        # ECANCELED: the wall clock was set, so every deadline needs a fresh look.
+        if e.errno != errno.ECANCELED:
+          raise
+      if self._closed:
+        os.close(self._fd)
+        return
+      self.wakeups += 1
+      self.on_fire()
+
+  def _run_sleeping(self):
+    with self._condition:
+      while not self._closed:
+        deadline = self._deadline
+        if deadline is None:
+          self._condition.wait()
+          continue
+        remaining = deadline - time.time()
+        if remaining > 0:
+          # Monotonic waits stand still during suspend; the slice bounds how late a resume is seen.
+          self._condition.wait(min(remaining, self.resume_check))
+          self.wakeups += 1
+          continue
+        self._deadline = None
+        self.wakeups += 1
+        self._condition.release()
+        try:
+          self.on_fire()
+        finally:
+          self._condition.acquire()
+
+
+START, END = 0, 1
+
+
+class LockScheduler:
+  """Starts and ends locks for ScheduledLocks, with one wall-clock timer armed for the earliest start or end."""
+
+  def __init__(
+    self,
+    schedules: List[ScheduledLock],
+    on_start: Callable[[float], None],
+    on_end: Callable[[], None],
+    post: Callable[..., None],
+    clock: Callable[[], float] = time.time,
+    timer_factory: Callable[[Callable[[], None]], WallClockTimer] = WallClockTimer,
+  ):
+    self.schedules = schedules
+    self.on_start = on_start
+    self.on_end = on_end
+    self.clock = clock
+    self.timer = timer_factory(lambda: post(self._on_timer))
+    self._heap: List[Tuple[float, int, int, ScheduledLock]] = []
+    self._sequence = 0
+    self._origin = 0.0
+    self._running = 0
+    self.wakeups = 0
+    self.idle_wakeups = 0
+    self.started = 0
+    self.missed = 0
+
+  def start(self):
+    """Schedules every window that has not ended yet; one in progress starts right away."""
+    now = self._origin = self.clock()
+    for schedule in self.schedules:
+      if schedule.at is None:
+        start = now + schedule.every_seconds  # type: ignore[operator]
+      else:
+        # A window that started up to its duration ago is still in progress.
+        start = schedule.next_start(now - schedule.duration_seconds, now)
+      self._push(start, START, schedule)
+    self._on_timer(counted=False)
+
+  def close(self):
+    self.timer.close()
+    self._heap.clear()
+
+  def next_deadline(self) -> Optional[float]:
+    return self._heap[0][0] if self._heap else None
+
+  def stats(self) -> Dict[str, int]:
+    return {"wakeups": self.wakeups, "idle_wakeups": self.idle_wakeups, "started": self.started, "missed": self.missed, "running": self._running}
+
+  def _push(self, when: float, kind: int, schedule: ScheduledLock):
+    heapq.heappush(self._heap, (when, self._sequence, kind, schedule))
+    self._sequence += 1
+
+  def _on_timer(self, counted: bool = True):
+    now = self.clock()
+    due = False
+    while self._heap and self._heap[0][0] <= now:
+      when, _, kind, schedule = heapq.heappop(self._heap)
+      due = True
+      if kind == START:
+        # After a long suspend, skip straight to the first window that has not ended.
+        self._push(schedule.next_start(max(when, now - schedule.duration_seconds), self._origin), START, schedule)
+        end = when + schedule.duration_seconds
+        if end <= now:
+          self.missed += 1
+          continue
+        self._push(end, END, schedule)
+        self._running += 1
+        self.started += 1
+        self.on_start(end - now)
+      else:
+        self._running -= 1
+        if not self._running:
+          self.on_end()
+    if counted:
+      self.wakeups += 1
+      self.idle_wakeups += not due
+    self.timer.set(self.next_deadline())
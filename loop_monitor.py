@@ -0,0 +1,118 @@
+import threading
+import time
+from array import array
+from typing import Any, Callable, Dict, Optional
+
+Scheduler = Callable[[int, Callable[[], None]], Any]
+
+
+class LagMonitor:
+  """Samples how late the loop runs a timer every ``interval`` seconds, and doubles as its heartbeat."""
+
+  def __init__(
+    self, schedule: Scheduler, cancel: Callable[[Any], None], interval: float = 0.25, window: int = 1024, clock: Callable[[], float] = time.monotonic
+  ):
+    self._schedule = schedule
+    self._cancel = cancel
+    self.interval = interval
+    self.clock = clock
+    self._samples = array("d", bytes(8 * window))
+    self._count = 0
+    self._handle = None
+    self._due: Optional[float] = None
+    self.last_beat = clock()
+
+  @property
+  def running(self) -> bool:
+    return self._handle is not None
+
+  def start(self):
+    if self._handle is None:
+      self.last_beat = self.clock()
+      self._arm()
+
+  def stop(self):
+    if self._handle is not None:
+      self._cancel(self._handle)
+      self._handle = None
+      # A beat that is already overdue still says how late the loop is running, e.g. after a stall.
+      lateness = self.clock() - self._due  # type: ignore[operator]
+      if lateness > 0:
+        self._record(lateness)
+
+  def reset(self):
+    self._count = 0
+
+  def _arm(self):
+    self._due = self.clock() + self.interval
+    self._handle = self._schedule(round(self.interval * 1000), self._on_timer)
+
+  def _on_timer(self):
+    now = self.clock()
+    self.last_beat = now
+    self._record(max(0.0, now - self._due))  # type: ignore[operator]
+    self._arm()
+
+  def _record(self, lateness: float):
+    self._samples[self._count % len(self._samples)] = lateness
+    self._count += 1
+
+  def summary(self) -> Dict[str, Optional[float]]:
+    samples = sorted(self._samples[: min(self._count, len(self._samples))])
+    if not samples:
+      return {"samples": 0, "p50_ms": None, "p99_ms": None, "max_ms": None}
+    return {
+      "samples": self._count,
+      "p50_ms": samples[(len(samples) - 1) // 2] * 1000,
+      "p99_ms": samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000,
+      "max_ms": samples[-1] * 1000,
+    }
+
+
+class StallWatchdog:
+  """Fires ``on_stall`` from its own thread when a locked loop stops beating or overstays its deadline."""
+
+  def __init__(self, monitor: LagMonitor, on_stall: Callable[[float], None], timeout: float = 5.0, clock: Callable[[], float] = time.monotonic):
+    if timeout <= 0:
+      raise ValueError("timeout must be positive")
+    self.monitor = monitor
+    self.on_stall = on_stall
+    self.timeout = timeout
+    self.clock = clock
+    self.stalls = 0
+    self._deadline: Optional[float] = None
+    self._armed = False
+    self._wake = threading.Event()
+    self._thread: Optional[threading.Thread] = None
+
+  def arm(self, deadline: Optional[float] = None):
+    """Starts watching; ``deadline`` is when the lock should end, on the watchdog's clock."""
+    self._deadline = deadline
+    self._armed = True
+    if self._thread is None:
+      self._thread = threading.Thread(target=self._run, name="stall-watchdog", daemon=True)
+      self._thread.start()
+    self._wake.set()
+
+  def disarm(self):
+    self._armed = False
+    self._deadline = None
+
+  def _run(self):
+    while True:
+      if not self._armed:
+        self._wake.wait()
+        self._wake.clear()
+        continue
+      self._wake.wait(self.timeout / 4)
+      self._wake.clear()
+      if not self._armed:
+        continue
+      now = self.clock()
+      stalled_for = now - self.monitor.last_beat
+      deadline = self._deadline
+      overdue = deadline is not None and now - deadline > self.timeout
+      if stalled_for > self.timeout or overdue:
+        self._armed = False
+        self.stalls += 1
+        self.on_stall(stalled_for)
@@ -1,3 +1,8 @@
+from __future__ import annotations
+
+import argparse
+import importlib
+import re
 import sys
 import threading
 import time
@@ -5,44 +10,131 @@ import tkinter as tk
 from dataclasses import dataclass, field
 from pathlib import Path
 from tkinter import messagebox
-from typing import Any, Dict, List, Optional, Set, Union
-
-import darkdetect
-import pywinstyles
-import sv_ttk
-from PIL import Image, ImageTk
-from pynput import keyboard, mouse
-from pynput.keyboard import Key, KeyCode
-
-from config import ASSETS_DIR, FONT_FAMILY, THEME_CONFIG
-from localization import DEFAULT_LANGUAGE, TRANSLATIONS, detect_system_language
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Union
+
+import client
+from config import ASSETS_DIR, ATLAS_DIR, FONT_FAMILY, LOCALES_DIR, RING_DIAMETER, THEME_CONFIG, THEME_RECOLOR_RULES, UI_IMAGES, user_cache_dir
+from countdown import Countdown
+from diagnostics import CLICK, MOVE, PRESS, RELEASE, SCROLL, InputStats, LockLatencyProbe, StartupTrace
+from event_bus import EventBus
+from image_cache import DEFAULT_MAX_BYTES, ImageMemoryCache
+from input_backends import BACKENDS, MOUSE_SUPPRESSION_MODES, InputBackend, PointerGrabError, PynputBackend, create_backend
+from journal import SessionJournal
+from localization import DEFAULT_LANGUAGE, PERCENT, detect_system_language, load_catalog
+from lock_schedule import LockScheduler, ScheduledLock
+from profiling import PROFILE_DIR_ENV, PhaseProfiler, profiler_from_env
+from progress_ring import DEFAULT_MAX_FPS, ProgressRing
+from styling import StyleRegistry, ThemeWatcher, pixel_scale
+from unlock_matcher import OTHER_KEY, UnlockChord, UnlockMatcher
+
+# Third-party modules are imported where they are first needed so the main window can paint
+# before the input backend (pynput) and the imaging stack are loaded.
+if TYPE_CHECKING:
+  from PIL import Image, ImageTk
+  from pynput.keyboard import Key, KeyCode
+
+  from asset_cache import AssetDiskCache
+  from atlas import SpriteAtlas
+  from core import LockCore, TkLoopPump
+  from ipc import IpcServer
+
+
+def import_ui_dependencies():
+  for module in ("darkdetect", "sv_ttk", "PIL.Image", "PIL.ImageTk"):
+    importlib.import_module(module)
 
 
 @dataclass
 class AppConfig:
   lock_duration_seconds: int = 60 * 2
   unlock_sequence: List[str] = field(default_factory=lambda: ["shift", "alt_l", "l"])
+  # Further key sequences that also unlock; only unlock_sequence is shown in the UI.
+  extra_unlock_sequences: List[List[str]] = field(default_factory=list)
+  # When set, a chord only counts if it is completed within this many seconds of its first key.
+  unlock_window_seconds: Optional[float] = None
   language: str = field(default_factory=detect_system_language)
+  input_backend: str = "pynput"
+  # "grab" blocks the pointer without per-event callbacks where the backend supports it.
+  mouse_suppression: str = "grab"
+  # If the UI loop misses its heartbeat for this long while locked, input is released anyway.
+  stall_timeout_seconds: float = 5.0
+  # Restyle live when the OS switches between light and dark.
+  follow_system_theme: bool = True
+  # Upper bound on how often the overlay's countdown ring redraws.
+  countdown_max_fps: float = DEFAULT_MAX_FPS
+  # Below 1.0 the compositor re-blends the whole fullscreen overlay for every countdown frame.
+  overlay_alpha: float = 1.0
+  # Windows in which the app locks by itself, e.g. ScheduledLock.parse("02:00 for 30m").
+  lock_schedule: List[ScheduledLock] = field(default_factory=list)
+  # Where every lock session is journaled (see journal.py); None keeps no journal.
+  journal_dir: Optional[Path] = None
+
+  def unlock_chords(self) -> List[UnlockChord]:
+    sequences = [self.unlock_sequence, *self.extra_unlock_sequences]
+    return [UnlockChord.parse(sequence, self.unlock_window_seconds) for sequence in sequences]
 
 
 class LocalizationManager:
-  def __init__(self, language: str = DEFAULT_LANGUAGE):
-    self.language = language
+  """Looks up messages in one table built from the language's catalog over the fallback's, loaded on first use."""
+
+  def __init__(self, language: str = DEFAULT_LANGUAGE, directory: Path = LOCALES_DIR):
+    self._language = language
+    self.directory = directory
+    self._messages: Optional[Dict[str, str]] = None
+    # Per templated message, a bound ``pattern.__mod__`` (or ``format_map``) taking the values.
+    self._formatters: Dict[str, Callable[[Dict[str, Any]], str]] = {}
+
+  @property
+  def language(self) -> str:
+    return self._language
+
+  @language.setter
+  def language(self, language: str):
+    if language != self._language:
+      self._language = language
+      self._messages = None
+      self._formatters = {}
 
   def get_text(self, key: str) -> str:
-    for lang_code in (self.language, DEFAULT_LANGUAGE):
-      text = TRANSLATIONS.get(lang_code, {}).get(key)
-      if text is not None:
-        return text
-    return f"<KEY:'{key}'_NOT_FOUND>"
+    messages = self._messages if self._messages is not None else self._load()
+    text = messages.get(key)
+    return text if text is not None else f"<KEY:'{key}'_NOT_FOUND>"
+
+  def format(self, key: str, **values: Any) -> str:
+    """Fills in a message's ``{name}`` fields, using the template parsed when it was loaded."""
+    formatter = self._formatters.get(key)
+    if formatter is not None:
+      return formatter(values)
+    if self._messages is None:
+      self._load()
+      return self.format(key, **values)
+    return self.get_text(key)
+
+  def _load(self) -> Dict[str, str]:
+    check_source = not getattr(sys, "frozen", False)
+    messages: Dict[str, str] = {}
+    formatters: Dict[str, Callable[[Dict[str, Any]], str]] = {}
+    for language in dict.fromkeys((DEFAULT_LANGUAGE, self._language)):
+      catalog = load_catalog(language, self.directory, check_source)
+      if catalog is not None:
+        messages.update(catalog[0])
+        # A translated message replaces the fallback's template, even with a plain one.
+        for key in catalog[0]:
+          formatters.pop(key, None)
+        for key, (kind, pattern) in catalog[1].items():
+          formatters[key] = pattern.__mod__ if kind == PERCENT else pattern.format_map
+    self._messages, self._formatters = messages, formatters
+    return messages
 
 
 class ThemeManager:
-  def __init__(self):
-    self.current_theme = self._detect_system_theme()
+  def __init__(self, theme: Optional[str] = None):
+    self.current_theme = theme or self._detect_system_theme()
 
   def _detect_system_theme(self) -> str:
     try:
+      import darkdetect
+
       detected_theme = darkdetect.theme()
       return "dark" if detected_theme == "Dark" else "light"
     except Exception:
@@ -52,6 +144,8 @@ class ThemeManager:
     return THEME_CONFIG[self.current_theme].get(color_key, "#000000")
 
   def apply_system_theme(self):
+    import sv_ttk
+
     try:
       sv_ttk.set_theme(self.current_theme)
     except Exception:
@@ -59,6 +153,8 @@ class ThemeManager:
 
   def apply_titlebar_theme(self, window: tk.Tk):
     try:
+      import pywinstyles
+
       bg_color = self.get_color("background")
       version = sys.getwindowsversion()
 
@@ -76,24 +172,130 @@ class ThemeManager:
 
 
 class ImageManager:
-  def __init__(self, theme_manager: ThemeManager):
+  def __init__(
+    self,
+    theme_manager: ThemeManager,
+    cache_dir: Optional[Path] = None,
+    atlas_dir: Optional[Path] = None,
+    memory_budget: int = DEFAULT_MAX_BYTES,
+  ):
     self.theme_manager = theme_manager
-    self._cache = {}
+    self.cache_dir = cache_dir
+    self.atlas_dir = atlas_dir
+    self._atlas: Optional[SpriteAtlas] = None
+    self._atlas_checked = False
+    self._disk_cache: Optional[AssetDiskCache] = None
+    # Keyed by (path, size, theme, scale); photos a widget still shows are never evicted.
+    self._cache = ImageMemoryCache(self._photo_bytes, self._photo_in_use, memory_budget)
+    self._cache_theme = theme_manager.current_theme
+    self._prepared: Dict[tuple, Image.Image] = {}
+    self._recolor_rules: Optional[Dict[str, list]] = None
+
+  @property
+  def disk_cache(self) -> Optional[AssetDiskCache]:
+    if self._disk_cache is None and self.cache_dir is not None:
+      from asset_cache import AssetDiskCache
+
+      self._disk_cache = AssetDiskCache(self.cache_dir)
+    return self._disk_cache
+
+  @property
+  def atlas(self) -> Optional[SpriteAtlas]:
+    if not self._atlas_checked and self.atlas_dir is not None:
+      from atlas import SpriteAtlas
+
+      self._atlas = SpriteAtlas.load(self.atlas_dir, ASSETS_DIR, check_sources=not getattr(sys, "frozen", False))
+      self._atlas_checked = True
+    return self._atlas
+
+  def load_png_image(self, png_path: Path, size: tuple, scale: int = 1) -> ImageTk.PhotoImage:
+    """Returns ``png_path`` themed and resized to the logical ``size`` times ``scale`` pixels."""
+    from PIL import ImageTk
+
+    theme = self.theme_manager.current_theme
+    if theme != self._cache_theme:
+      self.evict_inactive_themes()
+    cache_key = (png_path, size, theme, scale)
+    photo_image = self._cache.get(cache_key)
+    if photo_image is not None:
+      return photo_image
+
+    img = self._prepared.pop(cache_key, None)
+    if img is None:
+      img = self._load_processed_image(png_path, size, scale)
+    photo_image = ImageTk.PhotoImage(img)
+    self._cache.put(cache_key, photo_image)
+    return photo_image
+
+  def evict_inactive_themes(self) -> int:
+    """Drops cached images built for other themes, except those still shown by a widget."""
+    theme = self._cache_theme = self.theme_manager.current_theme
+    for key in [key for key in self._prepared if key[2] != theme]:
+      del self._prepared[key]
+    return self._cache.evict_where(lambda key: key[2] != theme)
+
+  def cache_stats(self) -> Dict[str, int]:
+    return self._cache.stats()
 
-  def load_png_image(self, png_path: Path, size: tuple) -> ImageTk.PhotoImage:
-    cache_key = (png_path, size, self.theme_manager.current_theme)
-    if cache_key in self._cache:
-      return self._cache[cache_key]
+  @staticmethod
+  def _photo_bytes(photo: ImageTk.PhotoImage) -> int:
+    # Tk photo images keep 32-bit RGBA pixels, whatever the source format.
+    return photo.width() * photo.height() * 4
+
+  @staticmethod
+  def _photo_in_use(photo: ImageTk.PhotoImage) -> bool:
+    try:
+      return bool(photo.tk.call("image", "inuse", str(photo)))
+    except (tk.TclError, AttributeError):
+      return False
+
+  def preload(self, png_path: Path, size: tuple, scale: int = 1):
+    """Processes an image ahead of time; safe to call off the Tk thread."""
+    cache_key = (png_path, size, self.theme_manager.current_theme, scale)
+    if cache_key not in self._cache and cache_key not in self._prepared:
+      self._prepared[cache_key] = self._load_processed_image(png_path, size, scale)
+
+  def _get_recolor_rules(self, theme: str) -> list:
+    if self._recolor_rules is None:
+      from imaging import compile_rules
+
+      self._recolor_rules = {name: compile_rules(rules) for name, rules in THEME_RECOLOR_RULES.items()}
+    return self._recolor_rules.get(theme, [])
+
+  def _load_processed_image(self, png_path: Path, size: tuple, scale: int = 1) -> Image.Image:
+    from PIL import Image
+
+    atlas = self.atlas
+    if atlas is not None and png_path.parent == ASSETS_DIR:
+      sprite = atlas.sprite(png_path.name, size, self.theme_manager.current_theme, scale)
+      if sprite is not None:
+        return sprite
+    # Without an atlas sprite at this scale, resize the PNG to the display's pixel size.
+    size = (size[0] * scale, size[1] * scale)
+
+    disk_cache = self.disk_cache
+    disk_key = None
+    if disk_cache is not None:
+      theme = self.theme_manager.current_theme
+      try:
+        disk_key = disk_cache.key_for(png_path, size, theme, self._get_recolor_rules(theme))
+      except OSError:
+        disk_key = None
+      cached = disk_cache.get(disk_key) if disk_key else None
+      if cached is not None:
+        return cached
 
     img = Image.open(png_path).convert("RGBA")
     img = self._make_square(img)
     img = self._apply_theme_colors(img)
     img = img.resize(size, Image.Resampling.LANCZOS)
-    photo_image = ImageTk.PhotoImage(img)
-    self._cache[cache_key] = photo_image
-    return photo_image
+    if disk_key:
+      disk_cache.put(disk_key, img)  # type: ignore[union-attr]
+    return img
 
   def _make_square(self, img: Image.Image) -> Image.Image:
+    from PIL import Image
+
     x, y = img.size
     if x != y:
       max_side = max(x, y)
@@ -103,139 +305,165 @@ class ImageManager:
     return img
 
   def _apply_theme_colors(self, img: Image.Image) -> Image.Image:
-    if self.theme_manager.current_theme == "dark":
+    rules = self._get_recolor_rules(self.theme_manager.current_theme)
+    if rules:
+      from imaging import recolor
+
       try:
-        data = img.getdata()
-        new_data = []
-        for item in data:
-          if item[0] < 10 and item[1] < 10 and item[2] < 10:  # convert black pixels to white
-            new_data.append((255, 255, 255, item[3]))
-          else:
-            new_data.append(item)
-        img.putdata(new_data)
+        return recolor(img, rules)
       except Exception:
         pass
     return img
 
 
 class KeyboardManager:
-  def __init__(self, unlock_sequence: List[str]):
-    self.unlock_sequence = self._parse_unlock_sequence(unlock_sequence)
-    self.pressed_keys: Set[Union[Key, KeyCode]] = set()
-    self.key_sequence: List[Union[Key, KeyCode]] = []
-    self.keyboard_listener: Optional[keyboard.Listener] = None
+  def __init__(
+    self,
+    unlock_chords: List[UnlockChord],
+    latency_probe: Optional[LockLatencyProbe] = None,
+    backend: Optional[InputBackend] = None,
+  ):
+    self.backend = backend or PynputBackend()
+    self.matcher = UnlockMatcher(unlock_chords)
+    self.latency_probe = latency_probe or LockLatencyProbe()
+    self._char_ids: Dict[str, int] = {}
+    self._name_ids: Dict[str, int] = {}
+    self._keys_resolved = False
+    self.keyboard_listener = None
+    self.stats: Optional[InputStats] = None
     self.suppress_input = False
+    # Key presses blocked since the last reset; only the listener thread writes it.
+    self.suppressed_events = 0
     self.unlock_callback = None
 
-  def _parse_unlock_sequence(self, sequence: List[str]) -> List[Union[Key, KeyCode]]:
-    return [self._parse_key(key_str) for key_str in sequence]
-
-  def _parse_key(self, key_str: str) -> Union[Key, KeyCode]:
-    key_str = key_str.lower().strip()
-    if hasattr(keyboard.Key, key_str):
-      return getattr(keyboard.Key, key_str)
-    if len(key_str) == 1:
-      return KeyCode.from_char(key_str)
-    raise ValueError(f"Invalid key identifier: '{key_str}'")
+  def prepare(self):
+    """Loads the input backend and resolves the unlock chord keys; may run off the Tk thread."""
+    if self._keys_resolved:
+      return
 
-  def _normalize_key(self, key: Union[Key, KeyCode]) -> Union[Key, KeyCode]:
-    if isinstance(key, KeyCode) and key.char:
-      return KeyCode.from_char(key.char.lower())
-    return key
+    self.backend.prepare()
+    special_keys = self.backend.special_key_names()
+    aliases = self.backend.key_aliases()
+    for token, key_id in self.matcher.key_ids.items():
+      if len(token) == 1:
+        self._char_ids[token] = key_id
+        self._char_ids[token.upper()] = key_id
+      elif special_keys is None or token in special_keys:
+        self._name_ids[aliases.get(token, token)] = key_id
+      else:
+        raise ValueError(f"Invalid key identifier: '{token}'")
+    self._keys_resolved = True
+
+  def _key_id(self, key: Union[Key, KeyCode]) -> int:
+    # Special keys are Key enum members (with a name), characters are KeyCodes (with a char).
+    char = getattr(key, "char", None)
+    if char is not None:
+      return self._char_ids.get(char, OTHER_KEY)
+    return self._name_ids.get(getattr(key, "name", None), OTHER_KEY)  # type: ignore[arg-type]
 
   def start_listening(self, unlock_callback):
+    self.prepare()
+    self.unlock_callback = unlock_callback
     if self.keyboard_listener is None:
-      self.unlock_callback = unlock_callback
-      self.keyboard_listener = keyboard.Listener(
-        on_press=self._handle_key_press,  # type: ignore
-        on_release=self._on_key_release,  # type: ignore
-        suppress=self.suppress_input,
-      )
+      self.keyboard_listener = self.backend.create_keyboard_listener(self._handle_key_press, self._handle_key_release)
       self.keyboard_listener.start()
+      self.keyboard_listener.set_suppressed(self.suppress_input)
 
   def stop_listening(self):
     if self.keyboard_listener:
       self.keyboard_listener.stop()
       self.keyboard_listener = None
-    self.pressed_keys.clear()
-    self.key_sequence.clear()
+    self.matcher.reset()
     self.suppress_input = False
     self.unlock_callback = None
 
   def enable_suppression(self):
     self.suppress_input = True
     if self.keyboard_listener:
-      # Store the current callback before stopping
-      current_callback = self.unlock_callback
-      self.stop_listening()
-      self.unlock_callback = current_callback
-      self.keyboard_listener = keyboard.Listener(
-        on_press=self._handle_key_press,  # type: ignore
-        on_release=self._on_key_release,  # type: ignore
-        suppress=True,
-      )
-      self.keyboard_listener.start()
+      self.keyboard_listener.set_suppressed(True)
 
   def disable_suppression(self):
     self.suppress_input = False
+    if self.keyboard_listener:
+      self.keyboard_listener.set_suppressed(False)
 
   def _handle_key_press(self, key: Optional[Union[Key, KeyCode]]):
-    return self._on_key_press(key, self.unlock_callback)
+    stats = self.stats
+    if stats is None:
+      self._on_key_press(key, self.unlock_callback)
+    else:
+      start = time.perf_counter_ns()
+      self._on_key_press(key, self.unlock_callback)
+      stats.record(PRESS, start, self.suppress_input)
+
+  def _handle_key_release(self, key: Optional[Union[Key, KeyCode]]):
+    stats = self.stats
+    if stats is None:
+      self._on_key_release(key)
+    else:
+      start = time.perf_counter_ns()
+      self._on_key_release(key)
+      stats.record(RELEASE, start, self.suppress_input)
 
+  # Callbacks never return False: pynput would stop the long-lived listener. Blocking is done
+  # by the listener's suppression state instead.
   def _on_key_press(self, key: Optional[Union[Key, KeyCode]], unlock_callback):
+    if self.suppress_input:
+      self.suppressed_events += 1
+      if self.latency_probe.pending:
+        self.latency_probe.event_suppressed()
     if not key:
-      if self.suppress_input:
-        return False
       return
 
-    normalized_key = self._normalize_key(key)
-    self.pressed_keys.add(normalized_key)
-
-    if normalized_key not in self.key_sequence:
-      self.key_sequence.append(normalized_key)
-
-    if self._check_unlock_sequence() and unlock_callback:
+    if self.matcher.press(self._key_id(key)) and unlock_callback:
       unlock_callback()
 
-    # If suppression is enabled, block all keys except our unlock sequence
-    if self.suppress_input:
-      return False
-
   def _on_key_release(self, key: Optional[Union[Key, KeyCode]]):
-    if not key:
-      if self.suppress_input:
-        return False
-      return
-
-    normalized = self._normalize_key(key)
-    self.pressed_keys.discard(normalized)
-    self.key_sequence.clear()
-    
-    if self.suppress_input:
-      return False
-
-  def _check_unlock_sequence(self) -> bool:
-    if len(self.pressed_keys) < len(self.unlock_sequence):
-      return False
-
-    recent_sequence = self.key_sequence[-len(self.unlock_sequence) :]
-    return set(recent_sequence) == set(self.unlock_sequence) and recent_sequence == self.unlock_sequence
+    if key:
+      self.matcher.release()
 
 
 class MouseManager:
-  def __init__(self):
-    self.mouse_listener: Optional[mouse.Listener] = None
+  def __init__(self, latency_probe: Optional[LockLatencyProbe] = None, backend: Optional[InputBackend] = None, suppression_mode: str = "grab"):
+    if suppression_mode not in MOUSE_SUPPRESSION_MODES:
+      raise ValueError(f"Unknown mouse suppression mode: '{suppression_mode}'")
+    self.backend = backend or PynputBackend()
+    self.suppression_mode = suppression_mode
+    self.mouse_listener = None
+    self.latency_probe = latency_probe or LockLatencyProbe()
+    self.stats: Optional[InputStats] = None
     self.suppress_input = False
+    self.suppressed_events = 0
+    # A grab blocks the pointer without reporting events, so there is nothing to count.
+    self.counts_events = False
+
+  def prepare(self):
+    self.backend.prepare()
 
   def start_listening(self):
     if self.mouse_listener is None:
-      self.mouse_listener = mouse.Listener(
-        on_click=self._on_mouse_click,
-        on_scroll=self._on_mouse_scroll,
-        on_move=self._on_mouse_move,
-        suppress=False,
-      )
+      self.counts_events = False
+      # Unlock is keyboard-only, so a blocker that never reports events is enough for the mouse,
+      # unless the stats need to see those events.
+      blocker = self.backend.create_pointer_blocker() if self.suppression_mode == "grab" and self.stats is None else None
+      self.mouse_listener = blocker or self._create_listener()
+      self.mouse_listener.start()
+      self._apply_suppression()
+
+  def _create_listener(self):
+    self.counts_events = True
+    return self.backend.create_mouse_listener(self._on_mouse_move, self._on_mouse_click, self._on_mouse_scroll)
+
+  def _apply_suppression(self):
+    try:
+      self.mouse_listener.set_suppressed(self.suppress_input)
+    except PointerGrabError as e:
+      # Another client holds the pointer; a listener can still suppress events one by one.
+      print(f"{e}; falling back to the mouse listener", file=sys.stderr)
+      self.mouse_listener.stop()
+      self.mouse_listener = self._create_listener()
       self.mouse_listener.start()
+      self.mouse_listener.set_suppressed(self.suppress_input)
 
   def stop_listening(self):
     if self.mouse_listener:
@@ -246,38 +474,53 @@ class MouseManager:
   def enable_suppression(self):
     self.suppress_input = True
     if self.mouse_listener:
-      self.stop_listening()
-      self.mouse_listener = mouse.Listener(
-        on_click=self._on_mouse_click,
-        on_scroll=self._on_mouse_scroll,
-        on_move=self._on_mouse_move,
-        suppress=True,
-      )
-      self.mouse_listener.start()
+      self._apply_suppression()
 
   def disable_suppression(self):
     self.suppress_input = False
+    if self.mouse_listener:
+      self.mouse_listener.set_suppressed(False)
 
-  def _on_mouse_click(self, x, y, button, pressed):
+  def _on_mouse_event(self):
     if self.suppress_input:
-      return False
-    return True
+      self.suppressed_events += 1
+      if self.latency_probe.pending:
+        self.latency_probe.event_suppressed()
+
+  def _on_measured_mouse_event(self, stats: InputStats, event_type: int):
+    start = time.perf_counter_ns()
+    self._on_mouse_event()
+    stats.record(event_type, start, self.suppress_input)
+
+  def _on_mouse_click(self, x, y, button, pressed):
+    if self.stats is None:
+      self._on_mouse_event()
+    else:
+      self._on_measured_mouse_event(self.stats, CLICK)
 
   def _on_mouse_scroll(self, x, y, dx, dy):
-    if self.suppress_input:
-      return False
-    return True
+    if self.stats is None:
+      self._on_mouse_event()
+    else:
+      self._on_measured_mouse_event(self.stats, SCROLL)
 
   def _on_mouse_move(self, x, y):
-    if self.suppress_input:
-      return False
-    return True
+    if self.stats is None:
+      self._on_mouse_event()
+    else:
+      self._on_measured_mouse_event(self.stats, MOVE)
 
 
 class InputManager:
-  def __init__(self, unlock_sequence: List[str]):
-    self.keyboard_manager = KeyboardManager(unlock_sequence)
-    self.mouse_manager = MouseManager()
+  def __init__(self, unlock_chords: List[UnlockChord], backend: Optional[InputBackend] = None, mouse_suppression: str = "grab"):
+    self.backend = backend or PynputBackend()
+    self.latency_probe = LockLatencyProbe()
+    self.keyboard_manager = KeyboardManager(unlock_chords, self.latency_probe, self.backend)
+    self.mouse_manager = MouseManager(self.latency_probe, self.backend, mouse_suppression)
+
+  def prepare(self):
+    self.keyboard_manager.prepare()
+    self.mouse_manager.prepare()
 
   def start_listening(self, unlock_callback):
     self.keyboard_manager.start_listening(unlock_callback)
@@ -287,14 +530,45 @@ class InputManager:
     self.keyboard_manager.stop_listening()
     self.mouse_manager.stop_listening()
 
-  def enable_input_suppression(self):
+  def enable_input_suppression(self, requested_at: Optional[float] = None):
+    self.latency_probe.arm(requested_at)
     self.mouse_manager.enable_suppression()
     self.keyboard_manager.enable_suppression()
+    self.latency_probe.suppression_enabled()
 
   def disable_input_suppression(self):
     self.mouse_manager.disable_suppression()
     self.keyboard_manager.disable_suppression()
 
+  def enable_stats(self) -> InputStats:
+    """Turns on per-event counters and latency histograms; call it before start_listening()."""
+    stats = self.keyboard_manager.stats or InputStats()
+    self.keyboard_manager.stats = stats
+    self.mouse_manager.stats = stats
+    return stats
+
+  def disable_stats(self):
+    self.keyboard_manager.stats = None
+    self.mouse_manager.stats = None
+
+  def reset_stats(self):
+    self.keyboard_manager.suppressed_events = self.mouse_manager.suppressed_events = 0
+    if self.keyboard_manager.stats is not None:
+      self.keyboard_manager.stats.reset()
+
+  def suppressed_counts(self) -> Tuple[int, Optional[int]]:
+    """Key presses and pointer events blocked since the last reset; None where a grab hides them."""
+    mouse = self.mouse_manager
+    return self.keyboard_manager.suppressed_events, mouse.suppressed_events if mouse.counts_events else None
+
+  def unmeasured_event_types(self) -> Tuple[int, ...]:
+    """Event types no callback sees, e.g. pointer events while a grab blocks them."""
+    return () if self.mouse_manager.counts_events else (MOVE, CLICK, SCROLL)
+
+  def stats_summary(self) -> Optional[Dict[str, Any]]:
+    stats = self.keyboard_manager.stats
+    return None if stats is None else stats.summary(self.unmeasured_event_types())
+
 
 class CustomButton(tk.Button):
   def __init__(self, master, *args, hover_color: Optional[str] = None, **kwargs):
@@ -313,6 +587,18 @@ class CustomButton(tk.Button):
     self.bind("<Enter>", self._on_enter)
     self.bind("<Leave>", self._on_leave)
 
+  def configure(self, cnf=None, **kwargs):
+    # Colors set here (e.g. by a theme switch) become the resting and hover colors; the hover
+    # handlers themselves go through item assignment, which leaves them alone.
+    if "hover_color" in kwargs:
+      self.hover_color = kwargs.pop("hover_color")
+    result = super().configure(cnf, **kwargs)
+    if "bg" in kwargs:
+      self.default_bg = kwargs["bg"]
+    return result
+
+  config = configure
+
   def _on_enter(self, event: tk.Event):
     if self["state"] != tk.DISABLED and self.hover_color:
       self["bg"] = self.hover_color
@@ -325,122 +611,344 @@ class CustomButton(tk.Button):
 class LockOverlay:
   def __init__(
     self,
-    parent: tk.Tk,
-    theme_manager: ThemeManager,
+    parent: tk.Misc,
+    styles: StyleRegistry,
     localization: LocalizationManager,
-    image_manager: ImageManager,
     unlock_combo: str,
+    max_fps: float = DEFAULT_MAX_FPS,
+    alpha: float = 1.0,
   ):
     self.parent = parent
-    self.theme_manager = theme_manager
+    self.styles = styles
     self.localization = localization
-    self.image_manager = image_manager
     self.unlock_combo = unlock_combo
+    self.max_fps = max_fps
+    self.alpha = alpha
     self.window: Optional[tk.Toplevel] = None
-    self.timer_label: Optional[tk.Label] = None
+    self.message_label: Optional[tk.Label] = None
+    self.ring: Optional[ProgressRing] = None
     self.countdown_seconds = 0
-    self.clean_image_ref: Optional[ImageTk.PhotoImage] = None
 
-  def create(self, countdown_seconds: int):
-    self.countdown_seconds = countdown_seconds
+  def create(self, countdown_seconds: int, remaining: Callable[[], float]):
+    self.build()
+    self.show(countdown_seconds, remaining)
+
+  def build(self):
+    """Builds the overlay window hidden so that show() only has to update texts and map it."""
     self.window = tk.Toplevel(self.parent)
+    self.window.withdraw()
     self._setup_window()
     self._create_widgets()
-    self._start_timer_updates()
+
+  def show(self, countdown_seconds: int, remaining: Callable[[], float]):
+    """Maps the overlay and animates the ring from ``remaining()`` seconds out of ``countdown_seconds``."""
+    assert self.window is not None and self.ring is not None
+    self.countdown_seconds = countdown_seconds
+    detailed_message = self.localization.format("locked_detailed_message", minutes=countdown_seconds // 60, combo=self.unlock_combo)
+    if self.message_label and self.message_label["text"] != detailed_message:
+      self.message_label.config(text=detailed_message)
+    self.ring.start(remaining, countdown_seconds)
+    self.window.deiconify()
+    # Window managers may drop these while the window is withdrawn, so re-assert them on every show.
+    self.window.attributes("-fullscreen", True)
+    self.window.attributes("-topmost", True)
+    self.window.lift()
+
+  def hide(self):
+    if self.ring:
+      self.ring.stop()
+    if self.window:
+      self.window.withdraw()
 
   def _setup_window(self):
     assert self.window is not None
     self.window.attributes("-fullscreen", True)
-    self.window.attributes("-alpha", 0.95)
+    if self.alpha < 1.0:
+      self.window.attributes("-alpha", self.alpha)
     self.window.attributes("-topmost", True)
-    self.window.configure(bg=self.theme_manager.get_color("overlay_bg"))
+    self.styles.style(self.window, bg="overlay_bg")
     self.window.protocol("WM_DELETE_WINDOW", lambda: None)
 
   def _create_widgets(self):
-    overlay_frame = tk.Frame(self.window, bg=self.theme_manager.get_color("overlay_bg"))
+    styles = self.styles
+    overlay_frame = styles.style(tk.Frame(self.window), bg="overlay_bg")
     overlay_frame.pack(expand=True, fill=tk.BOTH)
 
-    content_frame = tk.Frame(overlay_frame, bg=self.theme_manager.get_color("overlay_bg"))
+    content_frame = styles.style(tk.Frame(overlay_frame), bg="overlay_bg")
     content_frame.place(relx=0.5, rely=0.5, anchor="center")
 
-    detailed_message = self.localization.get_text("locked_detailed_message").format(minutes=self.countdown_seconds // 60, combo=self.unlock_combo)
-    tk.Label(
-      content_frame,
-      text=detailed_message,
-      font=(FONT_FAMILY, 18),
-      fg=self.theme_manager.get_color("text_color"),
-      bg=self.theme_manager.get_color("overlay_bg"),
-      justify=tk.CENTER,
-      wraplength=800,
-    ).pack(pady=(0, 30))
-
-    self.clean_image_ref = self.image_manager.load_png_image(ASSETS_DIR / "step-clean.png", (120, 120))
-    img_label = tk.Label(
-      content_frame,
-      image=self.clean_image_ref,  # type: ignore
-      bg=self.theme_manager.get_color("overlay_bg"),
-    )
-    img_label.pack(pady=(0, 30))
+    self.message_label = tk.Label(content_frame, font=(FONT_FAMILY, 18), justify=tk.CENTER, wraplength=800)
+    styles.style(self.message_label, fg="text_color", bg="overlay_bg")
+    self.message_label.pack(pady=(0, 30))
 
-    self.timer_label = tk.Label(
-      content_frame,
-      font=(FONT_FAMILY, 48, "bold"),
-      fg=self.theme_manager.get_color("text_color"),
-      bg=self.theme_manager.get_color("overlay_bg"),
-    )
-    self.timer_label.pack()
-
-  def _start_timer_updates(self):
-    self._update_timer_display()
-
-  def _update_timer_display(self):
-    if self.window and self.window.winfo_exists() and self.timer_label and self.countdown_seconds >= 0:
-      mins, secs = divmod(self.countdown_seconds, 60)
-      self.timer_label.config(text=f"{mins:02d}:{secs:02d}")
-
-      if self.countdown_seconds > 0:
-        self.window.after(1000, self._update_timer_display)
+    img_label = styles.style(tk.Label(content_frame), bg="overlay_bg")
+    asset, size = UI_IMAGES["overlay"]
+    styles.style_image(img_label, ASSETS_DIR / asset, size)
+    img_label.pack(pady=(0, 30))
 
-  def update_countdown(self, seconds: int):
-    self.countdown_seconds = seconds
+    canvas = styles.style(tk.Canvas(content_frame, width=RING_DIAMETER, height=RING_DIAMETER, highlightthickness=0), bg="overlay_bg")
+    self.ring = ProgressRing(canvas, styles, RING_DIAMETER, font=(FONT_FAMILY, 36, "bold"), max_fps=self.max_fps)
+    canvas.pack()
 
   def destroy(self):
+    if self.ring:
+      self.ring.stop()
+      self.ring = None
     if self.window:
+      self.styles.forget(self.window)
       self.window.destroy()
       self.window = None
 
 
-class CleanLockApp:
-  def __init__(self, root: tk.Tk):
-    self.root = root
-    self.config = AppConfig()
+class OverlayPool:
+  """Keeps one pre-built, hidden LockOverlay and rebuilds it only when its signature changes or after invalidate()."""
+
+  def __init__(self, factory: Callable[[], LockOverlay], signature: Callable[[], tuple]):
+    self.factory = factory
+    self.signature = signature
+    self._overlay: Optional[LockOverlay] = None
+    self._overlay_signature: Optional[tuple] = None
+
+  def prewarm(self):
+    if self._overlay is None or self._overlay_signature != self.signature():
+      self.invalidate()
+      self._overlay_signature = self.signature()
+      self._overlay = self.factory()
+      self._overlay.build()
+
+  def acquire(self) -> Tuple[LockOverlay, bool]:
+    """Returns the pooled overlay and whether it was already built (a warm acquire)."""
+    warm = self._overlay is not None and self._overlay_signature == self.signature()
+    self.prewarm()
+    return self._overlay, warm  # type: ignore[return-value]
+
+  def release(self, overlay: LockOverlay):
+    if overlay is self._overlay:
+      overlay.hide()
+    else:
+      overlay.destroy()
+
+  def invalidate(self):
+    if self._overlay is not None:
+      self._overlay.destroy()
+    self._overlay = None
+    self._overlay_signature = None
+
+
+class AppServices:
+  """State shared by every window on the Tk thread: event bus, loop pump, theme, styles, translations and image caches."""
+
+  def __init__(self, root: tk.Misc, config: AppConfig, trace: Optional[StartupTrace] = None):
+    with (trace or StartupTrace()).phase("theme detection"):
+      self.theme_manager = ThemeManager()
+    self.localization = LocalizationManager(config.language)
+    self.image_manager = ImageManager(self.theme_manager, user_cache_dir(), ATLAS_DIR)
+    # Widgets take their colors and themed images through here, so a theme switch restyles in place.
+    self.styles = StyleRegistry(self.theme_manager, self.image_manager)
+    # Every hop from a listener, worker or IPC thread onto the Tk thread goes through here.
+    self.event_bus = EventBus(root.after)
+    self._root = root
+    self._tk_thread = threading.get_ident()
+    self._pump: Optional[TkLoopPump] = None
+    self._pump_lock = threading.Lock()
+    self.theme_watcher = ThemeWatcher(lambda theme: self.event_bus.post(self.set_theme, theme)) if config.follow_system_theme else None
+    # Top-level windows whose title bars follow the theme.
+    self.windows: List[tk.Misc] = []
+    # One writer for all seats, so their sessions land in the same files.
+    self.journal = SessionJournal(config.journal_dir) if config.journal_dir is not None else None
+
+  @property
+  def pump(self) -> TkLoopPump:
+    """The shared loop's pump; asyncio is first imported here, so the window paints without it."""
+    with self._pump_lock:
+      if self._pump is None:
+        import asyncio
+
+        from core import TkLoopPump
+
+        self._pump = TkLoopPump(asyncio.new_event_loop(), self._root.after, self._root.after_cancel)
+      return self._pump
+
+  def wake(self, when: Optional[float] = None):
+    """LockCore's wake hook: tells the pump about queued callbacks or a new timer, from any thread."""
+    pump = self._pump or self.pump
+    if threading.get_ident() == self._tk_thread:
+      pump.request(when)
+    else:
+      self.event_bus.post(pump.request, when)
+
+  def set_theme(self, theme: str):
+    """Restyles every window and pooled overlay for ``theme`` without rebuilding them."""
+    if theme == self.theme_manager.current_theme:
+      return
+    self.styles.set_theme(theme)
+    self.theme_manager.apply_system_theme()
+    for window in self.windows:
+      self.theme_manager.apply_titlebar_theme(window)
 
-    self.theme_manager = ThemeManager()
-    self.localization = LocalizationManager(self.config.language)
-    self.image_manager = ImageManager(self.theme_manager)
-    self.input_manager = InputManager(self.config.unlock_sequence)
+  def close(self):
+    if self._pump is not None:
+      self._pump.close()
+    if self.journal is not None:
+      self.journal.close()
 
-    self.is_locked = False
+
+class CleanLockApp:
+  def __init__(
+    self,
+    root: tk.Misc,
+    trace: Optional[StartupTrace] = None,
+    show_lock_metrics: bool = False,
+    config: Optional[AppConfig] = None,
+    stats_dir: Optional[Path] = None,
+    daemon_address: Optional[str] = None,
+    profiler: Optional[PhaseProfiler] = None,
+    services: Optional[AppServices] = None,
+    display: Optional[str] = None,
+  ):
+    """``root`` is the Tk root, or a Toplevel on another display for a seat, which also passes the shared ``services``."""
+    self.root = root
+    self.display = display
+    self.trace = trace or StartupTrace()
+    self.show_lock_metrics = show_lock_metrics
+    self.stats_dir = stats_dir
+    self.config = config or AppConfig()
+    # A resident app keeps its window hidden and takes lock requests over IPC instead.
+    self.daemon_address = daemon_address
+    self.ipc_server: Optional[IpcServer] = None
+    self.scheduler: Optional[LockScheduler] = None
+    # Set while the current lock was started by the scheduler, which may then also end it.
+    self._scheduled_lock = False
+
+    self.services = services or AppServices(root, self.config, self.trace)
+    self.services.windows.append(root)
+    self.theme_manager = self.services.theme_manager
+    self.localization = self.services.localization
+    self.image_manager = self.services.image_manager
+    self.styles = self.services.styles
+    self.event_bus = self.services.event_bus
+    self.input_manager = InputManager(self.config.unlock_chords(), create_backend(self.config.input_backend, display), self.config.mouse_suppression)
+    if self.stats_dir is not None:
+      self.input_manager.enable_stats()
+
+    # The core owns lock state and the countdown; this class only renders it. The background
+    # stage builds it, so asyncio is not imported before the first paint.
+    self.core: Optional[LockCore] = None
+    self.profiler = profiler
+
+    self.input_ready = False
     self.countdown_seconds = 0
-    self.timer_thread: Optional[threading.Thread] = None
     self.overlay: Optional[LockOverlay] = None
+    self.overlay_pool = OverlayPool(self._new_lock_overlay, self._overlay_signature)
+    self.overlay_metrics: Dict[str, Any] = {}
+    # Read on the Tk thread, so the background stage preloads the overlay image at the size it is shown.
+    self.image_scale = pixel_scale(root)
 
     self.widgets: Dict[str, Any] = {}
 
     self._initialize_app()
 
   def _initialize_app(self):
+    ui_start = time.perf_counter()
     self.theme_manager.apply_system_theme()
     self._setup_main_window()
     self._create_ui()
     self._update_ui_texts()
+    if self.daemon_address is not None:
+      self.root.withdraw()
+    self.trace.record("build ui", ui_start)
+    # Idle callbacks run in order, so this fires after the widgets above have drawn themselves.
+    self.root.after_idle(self._on_first_paint, time.perf_counter())
+
+  def _on_first_paint(self, pending_since: float):
+    self.trace.record("first paint", pending_since)
+    self._start_background_stage()
+    if self.services.theme_watcher is not None:
+      self.services.theme_watcher.start()
+
+  def _start_background_stage(self):
+    threading.Thread(target=self._background_stage_worker, daemon=True).start()
+
+  def _background_stage_worker(self):
+    error: Optional[Exception] = None
+    try:
+      if self.core is None:
+        with self.trace.phase("lock core"):
+          self.core = self._create_core()
+      with self.trace.phase("input backend"):
+        self.input_manager.prepare()
+        # Listeners stay up for the app's lifetime; locking only flips their suppression.
+        self.input_manager.start_listening(self.core.unlock_threadsafe)
+      with self.trace.phase("overlay assets"):
+        asset, size = UI_IMAGES["overlay"]
+        self.image_manager.preload(ASSETS_DIR / asset, size, self.image_scale)
+    except Exception as e:
+      error = e
+    self.event_bus.post(self._on_background_ready, error)
+
+  def _create_core(self) -> LockCore:
+    from core import LockCore
+
+    core = LockCore(
+      self.input_manager,
+      self.config.lock_duration_seconds,
+      loop=self.services.pump.loop,
+      wake=self.services.wake,
+      stall_timeout=self.config.stall_timeout_seconds,
+    )
+    core.on_lock = self._on_locked
+    core.on_tick = self._on_countdown_tick
+    core.on_unlock = self._on_unlocked
+    core.profiler = self.profiler
+    core.journal = self.services.journal
+    return core
+
+  def _on_background_ready(self, error: Optional[Exception]):
+    if error is not None:
+      self._on_background_failed(error)
+      return
+
+    self.input_ready = True
+    if not self.is_locked:
+      self.widgets["lock_button"].config(state=tk.NORMAL)
+      self.root.after_idle(self.overlay_pool.prewarm)
+    if self.config.lock_schedule and self.scheduler is None:
+      self.scheduler = LockScheduler(self.config.lock_schedule, self._start_scheduled_lock, self._end_scheduled_lock, self.event_bus.post)
+      self.scheduler.start()
+    if self.daemon_address is not None:
+      from ipc import IpcServer
+
+      # Listen only once locking can engage immediately, so a reachable socket means ready.
+      self.ipc_server = IpcServer(self.core, self.daemon_address, self.core.dispatch)
+      self.ipc_server.start()
+    self._finish_startup("ready")
+
+  def _on_background_failed(self, error: Exception):
+    self._finish_startup("input backend failed")
+    # The lock button becomes a retry: the backend may only be waiting for a permission or a device.
+    self.widgets["lock_button"].config(text=self.localization.get_text("retry_input_button"), command=self._retry_background_stage, state=tk.NORMAL)
+    messagebox.showerror(
+      self.localization.get_text("app_title"),
+      self.localization.format("input_backend_error", error=error),
+      parent=self.root,
+    )
+
+  def _retry_background_stage(self):
+    self.widgets["lock_button"].config(text=self.localization.get_text("lock_button"), command=self._start_locking_process, state=tk.DISABLED)
+    self._start_background_stage()
+
+  def _finish_startup(self, outcome: str):
+    self.trace.mark(outcome)
+    self.trace.report()
+    if self.profiler is not None and self.profiler.active_phase == "startup":
+      self.profiler.stop()
 
   def _setup_main_window(self):
     self.root.geometry("800x550")
     self.root.resizable(False, False)
     self.root.overrideredirect(True)
     self.root.protocol("WM_DELETE_WINDOW", self._on_closing)
-    self.root.configure(bg=self.theme_manager.get_color("background"))
+    self.styles.style(self.root, bg="background")
     self._center_window()
 
   def _center_window(self):
@@ -452,144 +960,90 @@ class CleanLockApp:
     self.root.geometry(f"{width}x{height}+{x}+{y}")
 
   def _create_ui(self):
-    main_frame = tk.Frame(self.root, bg=self.theme_manager.get_color("background"), padx=40, pady=20)
+    main_frame = self.styles.style(tk.Frame(self.root, padx=40, pady=20), bg="background")
     main_frame.pack(expand=True, fill=tk.BOTH)
 
     self._create_header(main_frame)
-    self._create_steps_section(main_frame)
+    with self.trace.phase("asset load"):
+      self._create_steps_section(main_frame)
     self._create_buttons(main_frame)
 
   def _create_header(self, parent):
-    self.widgets["icon"] = tk.Label(
-      parent,
-      text="🧼",
-      font=("Segoe UI Emoji", 48),
-      fg=self.theme_manager.get_color("text_color"),
-      bg=self.theme_manager.get_color("background"),
-    )
+    styles = self.styles
+    self.widgets["icon"] = tk.Label(parent, text="🧼", font=("Segoe UI Emoji", 48))
+    styles.style(self.widgets["icon"], fg="text_color", bg="background")
     self.widgets["icon"].pack(pady=(10, 0))
 
-    self.widgets["title"] = tk.Label(
-      parent,
-      font=(FONT_FAMILY, 24, "bold"),
-      fg=self.theme_manager.get_color("text_color"),
-      bg=self.theme_manager.get_color("background"),
-    )
+    self.widgets["title"] = tk.Label(parent, font=(FONT_FAMILY, 24, "bold"))
+    styles.style(self.widgets["title"], fg="text_color", bg="background")
     self.widgets["title"].pack(pady=(5, 10))
 
-    self.widgets["description"] = tk.Label(
-      parent,
-      justify=tk.CENTER,
-      font=(FONT_FAMILY, 11),
-      fg=self.theme_manager.get_color("text_muted"),
-      bg=self.theme_manager.get_color("background"),
-      wraplength=700,
-    )
+    self.widgets["description"] = tk.Label(parent, justify=tk.CENTER, font=(FONT_FAMILY, 11), wraplength=700)
+    styles.style(self.widgets["description"], fg="text_muted", bg="background")
     self.widgets["description"].pack(pady=(10, 30))
 
   def _create_steps_section(self, parent):
-    steps_container = tk.Frame(parent, bg=self.theme_manager.get_color("background"))
+    steps_container = self.styles.style(tk.Frame(parent), bg="background")
     steps_container.pack(pady=(5, 5), fill=tk.X, expand=False)
 
-    images = {
-      "step-lock": self.image_manager.load_png_image(ASSETS_DIR / "step-lock.png", (120, 100)),
-      "step-clean": self.image_manager.load_png_image(ASSETS_DIR / "step-clean.png", (120, 100)),
-      "step-done": self.image_manager.load_png_image(ASSETS_DIR / "step-done.png", (120, 100)),
-      "separator-right": self.image_manager.load_png_image(ASSETS_DIR / "separator-right.png", (40, 40)),
-      "separator-left": self.image_manager.load_png_image(ASSETS_DIR / "separator-left.png", (40, 40)),
-    }
-
-    self._create_step_column(steps_container, "lock", images["step-lock"])
-    self._create_arrow_separator(steps_container, images["separator-right"])
-    self._create_step_column(steps_container, "clean", images["step-clean"])
-    self._create_arrow_separator(steps_container, images["separator-left"])
-    self._create_step_column(steps_container, "done", images["step-done"], show_unlock_info=True)
+    self._create_step_column(steps_container, "lock")
+    self._create_arrow_separator(steps_container, "arrow_right")
+    self._create_step_column(steps_container, "clean")
+    self._create_arrow_separator(steps_container, "arrow_left")
+    self._create_step_column(steps_container, "done", show_unlock_info=True)
 
   def _create_step_column(
     self,
     parent,
     step_name: str,
-    image: ImageTk.PhotoImage,
     show_unlock_info: bool = False,
   ):
-    column = tk.Frame(parent, bg=self.theme_manager.get_color("background"))
+    styles = self.styles
+    column = styles.style(tk.Frame(parent), bg="background")
 
-    self.widgets[f"{step_name}_step"] = tk.Label(
-      column,
-      font=(FONT_FAMILY, 14, "bold"),
-      fg=self.theme_manager.get_color("text_color"),
-      bg=self.theme_manager.get_color("background"),
-    )
+    self.widgets[f"{step_name}_step"] = tk.Label(column, font=(FONT_FAMILY, 14, "bold"))
+    styles.style(self.widgets[f"{step_name}_step"], fg="text_color", bg="background")
     self.widgets[f"{step_name}_step"].pack(pady=(0, 4))
 
-    img_label = tk.Label(column, image=image, bg=self.theme_manager.get_color("background"))  # type: ignore
-    img_label.image = image  # type: ignore
+    img_label = styles.style(tk.Label(column), bg="background")
+    asset, size = UI_IMAGES[f"step_{step_name}"]
+    styles.style_image(img_label, ASSETS_DIR / asset, size)
     img_label.pack()
 
     if show_unlock_info:
-      self.widgets["unlock_info"] = tk.Label(
-        column,
-        font=(FONT_FAMILY, 8),
-        justify=tk.CENTER,
-        fg=self.theme_manager.get_color("text_muted"),
-        bg=self.theme_manager.get_color("background"),
-      )
+      self.widgets["unlock_info"] = tk.Label(column, font=(FONT_FAMILY, 8), justify=tk.CENTER)
+      styles.style(self.widgets["unlock_info"], fg="text_muted", bg="background")
       self.widgets["unlock_info"].pack(pady=(4, 0))
     else:
-      tk.Label(
-        column,
-        text="",
-        font=(FONT_FAMILY, 8),
-        height=2,
-        bg=self.theme_manager.get_color("background"),
-      ).pack(pady=(4, 0))
+      styles.style(tk.Label(column, text="", font=(FONT_FAMILY, 8), height=2), bg="background").pack(pady=(4, 0))
 
     column.pack(side=tk.LEFT, padx=30, expand=True)
 
-  def _create_arrow_separator(self, parent, arrow_image: ImageTk.PhotoImage):
-    arrow_col = tk.Frame(parent, bg=self.theme_manager.get_color("background"))
-    img_label = tk.Label(arrow_col, image=arrow_image, bg=self.theme_manager.get_color("background"))  # type: ignore
-    img_label.image = arrow_image  # type: ignore
+  def _create_arrow_separator(self, parent, image: str):
+    styles = self.styles
+    arrow_col = styles.style(tk.Frame(parent), bg="background")
+    img_label = styles.style(tk.Label(arrow_col), bg="background")
+    asset, size = UI_IMAGES[image]
+    styles.style_image(img_label, ASSETS_DIR / asset, size)
     img_label.pack()
 
-    tk.Label(
-      arrow_col,
-      text="",
-      font=(FONT_FAMILY, 11, "bold"),
-      bg=self.theme_manager.get_color("background"),
-    ).pack()
+    styles.style(tk.Label(arrow_col, text="", font=(FONT_FAMILY, 11, "bold")), bg="background").pack()
     arrow_col.pack(side=tk.LEFT, padx=8)
 
   def _create_timer_separator(self, parent):
-    timer_col = tk.Frame(parent, bg=self.theme_manager.get_color("background"))
-    canvas = tk.Canvas(
-      timer_col,
-      width=40,
-      height=40,
-      bg=self.theme_manager.get_color("background"),
-      highlightthickness=0,
-    )
-    canvas.create_oval(4, 4, 36, 36, outline=self.theme_manager.get_color("text_muted"), width=2)
-    canvas.create_text(
-      20,
-      20,
-      text="🕒",
-      font=("Segoe UI Emoji", 16),
-      fill=self.theme_manager.get_color("text_muted"),
-    )
+    styles = self.styles
+    timer_col = styles.style(tk.Frame(parent), bg="background")
+    canvas = styles.style(tk.Canvas(timer_col, width=40, height=40, highlightthickness=0), bg="background")
+    styles.style_item(canvas, canvas.create_oval(4, 4, 36, 36, width=2), outline="text_muted")
+    styles.style_item(canvas, canvas.create_text(20, 20, text="🕒", font=("Segoe UI Emoji", 16)), fill="text_muted")
     canvas.pack()
 
-    tk.Label(
-      timer_col,
-      text=f"{self.config.lock_duration_seconds // 60} mins",
-      font=(FONT_FAMILY, 11, "bold"),
-      fg=self.theme_manager.get_color("text_color"),
-      bg=self.theme_manager.get_color("background"),
-    ).pack()
+    label = tk.Label(timer_col, text=f"{self.config.lock_duration_seconds // 60} mins", font=(FONT_FAMILY, 11, "bold"))
+    styles.style(label, fg="text_color", bg="background").pack()
     timer_col.pack(side=tk.LEFT, padx=8)
 
   def _create_buttons(self, parent):
-    container = tk.Frame(parent, bg=self.theme_manager.get_color("background"), height=56)
+    container = self.styles.style(tk.Frame(parent, height=56), bg="background")
     container.pack(side=tk.BOTTOM, fill=tk.X, pady=(30, 16))
     container.pack_propagate(False)
 
@@ -604,20 +1058,13 @@ class CleanLockApp:
     self.widgets["lock_button"] = CustomButton(
       container,
       command=self._start_locking_process,
-      bg=self.theme_manager.get_color("button_primary_bg"),
-      fg=self.theme_manager.get_color("button_primary_fg"),
-      hover_color=self.theme_manager.get_color("button_primary_hover"),
+      state=tk.DISABLED,  # enabled once the input backend has loaded
       **style,
     )
+    self.styles.style(self.widgets["lock_button"], bg="button_primary_bg", fg="button_primary_fg", hover_color="button_primary_hover")
 
-    self.widgets["exit_button"] = CustomButton(
-      container,
-      command=self._on_closing,
-      bg=self.theme_manager.get_color("button_secondary_bg"),
-      fg=self.theme_manager.get_color("button_secondary_fg"),
-      hover_color=self.theme_manager.get_color("button_secondary_hover"),
-      **style,
-    )
+    self.widgets["exit_button"] = CustomButton(container, command=self._on_closing, **style)
+    self.styles.style(self.widgets["exit_button"], bg="button_secondary_bg", fg="button_secondary_fg", hover_color="button_secondary_hover")
 
     self.widgets["lock_button"].pack(side=tk.LEFT, expand=True, fill=tk.X, padx=(0, 8))
     self.widgets["exit_button"].pack(side=tk.LEFT, expand=True, fill=tk.X, padx=(8, 0))
@@ -633,84 +1080,142 @@ class CleanLockApp:
     self.widgets["done_step"].config(text=self.localization.get_text("step_done"))
 
     unlock_combo = self._format_unlock_combo()
-    unlock_info_text = self.localization.get_text("unlock_info_format").format(minutes=self.config.lock_duration_seconds // 60, combo=unlock_combo)
+    unlock_info_text = self.localization.format("unlock_info_format", minutes=self.config.lock_duration_seconds // 60, combo=unlock_combo)
     self.widgets["unlock_info"].config(text=unlock_info_text)
 
   def _format_unlock_combo(self) -> str:
     return " + ".join(k.replace("_l", "").replace("_r", "").replace("shift", "Shift").replace("alt", "Alt").title() for k in self.config.unlock_sequence)
 
-  def _start_locking_process(self):
-    if self.is_locked:
+  def set_theme(self, theme: str):
+    self.services.set_theme(theme)
+
+  @property
+  def is_locked(self) -> bool:
+    return self.core is not None and self.core.locked
+
+  def _start_locking_process(self, duration: Optional[float] = None):
+    if self.is_locked or not self.input_ready:
       return
+    self.core.lock(duration)
+
+  def _start_scheduled_lock(self, duration: float):
+    # A window that opens during a lock leaves it alone, and so does its end.
+    if not self.is_locked:
+      self._start_locking_process(duration)
+      self._scheduled_lock = self.is_locked
+
+  def _end_scheduled_lock(self):
+    # The countdown normally gets there first; this catches a deadline stretched by a suspend.
+    if self._scheduled_lock and self.is_locked:
+      from core import UNLOCK_SCHEDULE
 
-    self.is_locked = True
-    self.countdown_seconds = self.config.lock_duration_seconds
+      self.core.unlock(UNLOCK_SCHEDULE)  # type: ignore[union-attr]
 
+  def _on_locked(self, duration: float, requested_at: float):
+    self.countdown_seconds = Countdown.display_seconds(duration)
     self.widgets["lock_button"].config(state=tk.DISABLED)
     self.widgets["exit_button"].config(state=tk.DISABLED)
     self.root.withdraw()
+    self._show_lock_overlay(requested_at)
 
-    self._create_lock_overlay()
-    self._start_input_monitoring()
-    self._start_countdown_timer()
-
-  def _create_lock_overlay(self):
-    self.overlay = LockOverlay(
+  def _new_lock_overlay(self) -> LockOverlay:
+    return LockOverlay(
       self.root,
-      self.theme_manager,
+      self.styles,
       self.localization,
-      self.image_manager,
       self._format_unlock_combo(),
+      self.config.countdown_max_fps,
+      self.config.overlay_alpha,
     )
-    self.overlay.create(self.countdown_seconds)
-
-  def _start_input_monitoring(self):
-    self.input_manager.start_listening(self._unlock_system_callback)
-    self.input_manager.enable_input_suppression()
-
-  def _start_countdown_timer(self):
-    self.timer_thread = threading.Thread(target=self._countdown_worker, daemon=True)
-    self.timer_thread.start()
 
-  def _countdown_worker(self):
-    while self.countdown_seconds > 0 and self.is_locked:
-      time.sleep(1)
-      if self.is_locked:
-        self.countdown_seconds -= 1
-        if self.overlay:
-          self.overlay.update_countdown(self.countdown_seconds)
-
-    if self.is_locked:
-      self.root.after(0, self._unlock_system)
+  def _overlay_signature(self) -> tuple:
+    # The theme is left out: the style registry restyles the pooled overlay in place.
+    return (
+      self.localization.language,
+      self._format_unlock_combo(),
+      self.root.winfo_screenwidth(),
+      self.root.winfo_screenheight(),
+    )
 
-  def _unlock_system_callback(self):
-    self.root.after(0, self._unlock_system)
+  def _show_lock_overlay(self, requested_at: float):
+    self.overlay, warm = self.overlay_pool.acquire()
+    self.overlay.show(self.countdown_seconds, self.core.countdown.remaining)
+    self.overlay.window.update_idletasks()  # type: ignore[union-attr]
+    self.overlay_metrics = {"overlay_visible_ms": (time.perf_counter() - requested_at) * 1000, "overlay_warm": warm}
 
-  def _unlock_system(self):
-    if not self.is_locked:
-      return
+  def _on_countdown_tick(self, remaining: float):
+    # The overlay's ring reads the deadline itself, at its own frame rate.
+    self.countdown_seconds = Countdown.display_seconds(remaining)
 
-    self.is_locked = False
-    self.input_manager.disable_input_suppression()
-    self.input_manager.stop_listening()
+  def _on_unlocked(self):
+    self._scheduled_lock = False
+    if self.overlay and self.overlay.ring:
+      self.overlay.ring.stop()
+      self.overlay_metrics.update({f"ring_{name}": value for name, value in self.overlay.ring.summary().items()})
+    self._report_lock_metrics()
 
     if self.overlay:
-      self.overlay.destroy()
+      self.overlay_pool.release(self.overlay)
       self.overlay = None
 
-    self.root.deiconify()
+    if self.daemon_address is None:
+      self.root.deiconify()
     self.widgets["lock_button"].config(state=tk.NORMAL)
     self.widgets["exit_button"].config(state=tk.NORMAL)
 
+  def _lock_report_name(self) -> str:
+    # Nanoseconds keep quick lock cycles apart, and still sort in time order. Seats share the
+    # stats directory, so their reports also name the display, e.g. "-seat-host_1.0" for host:1.0.
+    seconds, nanoseconds = divmod(time.time_ns(), 1_000_000_000)
+    seat = f"-seat-{re.sub(r'[^0-9A-Za-z.]+', '_', self.display).strip('_')}" if self.display else ""
+    return f"lock-{time.strftime('%Y%m%d-%H%M%S', time.localtime(seconds))}-{nanoseconds:09d}{seat}.json"
+
+  def _report_lock_metrics(self):
+    lag = self.core.lag_monitor.summary()
+    metrics = {
+      **self.input_manager.latency_probe.summary(),
+      **self.overlay_metrics,
+      "loop_lag_p99_ms": lag["p99_ms"],
+      "loop_lag_max_ms": lag["max_ms"],
+      # Set when the stall watchdog had to release input; the watchdog thread itself does not print.
+      "stalled_for_s": self.core.stalled_for,
+      # Without pointer callbacks, the first suppressed event can only have been a key.
+      "pointer_events_measured": self.input_manager.mouse_manager.counts_events,
+    }
+    stats = self.input_manager.keyboard_manager.stats
+    if stats is not None and self.stats_dir is not None:
+      try:
+        stats.write_json(
+          self.stats_dir / self._lock_report_name(),
+          {
+            "lock": metrics,
+            "event_bus": self.event_bus.metrics(),
+            "image_cache": self.image_manager.cache_stats(),
+            "input_delivery": self.input_manager.backend.delivery_summary(),
+          },
+          self.input_manager.unmeasured_event_types(),
+        )
+      except OSError as e:
+        print(f"could not write input stats: {e}", file=sys.stderr)
+    if self.show_lock_metrics:
+      formatted = ", ".join(f"{name}={round(value, 2) if isinstance(value, float) else value}" for name, value in metrics.items())
+      print(f"lock metrics: {formatted}", file=sys.stderr)
+
   def _on_closing(self):
     if self.is_locked:
       messagebox.showwarning(
         self.localization.get_text("warning_locked"),
         self.localization.get_text("warning_locked_message"),
+        parent=self.root,
       )
       return
 
+    if self.ipc_server is not None:
+      self.ipc_server.close()
+    if self.scheduler is not None:
+      self.scheduler.close()
     self.input_manager.stop_listening()
+    self.services.close()
     self.root.destroy()
     sys.exit(0)
 
@@ -718,11 +1223,245 @@ class CleanLockApp:
     self.root.mainloop()
 
 
-def main():
-  root = tk.Tk()
-  app = CleanLockApp(root)
+class SeatApp(CleanLockApp):
+  """A CleanLockApp whose main window is one seat of a SeatController."""
+
+  def __init__(self, controller: SeatController, window: tk.Toplevel, display: str, **kwargs):
+    self.controller = controller
+    super().__init__(window, services=controller.services, display=display, **kwargs)
+
+  def _on_closing(self):
+    if self.is_locked:
+      super()._on_closing()
+      return
+    if self.scheduler is not None:
+      self.scheduler.close()
+    self.input_manager.stop_listening()
+    self.styles.forget(self.root)
+    self.root.destroy()
+    self.controller.seat_closed(self)
+
+
+class SeatController:
+  """Runs one lock app per X display (seat) from one process and Tk interpreter, sharing one AppServices."""
+
+  def __init__(
+    self,
+    root: tk.Tk,
+    displays: List[str],
+    config: Optional[AppConfig] = None,
+    trace: Optional[StartupTrace] = None,
+    show_lock_metrics: bool = False,
+    stats_dir: Optional[Path] = None,
+  ):
+    if not displays:
+      raise ValueError("at least one display is required")
+    if len(set(displays)) != len(displays):
+      raise ValueError("each display can host only one seat")
+    self.root = root
+    self.config = config or AppConfig()
+    self.trace = trace or StartupTrace()
+    root.withdraw()
+    self.services = AppServices(root, self.config, self.trace)
+    self.seats: List[SeatApp] = []
+    for display in displays:
+      window = tk.Toplevel(root, screen=display)
+      seat = SeatApp(self, window, display, trace=self.trace, show_lock_metrics=show_lock_metrics, config=self.config, stats_dir=stats_dir)
+      self.services.theme_manager.apply_titlebar_theme(window)
+      self.seats.append(seat)
+
+  def status(self) -> Dict[str, Dict[str, Any]]:
+    return {seat.display: seat.core.status() for seat in self.seats if seat.core is not None}
+
+  def seat_closed(self, seat: SeatApp):
+    self.seats.remove(seat)
+    self.services.windows.remove(seat.root)
+    if not self.seats:
+      self.services.close()
+      self.root.destroy()
+
+  def run(self):
+    self.root.mainloop()
+
+
+def create_headless_core(config: AppConfig) -> LockCore:
+  """Builds a LockCore with listeners running and no view; drive it with ``core.loop.run_forever()``."""
+  from core import LockCore
+
+  input_manager = InputManager(config.unlock_chords(), create_backend(config.input_backend), config.mouse_suppression)
+  input_manager.prepare()
+  core = LockCore(input_manager, config.lock_duration_seconds, stall_timeout=config.stall_timeout_seconds)
+  input_manager.start_listening(core.unlock_threadsafe)
+  return core
+
+
+def create_headless_scheduler(core: LockCore, schedules: List[ScheduledLock], **options) -> LockScheduler:
+  """Locks ``core`` on ``schedules``; a window's end only ends a lock it started. ``options`` go to LockScheduler."""
+  from core import UNLOCK_SCHEDULE
+
+  scheduled = False
+
+  def start_lock(duration: float):
+    nonlocal scheduled
+    if not core.locked:
+      core.lock(duration)
+      scheduled = core.locked
+
+  def end_lock():
+    nonlocal scheduled
+    if scheduled and core.locked:
+      core.unlock(UNLOCK_SCHEDULE)
+    scheduled = False
+
+  return LockScheduler(schedules, start_lock, end_lock, core.call_threadsafe, **options)
+
+
+def _schedule_arg(spec: str) -> ScheduledLock:
+  try:
+    return ScheduledLock.parse(spec)
+  except ValueError as e:
+    raise argparse.ArgumentTypeError(str(e)) from None
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description="Temporarily lock the keyboard and mouse.")
+  parser.add_argument("--socket", metavar="ADDRESS", help="daemon socket path or pipe name (default: per-user)")
+  parser.add_argument("--startup-trace", action="store_true", help="print per-phase startup timings to stderr")
+  parser.add_argument("--lock-metrics", action="store_true", help="print lock engagement latency to stderr after each lock")
+  parser.add_argument("--journal", type=Path, metavar="DIR", help="append a record of every lock session to DIR (summarize with: journal.py DIR)")
+  parser.add_argument(
+    "--schedule",
+    action="append",
+    type=_schedule_arg,
+    default=[],
+    metavar="SPEC",
+    help='lock automatically, e.g. "02:00 for 30m", "every 50m for 5m" or "09:00 every 2h for 10m" (repeatable)',
+  )
+  parser.add_argument("--input-backend", choices=sorted(BACKENDS), default="pynput", help="where keyboard and mouse events come from")
+  parser.add_argument(
+    "--mouse-suppression",
+    choices=MOUSE_SUPPRESSION_MODES,
+    default="grab",
+    help="block the pointer with a backend grab (no per-event callbacks) or with a listener",
+  )
+  parser.add_argument(
+    "--input-stats",
+    type=Path,
+    metavar="DIR",
+    help="record input event counts and callback latencies, written as JSON to DIR on unlock (the pointer is then blocked by a listener, not a grab)",
+  )
+  parser.add_argument(
+    "--seat",
+    action="append",
+    metavar="DISPLAY",
+    help="run a lock window on this X display (repeat for several seats in one process)",
+  )
+
+  parser.add_argument(
+    "--profile",
+    type=Path,
+    metavar="DIR",
+    help=f"write cProfile and tracemalloc results for startup and each lock phase to DIR (or set {PROFILE_DIR_ENV}); not with --seat",
+  )
+
+  commands = parser.add_subparsers(dest="command", metavar="COMMAND", help="run the app when omitted")
+  daemon = commands.add_parser("daemon", help="stay resident with the window hidden and take requests on the socket")
+  daemon.add_argument("--headless", action="store_true", help="serve without Tk or an overlay (input suppression only)")
+  # Also served by client.py, which skips loading the app.
+  client.add_commands(commands)
+  args = parser.parse_args(argv)
+  if args.command == "daemon" and args.headless:
+    # These act on the window, the overlay or per-lock reports, none of which a headless daemon has.
+    options = {"--startup-trace": args.startup_trace, "--lock-metrics": args.lock_metrics, "--input-stats": args.input_stats, "--seat": args.seat}
+    unsupported = [option for option, value in options.items() if value]
+    if unsupported:
+      parser.error(f"{', '.join(unsupported)} cannot be used with daemon --headless")
+  return args
+
+
+def run_headless_daemon(args: argparse.Namespace, profiler: Optional[PhaseProfiler] = None):
+  from core import UNLOCK_SHUTDOWN
+  from ipc import IpcServer
+
+  core = create_headless_core(AppConfig(input_backend=args.input_backend, mouse_suppression=args.mouse_suppression))
+  core.profiler = profiler
+  core.journal = SessionJournal(args.journal) if args.journal is not None else None
+  server = IpcServer(core, args.socket, core.dispatch)
+  server.start()
+  scheduler = create_headless_scheduler(core, args.schedule) if args.schedule else None
+  if scheduler is not None:
+    scheduler.start()
+  if profiler is not None:
+    profiler.stop()
+  print(f"listening on {server.address}", file=sys.stderr)
+  try:
+    core.loop.run_forever()
+  except KeyboardInterrupt:
+    pass
+  finally:
+    if scheduler is not None:
+      scheduler.close()
+    server.close()
+    # A lock still running when the daemon stops is journaled as ended by shutdown, not by a request.
+    core.unlock(UNLOCK_SHUTDOWN)
+    core.input_manager.stop_listening()
+    core.loop.close()
+    if core.journal is not None:
+      core.journal.close()
+
+
+def daemon_address(args: argparse.Namespace) -> Optional[str]:
+  if args.command != "daemon":
+    return None
+  from ipc import default_address
+
+  return args.socket or default_address()
+
+
+def main(argv: Optional[List[str]] = None):
+  args = parse_args(argv)
+  if args.command in client.COMMANDS:
+    sys.exit(client.run_client(args))
+  profiler = profiler_from_env(args.profile)
+  if profiler is not None and args.seat:
+    # cProfile runs one profile at a time on the Tk thread, but seats lock independently, so one
+    # seat's lock would end another's locked phase and the files would mix seats.
+    sys.exit(f"--profile (or {PROFILE_DIR_ENV}) cannot be combined with --seat; profile a single seat instead")
+  if profiler is not None:
+    profiler.start("startup")
+  if args.command == "daemon" and args.headless:
+    run_headless_daemon(args, profiler)
+    return
+  if args.seat and args.command == "daemon":
+    sys.exit("seats cannot run as a daemon: the socket would not say which seat to lock")
+
+  trace = StartupTrace(enabled=args.startup_trace)
+  with trace.phase("imports"):
+    import_ui_dependencies()
+  config = AppConfig(input_backend=args.input_backend, mouse_suppression=args.mouse_suppression, lock_schedule=args.schedule, journal_dir=args.journal)
+  if args.seat:
+    with trace.phase("tk init"):
+      root = tk.Tk(screenName=args.seat[0])
+    SeatController(root, args.seat, config, trace, show_lock_metrics=args.lock_metrics, stats_dir=args.input_stats).run()
+    return
+
+  with trace.phase("tk init"):
+    root = tk.Tk()
+  app = CleanLockApp(
+    root,
+    trace=trace,
+    show_lock_metrics=args.lock_metrics,
+    config=config,
+    stats_dir=args.input_stats,
+    daemon_address=daemon_address(args),
+    profiler=profiler,
+  )
   app.theme_manager.apply_titlebar_theme(root)
-  app.run()
+  try:
+    app.run()
+  finally:
+    if app.ipc_server is not None:
+      app.ipc_server.close()
 
 
 if __name__ == "__main__":
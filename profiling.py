@@ -0,0 +1,74 @@
+import cProfile
+import io
+import os
+import pstats
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Optional
+
+PROFILE_DIR_ENV = "INPUT_LOCK_PROFILE_DIR"
+
+
+class PhaseProfiler:
+  """Runs cProfile and tracemalloc over sequential named phases and writes ``NNN-<name>`` .pstats, .tracemalloc and .txt files."""
+
+  def __init__(self, directory: Path, top: int = 30, frames: int = 1):
+    self.directory = Path(directory)
+    self.top = top
+    self.frames = frames
+    self._sequence = 0
+    self._name: Optional[str] = None
+    self._profile: Optional[cProfile.Profile] = None
+    self._snapshot: Optional[tracemalloc.Snapshot] = None
+    self._started_at = 0.0
+
+  @property
+  def active_phase(self) -> Optional[str]:
+    return self._name
+
+  def start(self, name: str):
+    self.stop()
+    if not tracemalloc.is_tracing():
+      tracemalloc.start(self.frames)
+    self._name = name
+    self._snapshot = tracemalloc.take_snapshot()
+    self._started_at = time.perf_counter()
+    self._profile = cProfile.Profile()
+    self._profile.enable()
+
+  def stop(self):
+    if self._profile is None:
+      return
+    self._profile.disable()
+    elapsed = time.perf_counter() - self._started_at
+    snapshot = tracemalloc.take_snapshot()
+    name, profile, before = self._name, self._profile, self._snapshot
+    self._name = self._profile = self._snapshot = None
+    try:
+      self._write(name, profile, before, snapshot, elapsed)  # type: ignore[arg-type]
+    except OSError as e:
+      print(f"could not write the {name} profile: {e}", file=sys.stderr)
+
+  def _write(self, name: str, profile: cProfile.Profile, before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, elapsed: float):
+    self.directory.mkdir(parents=True, exist_ok=True)
+    self._sequence += 1
+    stem = self.directory / f"{self._sequence:03d}-{name}"
+    profile.dump_stats(stem.with_suffix(".pstats"))
+    after.dump(str(stem.with_suffix(".tracemalloc")))
+
+    summary = io.StringIO()
+    current, peak = tracemalloc.get_traced_memory()
+    summary.write(f"phase {name}: {elapsed * 1000:.1f} ms wall, traced memory {current / 1024:.0f} KiB (peak {peak / 1024:.0f} KiB)\n\n")
+    pstats.Stats(profile, stream=summary).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+    summary.write(f"\ntop {self.top} allocation changes during the phase:\n")
+    for stat in after.compare_to(before, "lineno")[: self.top]:
+      summary.write(f"  {stat}\n")
+    stem.with_suffix(".txt").write_text(summary.getvalue())
+
+
+def profiler_from_env(directory: Optional[Path] = None) -> Optional[PhaseProfiler]:
+  """Returns a profiler for ``directory`` or INPUT_LOCK_PROFILE_DIR, or None when neither is set."""
+  directory = directory or (Path(os.environ[PROFILE_DIR_ENV]) if os.environ.get(PROFILE_DIR_ENV) else None)
+  return PhaseProfiler(directory) if directory is not None else None
@@ -0,0 +1,124 @@
+import math
+import time
+import tkinter as tk
+from array import array
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from styling import StyleRegistry
+
+Scheduler = Callable[[int, Callable[[], None]], Any]
+
+DEFAULT_MAX_FPS = 30.0
+
+
+def format_tenths(remaining: float) -> str:
+  """``MM:SS.t`` for a remaining time, rounded up to the tenth like Countdown.display_seconds."""
+  tenths = math.ceil(remaining * 10 - 1e-9) if remaining > 0 else 0
+  minutes, tenths = divmod(tenths, 600)
+  return f"{minutes:02d}:{tenths // 10:02d}.{tenths % 10}"
+
+
+class ProgressRing:
+  """Draws the countdown on a Canvas as a shrinking ring around a ``MM:SS.t`` timer, redrawing only visible changes."""
+
+  def __init__(
+    self,
+    canvas: tk.Canvas,
+    styles: StyleRegistry,
+    diameter: int,
+    width: int = 10,
+    font: Tuple[str, int, str] = ("TkDefaultFont", 36, "bold"),
+    max_fps: float = DEFAULT_MAX_FPS,
+    window: int = 1024,
+    schedule: Optional[Scheduler] = None,
+    cancel: Optional[Callable[[Any], None]] = None,
+    clock: Callable[[], float] = time.perf_counter,
+  ):
+    if max_fps <= 0:
+      raise ValueError("max_fps must be positive")
+    self.canvas = canvas
+    self.frame_interval = 1 / max_fps
+    self._schedule = schedule or canvas.after
+    self._cancel = cancel or canvas.after_cancel
+    self.clock = clock
+    pad = width / 2 + 1
+    box = (pad, pad, diameter - pad, diameter - pad)
+    # Degrees of arc that make up one pixel along the ring's centre line.
+    self.step_degrees = 360 / (math.pi * (diameter - 2 * pad))
+    self._track = styles.style_item(canvas, canvas.create_oval(*box, width=width), outline="ring_track")
+    self._arc = styles.style_item(canvas, canvas.create_arc(*box, start=90, extent=0, style=tk.ARC, width=width), outline="ring_fill")
+    self._text = styles.style_item(canvas, canvas.create_text(diameter / 2, diameter / 2, font=font), fill="text_color")
+
+    self._remaining: Callable[[], float] = lambda: 0.0
+    self.total = 1.0
+    self._handle = None
+    self._steps: Optional[int] = None
+    self._label: Optional[str] = None
+    self._costs = array("d", bytes(8 * window))
+    self.frames = 0
+    self.skipped = 0
+
+  @property
+  def running(self) -> bool:
+    return self._handle is not None
+
+  def start(self, remaining: Callable[[], float], total: float):
+    """Animates until stop(); ``remaining`` is read every frame, so pauses and extensions show up."""
+    self.stop()
+    self._remaining = remaining
+    self.total = max(total, 1e-9)
+    self._steps = self._label = None
+    self.frames = self.skipped = 0
+    self._frame()
+
+  def stop(self):
+    if self._handle is not None:
+      self._cancel(self._handle)
+      self._handle = None
+
+  def draw(self) -> bool:
+    """Redraws whatever changed since the last frame; returns False if nothing did."""
+    remaining = max(0.0, self._remaining())
+    steps = self._arc_steps(remaining)
+    label = format_tenths(remaining)
+    if steps == self._steps and label == self._label:
+      self.skipped += 1
+      return False
+    start = self.clock()
+    if steps != self._steps:
+      self.canvas.itemconfigure(self._arc, extent=-min(359.99, steps * self.step_degrees))
+      self._steps = steps
+    if label != self._label:
+      self.canvas.itemconfigure(self._text, text=label)
+      self._label = label
+    self.canvas.update_idletasks()
+    self._costs[self.frames % len(self._costs)] = self.clock() - start
+    self.frames += 1
+    return True
+
+  def summary(self) -> Dict[str, Optional[float]]:
+    costs = sorted(self._costs[: min(self.frames, len(self._costs))])
+    if not costs:
+      return {"frames": self.frames, "skipped": self.skipped, "frame_p50_ms": None, "frame_p99_ms": None, "frame_max_ms": None}
+    return {
+      "frames": self.frames,
+      "skipped": self.skipped,
+      "frame_p50_ms": costs[(len(costs) - 1) // 2] * 1000,
+      "frame_p99_ms": costs[min(len(costs) - 1, int(len(costs) * 0.99))] * 1000,
+      "frame_max_ms": costs[-1] * 1000,
+    }
+
+  def _arc_steps(self, remaining: float) -> int:
+    return math.ceil(remaining / self.total * 360 / self.step_degrees - 1e-9)
+
+  def _frame(self):
+    self._handle = None
+    self.draw()
+    remaining = max(0.0, self._remaining())
+    if remaining <= 0:
+      return
+    # Sleep until the text or the arc next changes, but wake no more often than the frame cap.
+    text_due = remaining - (math.ceil(remaining * 10 - 1e-9) - 1) / 10
+    arc_due = remaining - (self._arc_steps(remaining) - 1) * self.step_degrees * self.total / 360
+    delay = max(self.frame_interval, min(text_due, arc_due))
+    self._handle = self._schedule(max(1, math.ceil(delay * 1000)), self._frame)
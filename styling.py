@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+import tkinter as tk
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from config import THEME_CONFIG
+
+if TYPE_CHECKING:
+  from main import ImageManager, ThemeManager
+
+# How often to re-read the OS theme when the platform offers no change notification stream.
+THEME_POLL_SECONDS = 30.0
+
+
+class StyleRegistry:
+  """Records which palette key each widget option and themed image comes from, so a theme switch restyles in place."""
+
+  def __init__(self, theme_manager: ThemeManager, image_manager: ImageManager):
+    self.theme_manager = theme_manager
+    self.image_manager = image_manager
+    self._widgets: List[Tuple[tk.Misc, Dict[str, str]]] = []
+    self._items: List[Tuple[tk.Canvas, int, Dict[str, str]]] = []
+    self._images: List[Tuple[tk.Misc, Path, Tuple[int, int], int]] = []
+
+  def style(self, widget: tk.Misc, **options: str) -> tk.Misc:
+    """Applies palette colors to ``widget``, e.g. ``style(label, fg="text_color", bg="background")``."""
+    widget.configure(**self._resolve(options))
+    self._widgets.append((widget, options))
+    return widget
+
+  def style_item(self, canvas: tk.Canvas, item: int, **options: str) -> int:
+    canvas.itemconfigure(item, **self._resolve(options))
+    self._items.append((canvas, item, options))
+    return item
+
+  def style_image(self, widget: tk.Misc, png_path: Path, size: Tuple[int, int]) -> tk.Misc:
+    """Shows ``png_path`` at the logical ``size``, in pixels scaled for the widget's display."""
+    scale = pixel_scale(widget)
+    self._set_image(widget, self.image_manager.load_png_image(png_path, size, scale))
+    self._images.append((widget, png_path, size, scale))
+    return widget
+
+  def set_theme(self, theme: str) -> int:
+    """Switches to ``theme`` and returns the number of widgets and items reconfigured."""
+    previous = self.theme_manager.current_theme
+    if theme == previous:
+      return 0
+    old, new = THEME_CONFIG[previous], THEME_CONFIG[theme]
+    changed = {key for key in old.keys() | new.keys() if old.get(key) != new.get(key)}
+    self.theme_manager.current_theme = theme
+    self._prune()
+
+    # Build every new image before touching any widget, so the switch lands in a single redraw.
+    photos = [self.image_manager.load_png_image(png_path, size, scale) for _, png_path, size, scale in self._images]
+    restyled = 0
+    for widget, options in self._widgets:
+      update = self._resolve({option: key for option, key in options.items() if key in changed})
+      if update:
+        widget.configure(**update)
+        restyled += 1
+    for canvas, item, options in self._items:
+      update = self._resolve({option: key for option, key in options.items() if key in changed})
+      if update:
+        canvas.itemconfigure(item, **update)
+        restyled += 1
+    for (widget, *_), photo in zip(self._images, photos):
+      self._set_image(widget, photo)
+    self.image_manager.evict_inactive_themes()
+    return restyled + len(photos)
+
+  def _resolve(self, options: Dict[str, str]) -> Dict[str, str]:
+    return {option: self.theme_manager.get_color(key) for option, key in options.items()}
+
+  @staticmethod
+  def _set_image(widget: tk.Misc, photo):
+    widget.configure(image=photo)
+    widget.image = photo  # type: ignore[attr-defined]  # Tk does not keep the photo alive
+
+  def forget(self, window: tk.Misc):
+    """Drops the entries for ``window`` and every widget inside it; call it before destroying the window."""
+    prefix = str(window)
+
+    def outside(widget: tk.Misc) -> bool:
+      name = str(widget)
+      return name != prefix and not name.startswith(prefix + ".")
+
+    self._widgets = [entry for entry in self._widgets if outside(entry[0])]
+    self._items = [entry for entry in self._items if outside(entry[0])]
+    self._images = [entry for entry in self._images if outside(entry[0])]
+
+  def _prune(self):
+    self._widgets = [entry for entry in self._widgets if _exists(entry[0])]
+    self._items = [entry for entry in self._items if _exists(entry[0])]
+    self._images = [entry for entry in self._images if _exists(entry[0])]
+
+
+def pixel_scale(widget: tk.Misc) -> int:
+  """The whole-number HiDPI factor of ``widget``'s display, from Tk's scaling: 1 at 96 dpi, 2 at 192 dpi."""
+  return max(1, round(widget.winfo_fpixels("1i") / 96))
+
+
+def _exists(widget: tk.Misc) -> bool:
+  try:
+    return bool(widget.winfo_exists())
+  except tk.TclError:
+    return False
+
+
+class ThemeWatcher:
+  """Reports OS light/dark theme changes to ``on_change`` from a daemon thread."""
+
+  def __init__(self, on_change: Callable[[str], None], poll_interval: float = THEME_POLL_SECONDS):
+    self.on_change = on_change
+    self.poll_interval = poll_interval
+    self._thread: Optional[threading.Thread] = None
+
+  def start(self):
+    if self._thread is None:
+      self._thread = threading.Thread(target=self._run, name="theme-watcher", daemon=True)
+      self._thread.start()
+
+  def _run(self):
+    try:
+      import darkdetect
+
+      darkdetect.listener(self._report)
+    except (ImportError, NotImplementedError, OSError):
+      return
+    except Exception as e:
+      print(f"theme listener failed, polling instead: {e}", file=sys.stderr)
+
+    while True:
+      time.sleep(self.poll_interval)
+      try:
+        self._report(darkdetect.theme())
+      except Exception:
+        pass
+
+  def _report(self, detected: Optional[str]):
+    if detected:
+      self.on_change("dark" if detected.strip().lower() == "dark" else "light")
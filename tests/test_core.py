@@ -0,0 +1,80 @@
+import tracemalloc
+
+import pytest
+
+from core import UNLOCK_SHUTDOWN, LockCore
+from input_backends import create_backend
+from journal import SessionJournal, aggregate
+from main import AppConfig, InputManager
+from profiling import PhaseProfiler
+
+
+def test_repeated_lock_keeps_the_locked_profile_phase(tmp_path):
+  input_manager = InputManager(AppConfig(language="english", input_backend="fake").unlock_chords(), create_backend("fake"))
+  input_manager.start_listening(lambda: None)
+  core = LockCore(input_manager, 60)
+  core.profiler = PhaseProfiler(tmp_path)
+  try:
+    core.lock()
+    assert core.profiler.active_phase == "locked"
+    core.lock(30)  # e.g. a second "lock" request over IPC
+    assert core.profiler.active_phase == "locked"
+    core.unlock()
+    assert core.profiler.active_phase is None
+    assert [path.name for path in sorted(tmp_path.glob("*.txt"))] == ["001-lock.txt", "002-locked.txt", "003-unlock.txt"]
+  finally:
+    input_manager.stop_listening()
+    core.loop.close()
+    tracemalloc.stop()
+
+
+def test_shutdown_unlock_is_journaled_as_shutdown(tmp_path):
+  input_manager = InputManager(AppConfig(language="english", input_backend="fake").unlock_chords(), create_backend("fake"))
+  input_manager.start_listening(lambda: None)
+  core = LockCore(input_manager, 60)
+  core.journal = SessionJournal(tmp_path)
+  try:
+    core.lock()
+    core.unlock(UNLOCK_SHUTDOWN)
+  finally:
+    core.journal.close()
+    input_manager.stop_listening()
+    core.loop.close()
+  by_reason = aggregate(tmp_path)["by_reason"]
+  assert by_reason["shutdown"] == 1
+  assert by_reason["request"] == 0
+
+
+@pytest.mark.parametrize("duration", [float("inf"), float("nan"), 0, -1])
+def test_lock_rejects_durations_that_never_or_instantly_end(duration):
+  input_manager = InputManager(AppConfig(language="english", input_backend="fake").unlock_chords(), create_backend("fake"))
+  input_manager.start_listening(lambda: None)
+  core = LockCore(input_manager, 60)
+  try:
+    with pytest.raises(ValueError):
+      core.lock(duration)
+    assert not core.locked
+    assert not input_manager.keyboard_manager.suppress_input
+  finally:
+    input_manager.stop_listening()
+    core.loop.close()
+
+
+def test_failing_view_rolls_the_lock_back():
+  input_manager = InputManager(AppConfig(language="english", input_backend="fake").unlock_chords(), create_backend("fake"))
+  input_manager.start_listening(lambda: None)
+  core = LockCore(input_manager, 60)
+
+  def broken_view(duration, requested_at):
+    raise RuntimeError("overlay failed")
+
+  core.on_lock = broken_view
+  try:
+    with pytest.raises(RuntimeError):
+      core.lock()
+    assert not core.locked
+    assert not input_manager.keyboard_manager.suppress_input
+    assert not core.countdown.running
+  finally:
+    input_manager.stop_listening()
+    core.loop.close()
@@ -0,0 +1,144 @@
+import heapq
+import itertools
+import math
+
+import pytest
+
+from countdown import Countdown
+
+
+class VirtualLoop:
+  """after()/after_cancel() on a virtual clock; every timer fires ``lateness`` seconds late."""
+
+  def __init__(self, lateness: float = 0.0):
+    self.now = 0.0
+    self.lateness = lateness
+    self._timers = []
+    self._order = itertools.count()
+
+  def clock(self) -> float:
+    return self.now
+
+  def after(self, ms: int, callback):
+    entry = [self.now + ms / 1000 + self.lateness, next(self._order), callback]
+    heapq.heappush(self._timers, entry)
+    return entry
+
+  def after_cancel(self, entry):
+    entry[2] = None
+
+  @property
+  def pending(self) -> int:
+    return sum(1 for entry in self._timers if entry[2] is not None)
+
+  def run(self, until: float = math.inf):
+    while self._timers and self._timers[0][0] <= until:
+      due, _, callback = heapq.heappop(self._timers)
+      if callback is not None:
+        self.now = due
+        callback()
+    if until != math.inf:
+      self.now = max(self.now, until)
+
+
+def make_countdown(loop: VirtualLoop):
+  shown, finished = [], []
+  countdown = Countdown(
+    loop.after,
+    loop.after_cancel,
+    on_tick=lambda remaining: shown.append(Countdown.display_seconds(remaining)),
+    on_finish=lambda: finished.append(loop.now),
+    clock=loop.clock,
+  )
+  return countdown, shown, finished
+
+
+@pytest.mark.parametrize("lateness", [0.0, 0.04, 0.3])
+def test_late_timers_do_not_accumulate_drift(lateness):
+  loop = VirtualLoop(lateness)
+  countdown, shown, finished = make_countdown(loop)
+  countdown.start(600)
+  loop.run()
+  # 600 late wake-ups, yet the finish is late by one timer's lateness at most.
+  assert finished[0] == pytest.approx(600 + lateness, abs=0.002)
+  assert shown == list(range(600, -1, -1))  # no second skipped or repeated
+  assert not countdown.running
+
+
+def test_every_second_is_shown_once_in_order():
+  loop = VirtualLoop()
+  countdown, shown, finished = make_countdown(loop)
+  countdown.start(5)
+  loop.run()
+  assert shown == [5, 4, 3, 2, 1, 0]
+  assert finished == [pytest.approx(5)]
+
+
+@pytest.mark.parametrize(
+  "remaining, seconds",
+  [(-1.0, 0), (0.0, 0), (1e-12, 0), (0.2, 1), (1.0, 1), (1.0001, 2), (59.5, 60), (120.0, 120)],
+)
+def test_display_seconds(remaining, seconds):
+  assert Countdown.display_seconds(remaining) == seconds
+
+
+def test_pause_freezes_the_remaining_time():
+  loop = VirtualLoop()
+  countdown, shown, finished = make_countdown(loop)
+  countdown.start(10)
+  loop.run(until=3)
+  countdown.pause()
+  assert countdown.paused
+  assert countdown.remaining() == pytest.approx(7)
+  assert shown[-1] == 7
+  assert loop.pending == 0
+  loop.run(until=100)
+  assert countdown.remaining() == pytest.approx(7)
+  assert not finished
+
+  countdown.resume()
+  assert not countdown.paused
+  loop.run()
+  assert finished == [pytest.approx(107)]
+  assert shown[-1] == 0
+
+
+def test_extend_moves_the_deadline():
+  loop = VirtualLoop()
+  countdown, shown, finished = make_countdown(loop)
+  countdown.start(10)
+  loop.run(until=4)
+  countdown.extend(5)
+  assert countdown.remaining() == pytest.approx(11)
+  assert shown[-1] == 11  # the new deadline shows at once
+  assert loop.pending == 1
+  loop.run()
+  assert finished == [pytest.approx(15)]
+
+
+def test_extend_while_paused_applies_on_resume():
+  loop = VirtualLoop()
+  countdown, shown, finished = make_countdown(loop)
+  countdown.start(10)
+  loop.run(until=2)
+  countdown.pause()
+  countdown.extend(30)
+  assert countdown.remaining() == pytest.approx(38)
+  loop.run(until=50)
+  countdown.resume()
+  assert shown[-1] == 38
+  loop.run()
+  assert finished == [pytest.approx(88)]
+
+
+def test_cancel_stops_without_finishing():
+  loop = VirtualLoop()
+  countdown, shown, finished = make_countdown(loop)
+  countdown.start(10)
+  loop.run(until=3)
+  countdown.cancel()
+  assert loop.pending == 0
+  assert countdown.remaining() == 0.0
+  loop.run()
+  assert not finished
+  assert shown == [10, 9, 8, 7]
@@ -0,0 +1,48 @@
+import os
+import sys
+import time
+
+import pytest
+
+from diagnostics import PRESS
+from input_backends import _EVDEV_KEYS, EV_KEY, EV_SYN, EVENT, EvdevBackend, EvdevDevice
+from main import AppConfig, InputManager
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="evdev is Linux only")
+
+KEY_L, KEY_LEFTSHIFT, KEY_LEFTALT = 38, 42, 56
+UNMAPPED = next(code for code in range(1, 0x100) if code not in _EVDEV_KEYS)
+
+
+class PipeKeyboard(EvdevDevice):
+  def __init__(self):
+    read_fd, self.write_fd = os.pipe()
+    os.set_blocking(read_fd, False)
+    super().__init__(read_fd, "pipe keyboard", keyboard=True, pointer=False, monotonic=True)
+
+  def grab(self, enabled: bool):
+    self.grabbed = enabled
+
+  def press(self, code: int):
+    seconds, remainder = divmod(time.monotonic_ns(), 1_000_000_000)
+    os.write(self.write_fd, EVENT.pack(seconds, remainder // 1000, EV_KEY, code, 1) + EVENT.pack(seconds, remainder // 1000, EV_SYN, 0, 0))
+
+
+def test_unmapped_key_inside_the_chord_resets_it():
+  keyboard = PipeKeyboard()
+  backend = EvdevBackend(devices=[keyboard])
+  unlocks = []
+  input_manager = InputManager(AppConfig(language="english", input_backend="evdev").unlock_chords(), backend)
+  input_manager.start_listening(lambda: unlocks.append(True))
+  try:
+    for code in (KEY_LEFTSHIFT, KEY_LEFTALT, UNMAPPED, KEY_L):
+      keyboard.press(code)
+    deadline = time.monotonic() + 2
+    while backend.reader.delivery.counts[PRESS] < 4 and time.monotonic() < deadline:
+      time.sleep(0.005)
+    assert backend.reader.delivery.counts[PRESS] == 4
+    assert unlocks == []
+  finally:
+    input_manager.stop_listening()
+    backend.reader.close()
+    os.close(keyboard.write_fd)
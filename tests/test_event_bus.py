@@ -0,0 +1,113 @@
+import math
+import queue
+import threading
+
+import pytest
+
+from event_bus import EventBus
+
+
+class ManualLoop:
+  """Collects the bus's after(0, ...) wake-ups so a test decides when the loop runs them."""
+
+  def __init__(self):
+    self.pending = []
+
+  def after(self, ms, callback):
+    self.pending.append(callback)
+
+  def run_one(self):
+    self.pending.pop(0)()
+
+  def run(self):
+    while self.pending:
+      self.run_one()
+
+
+def test_many_producers_keep_order_and_lose_nothing():
+  producers, per_producer = 8, 20_000
+  wakeups: "queue.SimpleQueue" = queue.SimpleQueue()
+  bus = EventBus(lambda ms, callback: wakeups.put(callback), capacity=producers * per_producer)
+  received = [[] for _ in range(producers)]
+  done = threading.Event()
+
+  def consume():
+    # Plays the Tk thread: runs each scheduled drain, concurrently with the producers.
+    while not (done.is_set() and wakeups.empty() and not bus.depth):
+      try:
+        wakeups.get(timeout=0.01)()
+      except queue.Empty:
+        pass
+
+  def produce(producer):
+    for sequence in range(per_producer):
+      assert bus.post(received[producer].append, sequence)
+
+  consumer = threading.Thread(target=consume)
+  consumer.start()
+  threads = [threading.Thread(target=produce, args=(producer,)) for producer in range(producers)]
+  for thread in threads:
+    thread.start()
+  for thread in threads:
+    thread.join()
+  done.set()
+  consumer.join(timeout=30)
+
+  assert not consumer.is_alive()
+  for events in received:
+    assert events == list(range(per_producer))
+  assert bus.dropped == 0
+  assert bus.handled == producers * per_producer
+  assert bus.depth == 0
+
+
+def test_drains_at_most_one_batch_per_wakeup():
+  loop = ManualLoop()
+  bus = EventBus(loop.after)
+  handled = []
+  for index in range(1000):
+    bus.post(handled.append, index)
+  # Only the post that found the loop asleep scheduled a wake-up.
+  assert len(loop.pending) == 1
+
+  loop.run_one()
+  assert handled == list(range(256))
+  assert len(loop.pending) == 1  # the rest waits for the next turn of the loop
+
+  loop.run()
+  assert handled == list(range(1000))
+  assert bus.batches == math.ceil(1000 / 256)
+
+
+def test_full_bus_drops_instead_of_blocking():
+  loop = ManualLoop()
+  bus = EventBus(loop.after, capacity=100)
+  handled = []
+  results = [bus.post(handled.append, index) for index in range(150)]
+  assert results == [True] * 100 + [False] * 50
+  assert bus.depth == 100
+  assert bus.dropped == 50
+
+  loop.run()
+  assert handled == list(range(100))
+  assert bus.post(handled.append, 100)
+  loop.run()
+  assert handled[-1] == 100
+  assert bus.metrics()["max_depth"] == 100
+
+
+def test_failing_handler_does_not_stop_the_batch(capsys):
+  loop = ManualLoop()
+  bus = EventBus(loop.after)
+  handled = []
+  bus.post(lambda: 1 / 0)
+  bus.post(handled.append, "after")
+  loop.run()
+  assert handled == ["after"]
+  assert "ZeroDivisionError" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("capacity, batch_size", [(0, 1), (1, 0)])
+def test_rejects_empty_limits(capacity, batch_size):
+  with pytest.raises(ValueError):
+    EventBus(lambda ms, callback: None, capacity=capacity, batch_size=batch_size)
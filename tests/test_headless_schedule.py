@@ -0,0 +1,129 @@
+import asyncio
+import datetime
+import signal
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from core import UNLOCK_SCHEDULE
+from ipc import send_request
+from lock_schedule import ScheduledLock
+from main import AppConfig, create_headless_core, create_headless_scheduler, parse_args
+
+
+class FakeClock:
+  def __init__(self, now: float):
+    self.now = now
+
+  def __call__(self) -> float:
+    return self.now
+
+
+class FakeTimer:
+  def __init__(self, on_fire):
+    self.on_fire = on_fire
+    self.deadline = None
+
+  def set(self, deadline):
+    self.deadline = deadline
+
+  def close(self):
+    self.deadline = None
+
+
+def at_today(hour: int, minute: int) -> float:
+  return datetime.datetime.combine(datetime.date.today(), datetime.time(hour, minute)).timestamp()
+
+
+def run_posted(core):
+  # The scheduler posts onto the core's loop; one pass runs what it queued.
+  core.loop.run_until_complete(asyncio.sleep(0))
+
+
+def make(clock):
+  timers = []
+
+  def timer_factory(on_fire):
+    timers.append(FakeTimer(on_fire))
+    return timers[-1]
+
+  core = create_headless_core(AppConfig(language="english", input_backend="fake"))
+  scheduler = create_headless_scheduler(core, [ScheduledLock.parse("02:00 for 30m")], clock=clock, timer_factory=timer_factory)
+  return core, scheduler, timers[0]
+
+
+def close(core, scheduler):
+  scheduler.close()
+  core.unlock()
+  core.input_manager.stop_listening()
+  core.loop.close()
+
+
+def test_window_in_progress_locks_on_start_and_its_end_unlocks():
+  clock = FakeClock(at_today(2, 10))
+  core, scheduler, timer = make(clock)
+  try:
+    scheduler.start()
+    assert core.locked
+    assert core.countdown.remaining() == pytest.approx(20 * 60, abs=1)
+    assert timer.deadline == at_today(2, 30)
+
+    clock.now = timer.deadline
+    timer.on_fire()
+    run_posted(core)
+    assert not core.locked
+    assert core.unlock_reason == UNLOCK_SCHEDULE
+  finally:
+    close(core, scheduler)
+
+
+def test_window_end_leaves_a_lock_it_did_not_start():
+  clock = FakeClock(at_today(1, 0))
+  core, scheduler, timer = make(clock)
+  try:
+    scheduler.start()
+    assert not core.locked
+    core.lock(4 * 3600)  # e.g. from an IPC request, before the window opens
+
+    clock.now = timer.deadline
+    timer.on_fire()
+    run_posted(core)
+    clock.now = timer.deadline
+    timer.on_fire()
+    run_posted(core)
+    assert scheduler.started == 1
+    assert core.locked
+  finally:
+    close(core, scheduler)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="stops the daemon with SIGINT")
+def test_headless_daemon_honours_schedule():
+  started = datetime.datetime.now() - datetime.timedelta(minutes=1)
+  with tempfile.TemporaryDirectory(dir="/tmp") as directory:  # AF_UNIX paths must stay short
+    address = str(Path(directory) / "daemon.sock")
+    daemon = subprocess.Popen(
+      [sys.executable, "main.py", "--socket", address, "--input-backend", "fake", "--schedule", f"{started:%H:%M} for 30m", "daemon", "--headless"],
+      cwd=Path(__file__).resolve().parent.parent,
+      stderr=subprocess.PIPE,
+      text=True,
+    )
+    try:
+      assert "listening on" in daemon.stderr.readline()
+      status = send_request("status", address)
+      assert status["locked"]
+      assert 28 * 60 < status["remaining"] <= 29 * 60
+    finally:
+      daemon.send_signal(signal.SIGINT)
+      daemon.wait(timeout=10)
+
+
+@pytest.mark.parametrize("option", [["--startup-trace"], ["--lock-metrics"], ["--input-stats", "stats"], ["--seat", ":1"]])
+def test_headless_daemon_rejects_options_it_cannot_honour(option, capsys):
+  with pytest.raises(SystemExit):
+    parse_args([*option, "daemon", "--headless"])
+  assert f"{option[0]} cannot be used with daemon --headless" in capsys.readouterr().err
+  parse_args([*option, "daemon"])
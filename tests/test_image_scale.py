@@ -0,0 +1,31 @@
+import pytest
+
+from atlas import build_atlas
+from config import ASSETS_DIR, UI_IMAGES
+from main import ImageManager, ThemeManager
+from styling import pixel_scale
+
+
+class FakeWidget:
+  def __init__(self, dpi: float):
+    self.dpi = dpi
+
+  def winfo_fpixels(self, distance: str) -> float:
+    assert distance == "1i"
+    return self.dpi
+
+
+@pytest.mark.parametrize("dpi, scale", [(72, 1), (96, 1), (120, 1), (192, 2), (288, 3)])
+def test_pixel_scale_follows_the_display_dpi(dpi, scale):
+  assert pixel_scale(FakeWidget(dpi)) == scale  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("theme", ["light", "dark"])
+@pytest.mark.parametrize("scales", [(1, 2), (1,)])
+def test_images_load_at_the_display_scale_with_or_without_an_atlas_sheet(tmp_path, scales, theme):
+  build_atlas(tmp_path, scales=scales)
+  # An explicit theme, so the host's dark/light setting does not pick the sheet.
+  manager = ImageManager(ThemeManager(theme), atlas_dir=tmp_path)
+  asset, (width, height) = UI_IMAGES["overlay"]
+  assert manager._load_processed_image(ASSETS_DIR / asset, (width, height)).size == (width, height)
+  assert manager._load_processed_image(ASSETS_DIR / asset, (width, height), 2).size == (width * 2, height * 2)
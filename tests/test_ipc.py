@@ -0,0 +1,53 @@
+import tempfile
+import time
+from multiprocessing.connection import Client
+from pathlib import Path
+
+import pytest
+
+import ipc
+from ipc import FAMILY, IpcServer, LockService, send_request
+
+
+class FakeService(LockService):
+  def __init__(self):
+    self.locked = False
+
+  def lock(self, duration=None):
+    self.locked = True
+    return self.status()
+
+  def unlock(self):
+    self.locked = False
+    return self.status()
+
+  def status(self):
+    return {"locked": self.locked}
+
+
+@pytest.fixture
+def server(monkeypatch):
+  monkeypatch.setattr(ipc, "REQUEST_TIMEOUT", 0.5)
+  with tempfile.TemporaryDirectory(dir="/tmp") as directory:  # AF_UNIX paths must stay short
+    server = IpcServer(FakeService(), str(Path(directory) / "daemon.sock"))
+    server.start()
+    try:
+      yield server
+    finally:
+      server.close()
+
+
+@pytest.mark.skipif(FAMILY != "AF_UNIX", reason="uses a Unix socket path")
+def test_silent_client_does_not_block_other_requests(server):
+  silent = Client(server.address, family=FAMILY)
+  try:
+    start = time.monotonic()
+    assert send_request("lock", server.address) == {"ok": True, "locked": True}
+    assert send_request("unlock", server.address) == {"ok": True, "locked": False}
+    assert time.monotonic() - start < 0.4
+    # The idle connection is dropped once its request timeout passes.
+    assert silent.poll(2.0)
+    with pytest.raises(EOFError):
+      silent.recv_bytes()
+  finally:
+    silent.close()
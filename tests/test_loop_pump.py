@@ -0,0 +1,96 @@
+import asyncio
+import heapq
+import itertools
+import queue
+import threading
+import time
+
+from core import UNLOCK_TIMER, LockCore, TkLoopPump
+from input_backends import create_backend
+from main import AppConfig, InputManager
+
+
+class FakeTk:
+  """Tk's after()/after_cancel() on the real clock, plus a queue other threads post calls through."""
+
+  def __init__(self):
+    self.thread = threading.get_ident()
+    self._timers = []
+    self._order = itertools.count()
+    self._posted: "queue.SimpleQueue" = queue.SimpleQueue()
+
+  def after(self, ms, callback):
+    entry = [time.monotonic() + ms / 1000, next(self._order), callback]
+    heapq.heappush(self._timers, entry)
+    return entry
+
+  def after_cancel(self, entry):
+    entry[2] = None
+
+  def post(self, callback, *args):
+    self._posted.put((callback, args))
+
+  def run(self, seconds: float):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+      while not self._posted.empty():
+        callback, args = self._posted.get()
+        callback(*args)
+      if self._timers and self._timers[0][0] <= time.monotonic():
+        callback = heapq.heappop(self._timers)[2]
+        if callback is not None:
+          callback()
+      else:
+        time.sleep(0.001)
+
+
+def make_core(duration: float):
+  tk = FakeTk()
+  pump = TkLoopPump(asyncio.new_event_loop(), tk.after, tk.after_cancel)
+
+  def wake(when):
+    if threading.get_ident() == tk.thread:
+      pump.request(when)
+    else:
+      tk.post(pump.request, when)
+
+  input_manager = InputManager(AppConfig(language="english", input_backend="fake").unlock_chords(), create_backend("fake"))
+  input_manager.start_listening(lambda: None)
+  core = LockCore(input_manager, duration, loop=pump.loop, wake=wake)
+  return tk, pump, core
+
+
+def test_lock_ends_on_its_deadline_and_the_pump_then_sleeps():
+  tk, pump, core = make_core(0.3)
+  try:
+    started = time.monotonic()
+    core.lock()
+    while core.locked and time.monotonic() - started < 2:
+      tk.run(0.01)
+    assert not core.locked
+    assert core.unlock_reason == UNLOCK_TIMER
+    assert time.monotonic() - started < 0.45
+    # One slice per lag beat and countdown timer, not one per frame.
+    assert pump.slices < 10
+
+    tk.run(0.6)  # timers cancelled by the unlock cost at most one slice each
+    slices = pump.slices
+    tk.run(0.5)
+    assert pump.slices == slices
+  finally:
+    core.input_manager.stop_listening()
+    pump.close()
+
+
+def test_call_from_another_thread_runs_on_the_next_slice():
+  tk, pump, core = make_core(60)
+  ran = []
+  try:
+    thread = threading.Thread(target=core.call_threadsafe, args=(lambda: ran.append(threading.get_ident()),))
+    thread.start()
+    thread.join()
+    tk.run(0.05)
+    assert ran == [tk.thread]
+  finally:
+    core.input_manager.stop_listening()
+    pump.close()
@@ -0,0 +1,55 @@
+import itertools
+
+from core import LockCore
+from input_backends import create_backend
+from main import AppConfig, InputManager
+from progress_ring import ProgressRing
+
+
+class RecordingCanvas:
+  def __init__(self):
+    self.ids = itertools.count(1)
+    self.labels = []
+    self.after_calls = []
+
+  def _create(self, *args, **options):
+    return next(self.ids)
+
+  create_oval = create_arc = create_text = _create
+
+  def itemconfigure(self, item, **options):
+    if "text" in options:
+      self.labels.append(options["text"])
+
+  def update_idletasks(self):
+    pass
+
+  def after(self, ms, callback):
+    self.after_calls.append(ms)
+    return len(self.after_calls)
+
+  def after_cancel(self, handle):
+    pass
+
+
+class FlatStyles:
+  def style_item(self, canvas, item, **options):
+    return item
+
+
+def test_ring_shown_on_lock_animates_the_deadline():
+  input_manager = InputManager(AppConfig(language="english", input_backend="fake").unlock_chords(), create_backend("fake"))
+  input_manager.start_listening(lambda: None)
+  core = LockCore(input_manager, 120)
+  canvas = RecordingCanvas()
+  ring = ProgressRing(canvas, FlatStyles(), 220)  # type: ignore[arg-type]
+  core.on_lock = lambda duration, requested_at: ring.start(core.countdown.remaining, duration)
+  try:
+    core.lock()
+    assert canvas.labels == ["02:00.0"]
+    assert canvas.after_calls
+    assert ring.running
+  finally:
+    core.unlock()
+    input_manager.stop_listening()
+    core.loop.close()
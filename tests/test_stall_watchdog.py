@@ -0,0 +1,110 @@
+import threading
+import time
+
+import pytest
+
+from core import UNLOCK_STALL, LockCore
+from input_backends import create_backend
+from loop_monitor import StallWatchdog
+from main import AppConfig, InputManager
+
+
+class FakeMonitor:
+  def __init__(self, clock):
+    self.last_beat = clock()
+
+
+class FakeClock:
+  def __init__(self):
+    self.now = 1000.0
+
+  def __call__(self) -> float:
+    return self.now
+
+
+def wait_for(predicate, timeout: float = 2.0) -> bool:
+  deadline = time.monotonic() + timeout
+  while not predicate():
+    if time.monotonic() > deadline:
+      return False
+    time.sleep(0.005)
+  return True
+
+
+def test_missed_heartbeat_fires_once():
+  clock = FakeClock()
+  monitor = FakeMonitor(clock)
+  stalls = []
+  watchdog = StallWatchdog(monitor, stalls.append, timeout=0.2, clock=clock)  # type: ignore[arg-type]
+  watchdog.arm()
+  clock.now += 0.1
+  monitor.last_beat = clock.now
+  time.sleep(0.15)  # a few checks while the loop keeps beating
+  assert stalls == []
+
+  clock.now += 5  # the loop stops beating
+  assert wait_for(lambda: stalls)
+  time.sleep(0.15)
+  assert stalls == [pytest.approx(5.0)]
+  assert watchdog.stalls == 1
+
+
+def test_overdue_deadline_fires_even_while_beating():
+  clock = FakeClock()
+  monitor = FakeMonitor(clock)
+  stalls = []
+  watchdog = StallWatchdog(monitor, stalls.append, timeout=0.2, clock=clock)  # type: ignore[arg-type]
+  watchdog.arm(deadline=clock.now + 1)
+  clock.now += 1.5
+  monitor.last_beat = clock.now
+  assert wait_for(lambda: stalls)
+  assert watchdog.stalls == 1
+
+
+def test_disarmed_watchdog_stays_quiet():
+  clock = FakeClock()
+  stalls = []
+  watchdog = StallWatchdog(FakeMonitor(clock), stalls.append, timeout=0.2, clock=clock)  # type: ignore[arg-type]
+  watchdog.arm()
+  watchdog.disarm()
+  clock.now += 60
+  time.sleep(0.15)
+  assert stalls == []
+
+
+def test_blocked_loop_releases_input_from_the_watchdog_thread():
+  input_manager = InputManager(AppConfig(language="english", input_backend="fake").unlock_chords(), create_backend("fake"))
+  input_manager.start_listening(lambda: None)
+  # The loop runs by itself here, but record wake calls as a pumped loop would get them.
+  woken_from = set()
+  core = LockCore(input_manager, 60, wake=lambda when: woken_from.add(threading.get_ident()), stall_timeout=0.2)
+  loop_thread = threading.Thread(target=core.loop.run_forever, daemon=True)
+  loop_thread.start()
+  blocked = threading.Event()
+  try:
+    core.dispatch(core.lock)
+    assert input_manager.keyboard_manager.suppress_input
+
+    def block_loop():
+      blocked.set()
+      time.sleep(1.0)
+      blocked.clear()
+
+    core.call_threadsafe(block_loop)
+    assert blocked.wait(1.0)
+    # Input comes back while the loop is still stuck, not once it recovers.
+    assert wait_for(lambda: not input_manager.keyboard_manager.suppress_input, timeout=0.9)
+    assert blocked.is_set()
+    assert not input_manager.mouse_manager.suppress_input
+
+    assert wait_for(lambda: not core.locked)
+    assert core.unlock_reason == UNLOCK_STALL
+    assert core.watchdog.stalls == 1
+    assert core.status()["stalled_for_s"] >= 0.2
+    # Waking may go through Tk, which is what is stuck, so the watchdog thread never does it.
+    assert woken_from <= {threading.get_ident(), loop_thread.ident}
+  finally:
+    core.loop.call_soon_threadsafe(core.loop.stop)
+    loop_thread.join(timeout=2)
+    input_manager.stop_listening()
+    core.loop.close()
@@ -0,0 +1,36 @@
+from main import ImageManager, ThemeManager
+from styling import StyleRegistry
+
+
+class FakeWidget:
+  def __init__(self, name: str):
+    self.name = name
+    self.options = {}
+
+  def __str__(self):
+    return self.name
+
+  def configure(self, **options):
+    self.options.update(options)
+
+  def itemconfigure(self, item, **options):
+    self.options.update(options)
+
+  def winfo_exists(self):
+    return True
+
+
+def test_forget_drops_a_destroyed_window_and_its_children_only():
+  theme_manager = ThemeManager("dark")
+  styles = StyleRegistry(theme_manager, ImageManager(theme_manager))
+  kept = [FakeWidget(".!frame"), FakeWidget(".!toplevel10")]
+  for widget in [*kept, FakeWidget(".!toplevel"), FakeWidget(".!toplevel.!frame.!label")]:
+    styles.style(widget, bg="background")
+  styles.style_item(FakeWidget(".!toplevel.!canvas"), 1, fill="text_color")  # type: ignore[arg-type]
+
+  styles.forget(FakeWidget(".!toplevel"))  # type: ignore[arg-type]
+  assert [widget for widget, _ in styles._widgets] == kept
+  assert styles._items == []
+
+  # Only the windows still shown are restyled.
+  assert styles.set_theme("light") == 2
@@ -0,0 +1,100 @@
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+OTHER_KEY = 0
+
+
+@dataclass(frozen=True)
+class UnlockChord:
+  """Keys that must be pressed in order while held down, optionally within a time window."""
+
+  keys: Tuple[str, ...]
+  window_seconds: Optional[float] = None
+
+  @classmethod
+  def parse(cls, sequence: Sequence[str], window_seconds: Optional[float] = None) -> "UnlockChord":
+    return cls(tuple(key.lower().strip() for key in sequence), window_seconds)
+
+
+class UnlockMatcher:
+  """Matches unlock chords against key presses with one table lookup per chord and no allocation per event."""
+
+  def __init__(self, chords: Sequence[UnlockChord], clock: Callable[[], float] = time.monotonic):
+    if not chords:
+      raise ValueError("At least one unlock chord is required")
+
+    self.clock = clock
+    self.chords = tuple(chords)
+    self._ids: Dict[str, int] = {}
+    for chord in self.chords:
+      if not chord.keys:
+        raise ValueError("Unlock chords must contain at least one key")
+      if len(set(chord.keys)) != len(chord.keys):
+        raise ValueError(f"Unlock chord repeats a key: {' + '.join(chord.keys)}")
+      for key in chord.keys:
+        self._ids.setdefault(key, len(self._ids) + 1)
+
+    key_count = len(self._ids) + 1
+    self._tables = [self._compile(chord, key_count) for chord in self.chords]
+    self._lengths = [len(chord.keys) for chord in self.chords]
+    self._windows = [chord.window_seconds for chord in self.chords]
+    self._timed = any(window is not None for window in self._windows)
+    self._chord_range = range(len(self.chords))
+
+    self._states = [0] * len(self.chords)
+    self._started = [0.0] * len(self.chords)
+    self._seen = bytearray(key_count)
+    self._cleared = bytes(key_count)
+    self.matched_chord: Optional[UnlockChord] = None
+
+  def _compile(self, chord: UnlockChord, key_count: int) -> List[List[int]]:
+    ids = [self._ids[key] for key in chord.keys]
+    table = []
+    for state in range(len(ids) + 1):
+      row = [0] * key_count
+      # Chord keys are distinct, so falling back never lands deeper than the first key.
+      row[ids[0]] = 1
+      if state < len(ids):
+        row[ids[state]] = state + 1
+      table.append(row)
+    return table
+
+  def key_id(self, token: str) -> int:
+    return self._ids.get(token, OTHER_KEY)
+
+  @property
+  def key_ids(self) -> Dict[str, int]:
+    return dict(self._ids)
+
+  def press(self, key_id: int) -> bool:
+    """Feeds a key press and returns True when it completes any chord."""
+    if key_id != OTHER_KEY:
+      if self._seen[key_id]:
+        return False  # already part of the current sequence, e.g. autorepeat
+      self._seen[key_id] = 1
+
+    states = self._states
+    matched = False
+    for index in self._chord_range:
+      state = self._tables[index][states[index]][key_id]
+      states[index] = state
+      if state == 1 and self._timed:
+        self._started[index] = self.clock()
+      if state == self._lengths[index] and not matched:
+        window = self._windows[index]
+        if window is None or self.clock() - self._started[index] <= window:
+          self.matched_chord = self.chords[index]
+          matched = True
+    return matched
+
+  def release(self):
+    # Any release ends the current sequence, matching the original behaviour.
+    self._seen[:] = self._cleared
+    states = self._states
+    for index in self._chord_range:
+      states[index] = 0
+
+  def reset(self):
+    self.release()
+    self.matched_chord = None